@@ -1,13 +1,14 @@
 import concurrent.futures
-import multiprocessing as mp
 import statistics
 import time
 
+import numpy as np
+
+from LEOCraft.constellations import constellation
 from LEOCraft.constellations.constellation import Constellation
 from LEOCraft.satellite_topology.LEO_sat_topology import LEOSatelliteTopology
 from LEOCraft.user_terminals.aircraft import Aircraft
 from LEOCraft.user_terminals.terminal import TerminalCoordinates
-from LEOCraft.utilities import k_shortest_paths
 
 
 class LEOAviationConstellation(Constellation):
@@ -33,6 +34,13 @@ class LEOAviationConstellation(Constellation):
         self.v.log('Building flights...')
         self.aircrafts.build()
 
+        self.build_FSLs()
+
+    def build_FSLs(self) -> None:
+        """Generate FSLs at current time delta
+        (requires the flights and shells to be built)
+        """
+
         self.v.log('Building flight to satellite links...')
         # Flight to satellite link records
         # List index is the flight terminal index
@@ -52,25 +60,25 @@ class LEOAviationConstellation(Constellation):
         )
 
     def _pbuild_fsls(self) -> None:
-        "Compute FSLs in parallel mode"
+        "Compute FSLs in parallel mode, contiguous chunks of flight clusters are computed by the workers"
 
-        with concurrent.futures.ProcessPoolExecutor(mp_context=mp.get_context('fork')) as executor:
-            fsl_compute = list()
-            for fid, fterminal in enumerate(self.aircrafts.terminals):
-                self.fsls[fid] = set()
-                self.v.rlog(
-                    f'''Processing FSLs...  ({
-                        fid+1}/{len(self.aircrafts.terminals)})'''
-                )
+        for fid in range(len(self.aircrafts.terminals)):
+            self.fsls[fid] = set()
 
-                for shell in self.shells:
+        # Build the spatial indices once, forked workers inherit them
+        for shell in self.shells:
+            shell.spatial_index(self.time_delta)
 
-                    fsl_compute.append(
-                        executor.submit(
-                            self._build_fsl_cluster,
-                            fid, fterminal, shell
-                        )
-                    )
+        sat_names = [
+            [shell.encode_sat_name(sid) for sid in range(len(shell.satellites))]
+            for shell in self.shells
+        ]
+
+        with self._worker_pool() as executor:
+            fsl_compute = [
+                executor.submit(_compute_fsls, start, end)
+                for start, end in self._worker_chunks(len(self.aircrafts.terminals))
+            ]
 
             compute_count = 0
             for compute in concurrent.futures.as_completed(fsl_compute):
@@ -80,11 +88,13 @@ class LEOAviationConstellation(Constellation):
                         round(compute_count/len(fsl_compute)*100)}%'''
                 )
 
-                rfid, rfsl_cluster = compute.result()
-                for sat_name, distance_m in rfsl_cluster.items():
-                    self.fsls[rfid].add((sat_name, distance_m))
+                fids, shell_ids, sids, distances_m = compute.result()
+                for fid, shell_id, sid, distance_m in zip(
+                    fids.tolist(), shell_ids.tolist(), sids.tolist(), distances_m.tolist()
+                ):
+                    self.fsls[fid].add((sat_names[shell_id][sid], distance_m))
                     self._add_sat_coverage(
-                        sat_name, self.aircrafts.encode_name(rfid)
+                        sat_names[shell_id][sid], self.aircrafts.encode_name(fid)
                     )
 
     def _sbuild_fsls(self) -> None:
@@ -111,11 +121,10 @@ class LEOAviationConstellation(Constellation):
     def _build_fsl_cluster(self, fid: int, fterminal: TerminalCoordinates, shell: LEOSatelliteTopology) -> tuple[int, dict[str, float]]:
         fsl_cluster = dict()
 
-        for flight in self.aircrafts.flights[fterminal.name]:
-            _, visible_sats, sats_range_m = shell.get_satellites_in_range(
-                flight, fid, self.time_delta
-            )
-
+        # All the flights of the cluster are queried at once through the spatial index of the shell
+        for visible_sats, sats_range_m in shell.get_satellites_in_range_of_terminals(
+            self.aircrafts.flights[fterminal.name], self.time_delta
+        ):
             for sat_name, dist_m in zip(visible_sats, sats_range_m):
                 if sat_name not in fsl_cluster.keys():
                     fsl_cluster[sat_name] = list()
@@ -150,6 +159,17 @@ class LEOAviationConstellation(Constellation):
             json_data[self.aircrafts.encode_name(fid)] = list(visibility)
         return self._write_json_file(json_data, filename)
 
+    def _add_user_terminals(self) -> None:
+        "Adds user terminals (ground stations and flight clusters) and their links (GSLs and FSLs) into N/W graph"
+        super()._add_user_terminals()
+        self._add_terminals_to_network_graph(
+            [
+                self.aircrafts.encode_name(fid)
+                for fid in range(len(self.aircrafts.terminals))
+            ],
+            self.fsls
+        )
+
     def connect_flight_cluster_terminals(self, *f_names: tuple[str]) -> None:
         """Adds flight cluster to satellites links to network graph
 
@@ -162,20 +182,10 @@ class LEOAviationConstellation(Constellation):
         for f_name in f_names:
             fid = self.aircrafts.decode_name(f_name)
             for sat_name, distance_m in self.fsls[fid]:
-                # When pathloss model is available
-                if self.loss_model:
-                    link_bandwidth = self.loss_model.data_rate_bps(
-                        distance_m, len(self.sat_coverage[sat_name])
-                    )/1000000000
-
-                # When pathloss model is not available
-                else:
-                    link_bandwidth = round(
-                        self.GSL_CAPACITY/len(self.sat_coverage[sat_name])
-                    )
-
                 self.sat_net_graph.add_edge(
-                    f_name, sat_name, weight=distance_m, capacity=link_bandwidth
+                    f_name, sat_name,
+                    weight=distance_m,
+                    capacity=self._GSL_capacity(sat_name, distance_m)
                 )
 
     def disconnect_flight_cluster_terminals(self, *f_names: tuple[str]) -> None:
@@ -207,19 +217,23 @@ class LEOAviationConstellation(Constellation):
 
         # Stores the routes with a key G-X_F-Y
         self.routes: dict[str, list[list[str]]] = dict()
-        # Stores the flow per link with a key (hop, hop)
-        self.link_load: dict[tuple[str, str]: set[tuple[str, int]]] = dict()
+        # Links of the routes are indexed in bulk (link_flows)
+        self._link_flows = None
         self.no_path_found: set[str] = set()
         self.k_path_not_found: set[str] = set()
+        self.grid_routing_mismatches: set[str] = set()
+        self.nodes_expanded: int = 0
 
         start_time = time.perf_counter()
 
+        self._reuse_routes()
         if self.PARALLEL_MODE:
             self._proutes()
         else:
             self._sroutes()
 
         self.v.clr()
+        self._record_routes()
         end_time = time.perf_counter()
         self.v.log(
             f'''Routes generated in: {
@@ -229,43 +243,27 @@ class LEOAviationConstellation(Constellation):
     def _proutes(self) -> None:
         "Compute grouts in parallel mode"
 
+        flight_links = [list(fsls) for fsls in self.fsls]
+        flows = list()
         for gid in range(len(self.ground_stations.terminals)):
             if not self.gsls[gid]:
                 continue
 
             source = self.ground_stations.encode_name(gid)
-            self.connect_ground_station(source)
-
-            path_compute = set()
-            with concurrent.futures.ProcessPoolExecutor(mp_context=mp.get_context('fork')) as executor:
-
-                for fid in range(len(self.aircrafts.terminals)):
-                    if not self.fsls[fid]:
-                        continue
-
-                    destination = self.aircrafts.encode_name(fid)
-                    self.connect_flight_cluster_terminals(destination)
-
-                    self.v.rlog(
-                        f'''Generating {self.k} routes  ({
-                            source} to {destination})  '''
-                    )
-
-                    path_compute.add(executor.submit(
-                        k_shortest_paths,
-                        self.sat_net_graph.copy(),
-                        source,
-                        destination,
-                        self.k
-                    ))
-
-                    self.disconnect_flight_cluster_terminals(destination)
+            source_links = list(self.gsls[gid])
+            for fid in range(len(self.aircrafts.terminals)):
+                if not self.fsls[fid]:
+                    continue
 
-                for compute in concurrent.futures.as_completed(path_compute):
-                    compute_status, flow, k_path = compute.result()
-                    self._add_route(compute_status, flow, k_path)
+                flows.append((
+                    source,
+                    source_links,
+                    self.aircrafts.encode_name(fid),
+                    flight_links[fid]
+                ))
 
-            self.disconnect_ground_station(source)
+        self.v.rlog(f'Generating {self.k} routes of {len(flows)} flows  ')
+        self._proute_flows(flows)
 
     def _sroutes(self) -> None:
         "Compute routes in serial mode"
@@ -275,25 +273,53 @@ class LEOAviationConstellation(Constellation):
                 continue
 
             source = self.ground_stations.encode_name(gid)
-            self.connect_ground_station(source)
+            source_links = list(self.gsls[gid])
 
-            for fid in range(len(self.aircrafts.terminals)):
-                if not self.fsls[fid]:
-                    continue
+            destinations = [
+                (self.aircrafts.encode_name(fid), list(self.fsls[fid]))
+                for fid in range(len(self.aircrafts.terminals))
+                if self.fsls[fid]
+            ]
 
-                destination = self.aircrafts.encode_name(fid)
-                self.connect_flight_cluster_terminals(destination)
-
-                self.v.rlog(
-                    f'''Generating {self.k} routes  ({
-                        source} to {destination})  '''
-                )
+            self.v.rlog(
+                f'''Generating {self.k} routes  ({
+                    source} to {len(destinations)} flight clusters)  '''
+            )
 
-                compute_status, flow, k_path = k_shortest_paths(
-                    self.sat_net_graph, source, destination, self.k
-                )
+            for compute_status, flow, k_path in self._k_shortest_paths_from_source(
+                source, source_links, destinations
+            ):
                 self._add_route(compute_status, flow, k_path)
 
-                self.disconnect_flight_cluster_terminals(destination)
 
-            self.disconnect_ground_station(source)
+def _compute_fsls(start: int, end: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the FSLs of a chunk of flight clusters in a worker process
+
+    Parameters
+    ----------
+    start: int
+        Index of the first flight cluster of the chunk
+    end: int
+        Index after the last flight cluster of the chunk
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        Flight cluster IDs, shell IDs, satellite IDs, and mean distances in meters of the FSLs
+    """
+
+    leo_con: LEOAviationConstellation = constellation._worker_constellation
+
+    fids, shell_ids, sids, distances_m = list(), list(), list(), list()
+    for fid in range(start, end):
+        for shell_id, shell in enumerate(leo_con.shells):
+            _, fsl_cluster = leo_con._build_fsl_cluster(
+                fid, leo_con.aircrafts.terminals[fid], shell
+            )
+            for sat_name, distance_m in fsl_cluster.items():
+                fids.append(fid)
+                shell_ids.append(shell_id)
+                sids.append(LEOSatelliteTopology.decode_sat_name(sat_name)[1])
+                distances_m.append(distance_m)
+
+    return np.array(fids, dtype=np.int64), np.array(shell_ids, dtype=np.int64), np.array(sids, dtype=np.int64), np.array(distances_m, dtype=np.float64)
@@ -1,9 +1,6 @@
-import concurrent.futures
-import multiprocessing as mp
 import time
 
 from LEOCraft.constellations.constellation import Constellation
-from LEOCraft.utilities import k_shortest_paths
 
 
 class LEOConstellation(Constellation):
@@ -31,19 +28,23 @@ class LEOConstellation(Constellation):
 
         # Stores the routes with a key G-X_G-Y
         self.routes: dict[str, list[list[str]]] = dict()
-        # Stores the flow per link with a key (hop, hop)
-        self.link_load: dict[tuple[str, str]: set[tuple[str, int]]] = dict()
+        # Links of the routes are indexed in bulk (link_flows)
+        self._link_flows = None
         self.no_path_found: set[str] = set()
         self.k_path_not_found: set[str] = set()
+        self.grid_routing_mismatches: set[str] = set()
+        self.nodes_expanded: int = 0
 
         start_time = time.perf_counter()
 
+        self._reuse_routes()
         if self.PARALLEL_MODE:
             self._proutes()
         else:
             self._sroutes()
 
         self.v.clr()
+        self._record_routes()
         end_time = time.perf_counter()
         self.v.log(
             f'''Routes generated in: {
@@ -53,49 +54,26 @@ class LEOConstellation(Constellation):
     def _proutes(self) -> None:
         "Compute grouts in parallel mode"
 
+        links = [list(gsls) for gsls in self.gsls]
+        flows = list()
         for sgid in range(len(self.ground_stations.terminals)):
             if not self.gsls[sgid]:
                 continue
 
             source = self.ground_stations.encode_name(sgid)
-            self.connect_ground_station(source)
-
-            path_compute = set()
-            with concurrent.futures.ProcessPoolExecutor(mp_context=mp.get_context('fork')) as executor:
-
-                for dgid in range(sgid+1, len(self.ground_stations.terminals)):
-                    if not self.gsls[dgid]:
-                        continue
-
-                    destination = self.ground_stations.encode_name(dgid)
-                    self.connect_ground_station(destination)
-
-                    self.v.rlog(
-                        f'''Generating {self.k} routes  ({
-                            source} to {destination})  '''
-                    )
-
-                    path_compute.add(executor.submit(
-                        k_shortest_paths,
-                        self.sat_net_graph.copy(),
-                        source,
-                        destination,
-                        self.k
-                    ))
-
-                    self.disconnect_ground_station(destination)
+            for dgid in range(sgid+1, len(self.ground_stations.terminals)):
+                if not self.gsls[dgid]:
+                    continue
 
-                for compute in concurrent.futures.as_completed(path_compute):
-                    self.v.rlog(
-                        f'''Route processing complete ({round(
-                            sgid/len(self.ground_stations.terminals)*100
-                        )}%)...       '''
-                    )
-                    compute_status, flow, k_path = compute.result()
-                    self._add_route(compute_status, flow, k_path)
+                flows.append((
+                    source,
+                    links[sgid],
+                    self.ground_stations.encode_name(dgid),
+                    links[dgid]
+                ))
 
-            self.disconnect_ground_station(source)
-            self.v.clr()
+        self.v.rlog(f'Generating {self.k} routes of {len(flows)} flows  ')
+        self._proute_flows(flows)
 
     def _sroutes(self) -> None:
         "Compute routes in serial mode"
@@ -105,24 +83,20 @@ class LEOConstellation(Constellation):
                 continue
 
             source = self.ground_stations.encode_name(sgid)
-            self.connect_ground_station(source)
-
-            for dgid in range(sgid+1, len(self.ground_stations.terminals)):
-                if not self.gsls[dgid]:
-                    continue
-
-                destination = self.ground_stations.encode_name(dgid)
-                self.connect_ground_station(destination)
-
-                self.v.rlog(
-                    f'''Generating {self.k} routes  ({
-                        source} to {destination})  '''
-                )
-
-                compute_status, flow, k_path = k_shortest_paths(
-                    self.sat_net_graph, source, destination, self.k
-                )
+            source_links = list(self.gsls[sgid])
+
+            destinations = [
+                (self.ground_stations.encode_name(dgid), list(self.gsls[dgid]))
+                for dgid in range(sgid+1, len(self.ground_stations.terminals))
+                if self.gsls[dgid]
+            ]
+
+            self.v.rlog(
+                f'''Generating {self.k} routes  ({
+                    source} to {len(destinations)} ground stations)  '''
+            )
+
+            for compute_status, flow, k_path in self._k_shortest_paths_from_source(
+                source, source_links, destinations
+            ):
                 self._add_route(compute_status, flow, k_path)
-
-                self.disconnect_ground_station(destination)
-            self.disconnect_ground_station(source)
@@ -1,21 +1,32 @@
 import concurrent.futures
 import json
+import math
 import multiprocessing as mp
 import os
 import time
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 
 import networkx as nx
+import numpy as np
 from astropy import units as u
 from astropy.time import TimeDelta
 
 from LEOCraft.attenuation.fspl import FSPL
+from LEOCraft.routing.a_star import AStarKShortestPaths
+from LEOCraft.routing.grid_routing import PlusGridRouting
+from LEOCraft.routing.incremental_routing import IncrementalRouting
+from LEOCraft.routing.k_shortest_paths import KShortestPaths
+from LEOCraft.routing.link_flows import LinkFlowMatrix
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.routing.route_store import RouteStore
+from LEOCraft.routing.shortest_paths import ShortestPaths
 from LEOCraft.satellite_topology.LEO_sat_topology import (LEOSatelliteTopology,
                                                           SatelliteInfo)
 from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
 from LEOCraft.user_terminals.ground_station import GroundStation
 from LEOCraft.user_terminals.terminal import TerminalCoordinates
-from LEOCraft.utilities import ProcessingLog
+from LEOCraft.utilities import ProcessingLog, k_shortest_paths
 
 
 class Constellation(ABC):
@@ -25,6 +36,38 @@ class Constellation(ABC):
     GSL_CAPACITY: float = 20.0
     k: int = 20
 
+    # Compute GSLs from the terminal x satellite range matrix of each shell (vectorized)
+    # instead of one visibility query per terminal
+    DENSE_GSL_MODE: bool = False
+
+    # Chunks of terminals per worker process in parallel mode
+    CHUNKS_PER_WORKER: int = 4
+
+    # Compute K shortest routes with the native Yen engine on the array-backed graph
+    # instead of Networkx (same routes in the same order)
+    NATIVE_ROUTING_MODE: bool = False
+
+    # Compute K shortest routes of all the destinations of a source together
+    # with the native engine (same routes in the same order)
+    BATCH_ROUTING_MODE: bool = False
+
+    # Compute the shortest route (K=1 only) of all the flows from one multi-source Dijkstra
+    # of the satellites linked to the terminals (equal length routes may differ on ties)
+    SHORTEST_PATH_ROUTING_MODE: bool = False
+
+    # Compute K shortest routes with A* spur searches, straight-line distance (ECEF)
+    # to the satellites of the destination terminal as heuristic (same routes as Dijkstra)
+    A_STAR_ROUTING_MODE: bool = False
+
+    # Compute K shortest routes of a single +Grid shell in closed form from the grid coordinates
+    # of the satellites (no graph search), validation mode cross-checks with the graph search
+    GRID_ROUTING_MODE: bool = False
+    GRID_ROUTING_VALIDATION_MODE: bool = False
+
+    # Keep the routes of the previous time step (e.g., `iter_time_steps`) and recompute only the flows
+    # whose routes broke or may have been overtaken (same route lengths as routing all the flows)
+    INCREMENTAL_ROUTING_MODE: bool = False
+
     def __init__(self, name: str, PARALLEL_MODE: bool = True) -> None:
         self.PARALLEL_MODE = PARALLEL_MODE
 
@@ -34,10 +77,28 @@ class Constellation(ABC):
 
         self.v = ProcessingLog(self.__class__.__name__)
 
-        # Stores the routes with a key G-X_G-Y
-        self.routes: dict[str, list[list[str]]]
-        # Stores the flow per link with a key (hop, hop)
-        self.link_load: dict[tuple[str, str], set[tuple[str, int]]]
+        # Array-backed network graph, its Networkx view and routing engine
+        self.network_graph: NetworkGraph
+        self._sat_net_graph: nx.Graph | None = None
+        self._routing_engine: KShortestPaths | None = None
+        self._shortest_path_engine: ShortestPaths | None = None
+        self._a_star_engine: AStarKShortestPaths | None = None
+        self._grid_routing_engine: PlusGridRouting | None = None
+
+        # Routes of the previous time step and the reused routes of the current one
+        self._incremental_routing = IncrementalRouting()
+        self._reused_routes: dict[str, list[list[str]]] = dict()
+        self.recomputed_flows: int = 0
+        # Flows whose shortest grid route is longer than the graph search (grid routing validation mode)
+        self.grid_routing_mismatches: set[str] = set()
+        # Nodes expanded by the A* searches of the last routing (A* routing mode)
+        self.nodes_expanded: int = 0
+
+        # Stores the routes as node IDs, decoded to a dict with a key G-X_G-Y on first use (routes)
+        self.route_store: RouteStore
+        self._routes: dict[str, list[list[str]]] | None = None
+        # Sparse incidence matrix of the links and routes, built from the routes on first use
+        self._link_flows: LinkFlowMatrix | None = None
         self.no_path_found: set[str]
         self.k_path_not_found: set[str]
 
@@ -125,8 +186,18 @@ class Constellation(ABC):
             self.v.rlog(f'Processing...  ({shell_id+1}/{len(self.shells)})')
             shell.build_satellites()
             shell.build_ISLs()
+
+            # Propagate all the satellites of the shell at once for the current time
+            shell.satellite_positions_m(self.time_delta)
         self.v.clr()
 
+        self.build_GSLs()
+
+    def build_GSLs(self) -> None:
+        """Generate GSLs and computes satellites coverage at current time delta
+        (requires the ground stations and shells to be built)
+        """
+
         self.v.log('Building ground to satellite links...')
         # Records of user terminals under satellite coverage
         self.sat_coverage: dict[str, set[str]] = dict()
@@ -136,7 +207,9 @@ class Constellation(ABC):
 
         start_time = time.perf_counter()
 
-        if self.PARALLEL_MODE:
+        if self.DENSE_GSL_MODE:
+            self._dbuild_gsls()
+        elif self.PARALLEL_MODE:
             self._pbuild_gsls()
         else:
             self._sbuild_gsls()
@@ -147,26 +220,110 @@ class Constellation(ABC):
             f'''GSLs generated in: {round((end_time-start_time)/60, 2)}m'''
         )
 
+    def satellite_positions_batch_m(
+            self, time_deltas: Iterable[TimeDelta | float], max_memory_bytes: int | None = None
+    ) -> np.ndarray:
+        """Computes the positions of all the satellites of all the shells in ECEF for multiple time steps
+        (requires the shells to be built)
+
+        Parameters
+        ----------
+        time_deltas: Iterable[TimeDelta | float]
+            Time passed from the epoch of each step, plain numbers are read as seconds (e.g., range(200))
+        max_memory_bytes: int | None, optional
+            Working memory budget of one propagation pass of a shell
+
+        Returns
+        -------
+        np.ndarray
+            (T, N, 3) array of cartesian coordinates (x, y, z) in meters,
+            satellites are ordered by shell then satellite ID
+        """
+
+        time_deltas = list(time_deltas)
+        return np.concatenate([
+            shell.satellite_positions_batch_m(time_deltas, max_memory_bytes)
+            for shell in self.shells
+        ], axis=1)
+
+    def iter_time_steps(
+            self, time_deltas: Iterable[TimeDelta | float], max_memory_bytes: int | None = None
+    ) -> Iterator[TimeDelta]:
+        """Steps the constellation through a series of time deltas (requires the constellation to be built).
+        All the shells are propagated in vectorized chunks, and at each step the positions are loaded
+        and the time delta is set, so GSLs, ISL lengths and routes are computed without propagating again, i.e.,
+
+        ```
+        for time_delta in leo_con.iter_time_steps(range(200)):
+            leo_con.build_GSLs()
+            leo_con.create_network_graph()
+        ```
+
+        Parameters
+        ----------
+        time_deltas: Iterable[TimeDelta | float]
+            Time passed from the epoch of each step, plain numbers are read as seconds (e.g., range(200))
+        max_memory_bytes: int | None, optional
+            Working memory budget of one propagation pass of a shell
+
+        Yields
+        ------
+        TimeDelta
+            Time delta of the step
+        """
+
+        time_deltas = list(time_deltas)
+        for steps in zip(*[
+            shell.iter_satellite_positions_m(time_deltas, max_memory_bytes)
+            for shell in self.shells
+        ]):
+            self.time_delta = steps[0][0]
+            yield self.time_delta
+
+    def _dbuild_gsls(self) -> None:
+        "Compute GSLs in dense mode (terminal x satellite range matrix per shell)"
+
+        terminals = self.ground_stations.terminals
+        terminal_positions_m = LEOSatelliteTopology.terminal_positions_m(terminals)
+        elevations_m = np.array([gs.elevation_m for gs in terminals], dtype=np.float64)
+        gs_names = [self.ground_stations.encode_name(gid) for gid in range(len(terminals))]
+
+        for gid in range(len(terminals)):
+            self.gsls[gid] = set()
+
+        for shell_id, shell in enumerate(self.shells):
+            self.v.rlog(f'Processing GSLs...  ({shell_id+1}/{len(self.shells)})')
+
+            gids, sids, distances_m = shell.satellites_in_range_matrix(
+                terminal_positions_m, elevations_m, self.time_delta
+            )
+
+            sat_names = [shell.encode_sat_name(sid) for sid in range(len(shell.satellites))]
+            for gid, sid, distance_m in zip(gids.tolist(), sids.tolist(), distances_m.tolist()):
+                self.gsls[gid].add((sat_names[sid], distance_m))
+                self._add_sat_coverage(sat_names[sid], gs_names[gid])
+
     def _pbuild_gsls(self) -> None:
-        "Compute GSLs in parallel mode"
-        with concurrent.futures.ProcessPoolExecutor(mp_context=mp.get_context('fork')) as executor:
-            gsl_compute = list()
-            for gid, gs in enumerate(self.ground_stations.terminals):
-                self.gsls[gid] = set()
-                self.v.rlog(
-                    f'''Processing GSLs...  ({
-                        gid+1}/{len(self.ground_stations.terminals)})'''
-                )
+        "Compute GSLs in parallel mode, contiguous chunks of ground stations are computed by the workers"
 
-                # For one terminal computing each shell in parallel
-                for shell in self.shells:
+        terminals = self.ground_stations.terminals
+        for gid in range(len(terminals)):
+            self.gsls[gid] = set()
 
-                    gsl_compute.append(
-                        executor.submit(
-                            shell.get_satellites_in_range,
-                            gs, gid, self.time_delta
-                        )
-                    )
+        # Build the spatial indices once, forked workers inherit them
+        for shell in self.shells:
+            shell.spatial_index(self.time_delta)
+
+        sat_names = [
+            [shell.encode_sat_name(sid) for sid in range(len(shell.satellites))]
+            for shell in self.shells
+        ]
+
+        with self._worker_pool() as executor:
+            gsl_compute = [
+                executor.submit(_compute_gsls, start, end)
+                for start, end in self._worker_chunks(len(terminals))
+            ]
 
             compute_count = 0
             for compute in concurrent.futures.as_completed(gsl_compute):
@@ -177,12 +334,106 @@ class Constellation(ABC):
                 )
 
                 # Collecting results and adding list of GSLs and satellite coverage
-                rgid, visible_sats, sats_range_m = compute.result()
-                for sat_name, distance_m in zip(visible_sats, sats_range_m):
+                gids, shell_ids, sids, distances_m = compute.result()
+                for gid, shell_id, sid, distance_m in zip(
+                    gids.tolist(), shell_ids.tolist(), sids.tolist(), distances_m.tolist()
+                ):
                     self._add_sat_coverage(
-                        sat_name, self.ground_stations.encode_name(rgid)
+                        sat_names[shell_id][sid], self.ground_stations.encode_name(gid)
+                    )
+                    self.gsls[gid].add((sat_names[shell_id][sid], distance_m))
+
+    def _worker_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        "Process pool of long-lived workers holding this constellation (shared once per worker by fork)"
+        return concurrent.futures.ProcessPoolExecutor(
+            mp_context=mp.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(self,)
+        )
+
+    def _worker_chunks(self, count: int) -> list[tuple[int, int]]:
+        """Splits the terminal indices into contiguous chunks for the workers
+
+        Parameters
+        ----------
+        count: int
+            Number of terminals
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            List of (start, end) index of the chunks
+        """
+        chunk_size = max(
+            1, math.ceil(count / ((os.cpu_count() or 1) * self.CHUNKS_PER_WORKER))
+        )
+        return [
+            (start, min(start+chunk_size, count))
+            for start in range(0, count, chunk_size)
+        ]
+
+    def _proute_flows(self, flows: list[tuple[str, list[tuple[str, float]], str, list[tuple[str, float]]]]) -> None:
+        """Compute routes of the flows in parallel mode with a single pool for the whole routing phase,
+        chunks of flows across all the sources are computed by the workers
+        (all the flows of a source in one task in batch and shortest path routing mode, largest first)
+
+        Parameters
+        ----------
+        flows: list[tuple[str, list[tuple[str, float]], str, list[tuple[str, float]]]]
+            List of (source name, source links, destination name, destination links),
+            links are (satellite name, distance in meters)
+        """
+
+        # Flows with reused routes (incremental routing mode) are not computed
+        for source, _, destination, _ in flows:
+            flow = f'{source}_{destination}'
+            if flow in self._reused_routes:
+                self._add_route(True, flow, self._reused_routes[flow])
+        flows = [
+            flow for flow in flows if f'{flow[0]}_{flow[2]}' not in self._reused_routes
+        ]
+
+        # Build the static satellite network graph (or routing engine) once, forked workers inherit it
+        if self.GRID_ROUTING_MODE:
+            self.grid_routing_engine
+        if not self.GRID_ROUTING_MODE or self.GRID_ROUTING_VALIDATION_MODE:
+            if self.SHORTEST_PATH_ROUTING_MODE and self.k == 1:
+                self.shortest_path_engine
+            elif self.A_STAR_ROUTING_MODE:
+                self.a_star_engine
+            elif self.NATIVE_ROUTING_MODE or self.BATCH_ROUTING_MODE:
+                self.routing_engine
+            else:
+                self.sat_net_graph
+
+        with self._worker_pool() as executor:
+            if self.BATCH_ROUTING_MODE or (self.SHORTEST_PATH_ROUTING_MODE and self.k == 1):
+                source_flows: dict[str, tuple[str, list[tuple[str, float]], list]] = dict()
+                for source, source_links, destination, destination_links in flows:
+                    source_flows.setdefault(source, (source, source_links, list()))[2].append(
+                        (destination, destination_links)
                     )
-                    self.gsls[rgid].add((sat_name, distance_m))
+                sources = sorted(
+                    source_flows.values(), key=lambda source: len(source[2]), reverse=True
+                )
+                path_compute = [
+                    executor.submit(_compute_routes_from_source, *source)
+                    for source in sources
+                ]
+            else:
+                path_compute = [
+                    executor.submit(_compute_route_batch, flows[start:end])
+                    for start, end in self._worker_chunks(len(flows))
+                ]
+
+            compute_count = 0
+            for compute in concurrent.futures.as_completed(path_compute):
+                compute_count += 1
+                self.v.rlog(
+                    f'''Route processing complete ({
+                        round(compute_count/len(path_compute)*100)}%)...       '''
+                )
+                self._add_route_chunk(*compute.result())
 
     def _sbuild_gsls(self) -> None:
         "Compute GSLs in serial mode"
@@ -210,47 +461,116 @@ class Constellation(ABC):
         self.sat_coverage[sat_name].add(gs_name)
 
     def _add_satellites_from_shell(self, shell: LEOSatelliteTopology) -> None:
-        "Adds encoded satellite name into N/W graph"
-        for sid in range(len(shell.satellites)):
-            self.sat_net_graph.add_node(shell.encode_sat_name(sid))
+        "Adds encoded satellite name into N/W graph, satellite IDs of a shell are contiguous"
+        self.network_graph.add_nodes(
+            [shell.encode_sat_name(sid) for sid in range(len(shell.satellites))]
+        )
 
     def _add_ISLs_from_shell(self, shell: LEOSatelliteTopology) -> None:
-        for sid_a, sid_b in (shell.isls):
-            distance_m, in_ISL_range = shell.distance_between_sat_m(
-                sid_a, sid_b, self.time_delta
-            )
+        isls, distances_m, in_ISL_range = shell.ISL_lengths_m(self.time_delta)
+
+        if not in_ISL_range.all():
+            isl_id = int(np.flatnonzero(~in_ISL_range)[0])
+            sid_a, sid_b = isls[isl_id].tolist()
+            distance_m = distances_m[isl_id]
+            raise ValueError(f"""The distance between two satellites ({sid_a} and {sid_b}) with an ISL exceeded the maximum ISL length ({
+                             distance_m/1000}km > {shell.satellites[sid_a].max_ISL_length_m()/1000}km at time_delta={self.time_delta})""")
+
+        # Satellite IDs of a shell are offset by the satellites of the previous shells
+        offset = self.network_graph.node_id(shell.encode_sat_name(0))
+        self.network_graph.add_edges(
+            isls[:, 0] + offset,
+            isls[:, 1] + offset,
+            distances_m,
+            np.full(len(isls), self.ISL_CAPACITY)
+        )
 
-            if not in_ISL_range:
-                raise ValueError(f"""The distance between two satellites ({sid_a} and {sid_b}) with an ISL exceeded the maximum ISL length ({
-                                 distance_m/1000}km > {shell.satellites[sid_a].max_ISL_length_m()/1000}km at time_delta={self.time_delta})""")
+    def _GSL_capacity(self, sat_name: str, distance_m: float) -> float:
+        """Computes the capacity (Gbps) of a GSL, shared among the terminals under the satellite coverage
 
-            self.sat_net_graph.add_edge(
-                shell.encode_sat_name(sid_a),
-                shell.encode_sat_name(sid_b),
-                weight=distance_m,
-                capacity=self.ISL_CAPACITY
-            )
+        Parameters
+        -------
+        sat_name: str
+            Satellite name
+        distance_m: float
+            GSL length in meters
+
+        Returns
+        -------
+        float
+            Data rate in Gbps
+        """
+
+        # When pathloss model is available
+        if self.loss_model:
+            return self.loss_model.data_rate_bps(
+                distance_m, len(self.sat_coverage[sat_name])
+            )/1000000000
+
+        # When pathloss model is not available
+        return round(
+            self.GSL_CAPACITY/len(self.sat_coverage[sat_name])
+        )
+
+    def _add_terminals_to_network_graph(self, names: list[str], links: list[set[tuple[str, float]]]) -> None:
+        """Adds terminals and their links to satellites (GSLs) into N/W graph
+
+        Parameters
+        -------
+        names: list[str]
+            Terminal names, list index is the terminal ID
+        links: list[set[tuple[str, float]]]
+            Set of (satellite name, distance in meters) of each terminal
+        """
+
+        first_id = self.network_graph.add_nodes(names)
+
+        nodes_a, nodes_b, distances_m, capacities = list(), list(), list(), list()
+        for tid, terminal_links in enumerate(links):
+            for sat_name, distance_m in terminal_links:
+                nodes_a.append(first_id + tid)
+                nodes_b.append(self.network_graph.node_id(sat_name))
+                distances_m.append(distance_m)
+                capacities.append(self._GSL_capacity(sat_name, distance_m))
+
+        self.network_graph.add_edges(nodes_a, nodes_b, distances_m, capacities)
+
+    def _add_user_terminals(self) -> None:
+        "Adds user terminals (ground stations) and their links (GSLs) into N/W graph"
+        self._add_terminals_to_network_graph(
+            [
+                self.ground_stations.encode_name(gid)
+                for gid in range(len(self.ground_stations.terminals))
+            ],
+            self.gsls
+        )
 
     def create_network_graph(self) -> None:
-        """Create network graph using Networkx
-        - Nodes:
+        """Create array-backed (CSR) network graph
+        - Nodes (contiguous integer IDs):
+            - Satellites of each shell
             - Ground stations
-            - Satellites
         - Edges:
-            - GSLs
             - ISLs
+            - GSLs
         - Edge attributes
             - weight: distance in meters
             - capacity: link_bandwidth in Gbps
         """
 
         # Satellite network graph
-        self.sat_net_graph = nx.Graph()
+        self.network_graph = NetworkGraph()
+        self._sat_net_graph = None
+        self._routing_engine = None
+        self._shortest_path_engine = None
+        self._a_star_engine = None
+        self._grid_routing_engine = None
 
         # Add satellites from each shell
         self.v.log('Adding satellites into network graph...')
         for shell in self.shells:
             self._add_satellites_from_shell(shell)
+        self.satellite_count = self.network_graph.number_of_nodes
 
         # Add ISLs from each shell
         self.v.log('Adding ISLs into network graph...')
@@ -259,6 +579,253 @@ class Constellation(ABC):
             self._add_ISLs_from_shell(shell)
         self.v.clr()
 
+        # Add user terminals and GSLs
+        self.v.log('Adding GSLs into network graph...')
+        self._add_user_terminals()
+
+        self.network_graph.build()
+
+    @property
+    def sat_net_graph(self) -> nx.Graph:
+        """Get the satellite network graph in Networkx (satellites and ISLs),
+        built from the array-backed network graph on first use.
+        Ground stations are added/removed with `connect_ground_station` and `disconnect_ground_station`
+
+        Returns
+        -------
+        nx.Graph
+            Network graph with edge attributes weight (meters) and capacity (Gbps)
+        """
+        if self._sat_net_graph is None:
+            self._sat_net_graph = self.network_graph.to_networkx(
+                self.satellite_count
+            )
+        return self._sat_net_graph
+
+    @property
+    def routing_engine(self) -> KShortestPaths:
+        """Get the native K shortest paths engine of the array-backed network graph, built on first use
+
+        Returns
+        -------
+        KShortestPaths
+            Routing engine of the satellite network graph
+        """
+        if self._routing_engine is None:
+            self._routing_engine = KShortestPaths(
+                self.network_graph, self.satellite_count
+            )
+        return self._routing_engine
+
+    @property
+    def shortest_path_engine(self) -> ShortestPaths:
+        """Get the shortest path (K=1) engine of the array-backed network graph with the terminals, built on first use
+
+        Returns
+        -------
+        ShortestPaths
+            Shortest path engine of the satellite network graph
+        """
+        if self._shortest_path_engine is None:
+            self._shortest_path_engine = ShortestPaths(
+                self.network_graph, self.satellite_count
+            )
+        return self._shortest_path_engine
+
+    @property
+    def a_star_engine(self) -> AStarKShortestPaths:
+        """Get the A* K shortest paths engine of the array-backed network graph, built on first use
+
+        Returns
+        -------
+        AStarKShortestPaths
+            A* routing engine of the satellite network graph
+        """
+        if self._a_star_engine is None:
+            self._a_star_engine = AStarKShortestPaths(
+                self.network_graph,
+                self.satellite_count,
+                self._satellite_positions_m()
+            )
+        return self._a_star_engine
+
+    def _satellite_positions_m(self) -> np.ndarray:
+        "Cartesian coordinates (x, y, z) in meters of all the satellites in the node ID order"
+        return np.concatenate([
+            shell.satellite_positions_m(self.time_delta) for shell in self.shells
+        ])
+
+    @property
+    def grid_routing_engine(self) -> PlusGridRouting:
+        """Get the closed-form routing engine of the +Grid shell, built on first use
+
+        Returns
+        -------
+        PlusGridRouting
+            Routing engine of the +Grid shell
+
+        Raises
+        ------
+        ValueError
+            When the constellation has more than one shell or the shell is not +Grid
+        """
+        if self._grid_routing_engine is None:
+            if len(self.shells) != 1:
+                raise ValueError('Grid routing requires a single +Grid shell')
+            self._grid_routing_engine = PlusGridRouting(
+                self.network_graph, self.shells[0]
+            )
+        return self._grid_routing_engine
+
+    def _k_shortest_paths(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destination: str,
+        destination_links: list[tuple[str, float]]
+    ) -> tuple[bool, str, list[list[str]]]:
+        """Computes K shortest routes of a flow over the satellite network graph,
+        the links of the source and destination terminals are attached only for the query
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destination: str
+            Destination terminal name
+        destination_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the destination terminal
+
+        Returns
+        -------
+        tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path
+        """
+
+        if not self.GRID_ROUTING_MODE:
+            return self._search_k_shortest_paths(
+                source, source_links, destination, destination_links
+            )
+
+        routes = self.grid_routing_engine.k_shortest_paths(
+            source, source_links, destination, destination_links, self.k
+        )
+        if self.GRID_ROUTING_VALIDATION_MODE:
+            grid_m, search_m, _ = self.grid_routing_engine.validate(
+                routes,
+                self._search_k_shortest_paths(
+                    source, source_links, destination, destination_links
+                )
+            )
+            if grid_m > search_m * (1 + 1e-9):
+                self.grid_routing_mismatches.add(routes[1])
+        return routes
+
+    def _search_k_shortest_paths(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destination: str,
+        destination_links: list[tuple[str, float]]
+    ) -> tuple[bool, str, list[list[str]]]:
+        """Computes K shortest routes of a flow with a graph search (Networkx, native or A* engine)
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destination: str
+            Destination terminal name
+        destination_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the destination terminal
+
+        Returns
+        -------
+        tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path
+        """
+
+        if self.A_STAR_ROUTING_MODE:
+            nodes_expanded = self.a_star_engine.nodes_expanded
+            routes = self.a_star_engine.k_shortest_paths(
+                source, source_links, destination, destination_links, self.k
+            )
+            self.nodes_expanded += self.a_star_engine.nodes_expanded - nodes_expanded
+            return routes
+        if self.NATIVE_ROUTING_MODE:
+            return self.routing_engine.k_shortest_paths(
+                source, source_links, destination, destination_links, self.k
+            )
+
+        self.sat_net_graph.add_weighted_edges_from(
+            (source, sat_name, distance_m) for sat_name, distance_m in source_links
+        )
+        self.sat_net_graph.add_weighted_edges_from(
+            (destination, sat_name, distance_m) for sat_name, distance_m in destination_links
+        )
+        try:
+            return k_shortest_paths(self.sat_net_graph, source, destination, self.k)
+        finally:
+            self.sat_net_graph.remove_nodes_from((source, destination))
+
+    def _k_shortest_paths_from_source(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destinations: list[tuple[str, list[tuple[str, float]]]]
+    ) -> list[tuple[bool, str, list[list[str]]]]:
+        """Computes K shortest routes of all the flows of a source,
+        together with the shortest path engine in shortest path routing mode (K=1)
+        or with the native engine in batch routing mode, otherwise (and in grid routing mode) flow by flow,
+        the flows with reused routes (incremental routing mode) are not computed
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destinations: list[tuple[str, list[tuple[str, float]]]]
+            List of (destination terminal name, list of (satellite name, distance in meters))
+
+        Returns
+        -------
+        list[tuple[bool, str, list[list[str]]]]
+            Status, flow, list of k shortest path of each destination
+        """
+
+        reused_routes = self._reused_routes
+        if any(f'{source}_{destination}' in reused_routes for destination, _ in destinations):
+            computed_routes = iter(self._k_shortest_paths_from_source(
+                source, source_links, [
+                    (destination, destination_links) for destination, destination_links in destinations
+                    if f'{source}_{destination}' not in reused_routes
+                ]
+            ))
+            return [
+                (True, flow, reused_routes[flow]) if (flow := f'{source}_{destination}') in reused_routes
+                else next(computed_routes)
+                for destination, _ in destinations
+            ]
+
+        if not self.GRID_ROUTING_MODE:
+            if self.SHORTEST_PATH_ROUTING_MODE and self.k == 1:
+                return self.shortest_path_engine.shortest_paths_from_source(
+                    source, source_links, destinations
+                )
+            if self.BATCH_ROUTING_MODE:
+                return self.routing_engine.k_shortest_paths_from_source(
+                    source, source_links, destinations, self.k
+                )
+        return [
+            self._k_shortest_paths(source, source_links, destination, destination_links)
+            for destination, destination_links in destinations
+        ]
+
     def connect_ground_station(self, *gs_names: tuple[str]) -> None:
         """Adds ground to satellites links to network graph
 
@@ -271,20 +838,10 @@ class Constellation(ABC):
         for gs_name in gs_names:
             gid = self.ground_stations.decode_name(gs_name)
             for sat_name, distance_m in self.gsls[gid]:
-                # When pathloss model is available
-                if self.loss_model:
-                    link_bandwidth = self.loss_model.data_rate_bps(
-                        distance_m, len(self.sat_coverage[sat_name])
-                    )/1000000000
-
-                # When pathloss model is not available
-                else:
-                    link_bandwidth = round(
-                        self.GSL_CAPACITY/len(self.sat_coverage[sat_name])
-                    )
-
                 self.sat_net_graph.add_edge(
-                    gs_name, sat_name, weight=distance_m, capacity=link_bandwidth
+                    gs_name, sat_name,
+                    weight=distance_m,
+                    capacity=self._GSL_capacity(sat_name, distance_m)
                 )
 
     def disconnect_ground_station(self, *gs_names: tuple[str]) -> None:
@@ -316,24 +873,31 @@ class Constellation(ABC):
         """
         pass
 
-    def _add_linkload(self, flow_via_route: tuple[str, int], edge: tuple[str, str]) -> None:
-        """Add flow details going through a link (edge)
-
-        Parameters
-        -------
-        flow_via_route: tuple[str, int]
-            Flow key (G-X_G-Y) and route index (k) i.e., (G-X_G-Y, k)
+    def _reuse_routes(self) -> None:
+        "Finds the routes of the previous time step to reuse in incremental routing mode (before routing)"
 
-        edge: tuple[str, str]
-            ISL of GSL link i,e, (G-X, S0-Y)
-        """
-
-        # For new edge
-        if edge not in self.link_load:
-            self.link_load[edge] = set()
+        self._reused_routes = dict()
+        if self.INCREMENTAL_ROUTING_MODE:
+            self._reused_routes = self._incremental_routing.reusable_routes(
+                self.network_graph, self.satellite_count, self._satellite_positions_m(), self.k
+            )
 
-        if flow_via_route not in self.link_load[edge]:
-            self.link_load[edge].add(flow_via_route)
+    def _record_routes(self) -> None:
+        '''Keeps the routes of the time step in incremental routing mode (after routing),
+        reports the recomputed flows, the grid routing mismatches (validation mode) and the nodes expanded (A* routing mode)'''
+
+        flows = len(self.route_store) + len(self.k_path_not_found)
+        if self.GRID_ROUTING_MODE and self.GRID_ROUTING_VALIDATION_MODE:
+            self.v.log(f'Grid routing mismatches: {len(self.grid_routing_mismatches)}/{flows} flows')
+        if self.A_STAR_ROUTING_MODE and (not self.GRID_ROUTING_MODE or self.GRID_ROUTING_VALIDATION_MODE):
+            self.v.log(f'A* nodes expanded: {self.nodes_expanded}')
+        self.recomputed_flows = flows - len(self._reused_routes)
+        if self.INCREMENTAL_ROUTING_MODE:
+            self.v.log(f'Routes recomputed: {self.recomputed_flows}/{flows} flows')
+            self._incremental_routing.record(
+                self.network_graph, self.satellite_count, self.route_store, self.k
+            )
+        self._reused_routes = dict()
 
     def _add_route(self, compute_status: bool, flow: str, k_path: list[list[str]]) -> None:
         '''Post processing of routes routes after  compute
@@ -357,28 +921,120 @@ class Constellation(ABC):
             self.k_path_not_found.add(f'{flow},{len(k_path)}')
             return
 
-        # Storing the routes
-        self.routes[flow] = k_path
+        # Storing the routes, links of the routes are indexed in bulk (link_flows)
+        self.route_store.add(flow, k_path)
+        self._routes = None
+        self._link_flows = None
 
-        # Recording total flows passing through each link
-        for k_index, path in enumerate(k_path):
-            flow_via_route = (flow, k_index)
+    def _route_chunk(
+        self, routes: list[tuple[bool, str, list[list[str]]]]
+    ) -> tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]:
+        '''Packs the computed routes of a worker process into a route store (only the routes `_add_route` keeps),
+        returned to the main process as byte buffers instead of lists of names, together with the
+        grid routing mismatches and the nodes expanded (A* routing mode) of the worker since its last chunk
 
-            # Two end links (ground station to satellite)
-            self._add_linkload(flow_via_route, (path[0], path[1]))
-            self._add_linkload(flow_via_route, (path[-1], path[-2]))
+        Parameters
+        --------
+        routes: list[tuple[bool, str, list[list[str]]]]
+            Status, flow, list of K routes of each flow
 
-            # All intermmidiate links
-            for hop in range(1, len(path)-2):
-                # Adding load in order
-                if path[hop] < path[hop+1]:
-                    self._add_linkload(
-                        flow_via_route, (path[hop], path[hop+1])
-                    )
-                else:
-                    self._add_linkload(
-                        flow_via_route, (path[hop+1], path[hop])
-                    )
+        Returns
+        -------
+        tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]
+            Status, flow, number of routes of each flow, the route store, the grid routing mismatches
+            and the nodes expanded
+        '''
+        route_store = RouteStore(self.network_graph)
+        statuses: list[tuple[bool, str, int]] = list()
+        for compute_status, flow, k_path in routes:
+            statuses.append((compute_status, flow, len(k_path)))
+            if False == compute_status or len(k_path) == self.k:
+                route_store.add(flow, k_path)
+
+        grid_routing_mismatches, self.grid_routing_mismatches = self.grid_routing_mismatches, set()
+        nodes_expanded, self.nodes_expanded = self.nodes_expanded, 0
+        return statuses, route_store, grid_routing_mismatches, nodes_expanded
+
+    def _add_route_chunk(
+        self,
+        statuses: list[tuple[bool, str, int]],
+        route_store: RouteStore,
+        grid_routing_mismatches: set[str],
+        nodes_expanded: int
+    ) -> None:
+        '''Post processing of a chunk of routes from a worker process (`_route_chunk`)
+
+        Parameters
+        --------
+        statuses: list[tuple[bool, str, int]]
+            Status, flow, number of routes of each flow
+        route_store: RouteStore
+            Routes of the chunk
+        grid_routing_mismatches: set[str]
+            Grid routing mismatches of the chunk (validation mode)
+        nodes_expanded: int
+            Nodes expanded by the A* searches of the chunk (A* routing mode)
+        '''
+        for compute_status, flow, count in statuses:
+            if False == compute_status:
+                self.no_path_found.add(flow)
+            if compute_status and count != self.k:
+                self.k_path_not_found.add(f'{flow},{count}')
+
+        self.route_store.extend(route_store)
+        self.grid_routing_mismatches |= grid_routing_mismatches
+        self.nodes_expanded += nodes_expanded
+        self._routes = None
+        self._link_flows = None
+
+    @property
+    def routes(self) -> dict[str, list[list[str]]]:
+        """Get the routes with a key G-X_G-Y, decoded from the route store on first use
+
+        Returns
+        -------
+        dict[str, list[list[str]]]
+            List of K routes of each flow
+        """
+        if self._routes is None:
+            self._routes = self.route_store.to_dict()
+        return self._routes
+
+    @routes.setter
+    def routes(self, routes: dict[str, list[list[str]]]) -> None:
+        "Replaces the route store with the routes of a dict (e.g., an empty dict before routing)"
+        self.route_store = RouteStore(self.network_graph)
+        for flow, k_path in routes.items():
+            self.route_store.add(flow, k_path)
+        self._routes = None
+        self._link_flows = None
+
+    @property
+    def link_flows(self) -> LinkFlowMatrix:
+        """Get the sparse incidence matrix of the links and the routes, built from the routes on first use
+
+        Returns
+        -------
+        LinkFlowMatrix
+            Links x routes (flows x K) incidence matrix with the edge IDs of the network graph
+        """
+        if self._link_flows is None:
+            self._link_flows = LinkFlowMatrix(
+                self.network_graph, self.satellite_count, self.route_store, self.k
+            )
+        return self._link_flows
+
+    @property
+    def link_load(self) -> dict[tuple[str, str], set[tuple[str, int]]]:
+        """Get the flows through each link with a key (hop, hop), i.e., (G-X, S0-Y) or (S0-X, S0-Y)
+        in name order, from the incidence matrix (`link_flows`)
+
+        Returns
+        -------
+        dict[tuple[str, str], set[tuple[str, int]]]
+            Set of (flow, route index) of each link
+        """
+        return self.link_flows.link_load()
 
     def link_capacity(self, node_a: str, node_b: str) -> float:
         """Get the capacity (Gbps) of a link
@@ -395,7 +1051,7 @@ class Constellation(ABC):
         float
             Data rate in Gbps
         """
-        return self.sat_net_graph[node_a][node_b]["capacity"]
+        return self.network_graph.link_capacity(node_a, node_b)
 
     def link_length(self, node_a: str, node_b: str) -> float:
         """Get the length (meters) of a link
@@ -412,7 +1068,7 @@ class Constellation(ABC):
         float
             Length in meters
         """
-        return self.sat_net_graph[node_a][node_b]["weight"]
+        return self.network_graph.link_length(node_a, node_b)
 
     def sat_info(self, sat_name: str) -> SatelliteInfo:
         """Get satellite information at current time delta
@@ -550,3 +1206,125 @@ class Constellation(ABC):
         for gid, visibility in enumerate(self.gsls):
             json_data[self.ground_stations.encode_name(gid)] = list(visibility)
         return self._write_json_file(json_data, filename)
+
+
+# Constellation of the worker process, set once per worker by the pool initializer
+_worker_constellation: Constellation | None = None
+
+
+def _init_worker(constellation: Constellation) -> None:
+    "Pool initializer, keeps the constellation (shells, terminals, time delta, satellite network graph, routing engine) in the worker process"
+    global _worker_constellation
+    _worker_constellation = constellation
+
+
+def _compute_gsls(start: int, end: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the GSLs of a chunk of ground stations in a worker process
+
+    Parameters
+    ----------
+    start: int
+        Index of the first ground station of the chunk
+    end: int
+        Index after the last ground station of the chunk
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        Ground station IDs, shell IDs, satellite IDs, and distances in meters of the GSLs
+    """
+
+    terminals = _worker_constellation.ground_stations.terminals[start:end]
+    terminal_positions_m = LEOSatelliteTopology.terminal_positions_m(terminals)
+    elevations_m = np.array([gs.elevation_m for gs in terminals], dtype=np.float64)
+
+    gids, shell_ids, sids, distances_m = list(), list(), list(), list()
+    for shell_id, shell in enumerate(_worker_constellation.shells):
+        shell_gids, shell_sids, shell_distances_m = shell.satellites_in_range_index(
+            terminal_positions_m, elevations_m, _worker_constellation.time_delta
+        )
+        gids.append(shell_gids + start)
+        shell_ids.append(np.full(len(shell_gids), shell_id))
+        sids.append(shell_sids)
+        distances_m.append(shell_distances_m)
+
+    return np.concatenate(gids), np.concatenate(shell_ids), np.concatenate(sids), np.concatenate(distances_m)
+
+
+def _compute_routes(
+    source: str,
+    source_links: list[tuple[str, float]],
+    destination: str,
+    destination_links: list[tuple[str, float]]
+) -> tuple[bool, str, list[list[str]]]:
+    """Computes K shortest routes of a flow in a worker process over the worker's static satellite network graph
+
+    Parameters
+    ----------
+    source: str
+        Source terminal name
+    source_links: list[tuple[str, float]]
+        List of (satellite name, distance in meters) of the source terminal
+    destination: str
+        Destination terminal name
+    destination_links: list[tuple[str, float]]
+        List of (satellite name, distance in meters) of the destination terminal
+
+    Returns
+    -------
+    tuple[bool, str, list[list[str]]]
+        Status, flow, list of k shortest path
+    """
+    return _worker_constellation._k_shortest_paths(
+        source, source_links, destination, destination_links
+    )
+
+
+def _compute_route_batch(
+    flows: list[tuple[str, list[tuple[str, float]], str, list[tuple[str, float]]]]
+) -> tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]:
+    """Computes K shortest routes of a chunk of flows in a worker process
+
+    Parameters
+    ----------
+    flows: list[tuple[str, list[tuple[str, float]], str, list[tuple[str, float]]]]
+        List of (source name, source links, destination name, destination links)
+
+    Returns
+    -------
+    tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]
+        Status, flow, number of routes of each flow, the route store, the grid routing mismatches
+        and the nodes expanded of the chunk
+    """
+    return _worker_constellation._route_chunk(
+        [_compute_routes(*flow) for flow in flows]
+    )
+
+
+def _compute_routes_from_source(
+    source: str,
+    source_links: list[tuple[str, float]],
+    destinations: list[tuple[str, list[tuple[str, float]]]]
+) -> tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]:
+    """Computes K shortest routes of all the flows of a source in a worker process
+
+    Parameters
+    ----------
+    source: str
+        Source terminal name
+    source_links: list[tuple[str, float]]
+        List of (satellite name, distance in meters) of the source terminal
+    destinations: list[tuple[str, list[tuple[str, float]]]]
+        List of (destination terminal name, list of (satellite name, distance in meters))
+
+    Returns
+    -------
+    tuple[list[tuple[bool, str, int]], RouteStore, set[str], int]
+        Status, flow, number of routes of each destination, the route store, the grid routing mismatches
+        and the nodes expanded of the source
+    """
+    return _worker_constellation._route_chunk(
+        _worker_constellation._k_shortest_paths_from_source(
+            source, source_links, destinations
+        )
+    )
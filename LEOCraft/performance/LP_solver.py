@@ -0,0 +1,649 @@
+import concurrent.futures
+import multiprocessing as mp
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import bmat, csr_matrix, diags, save_npz
+from scipy.sparse.csgraph import connected_components
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+
+
+class LPSolver(ABC):
+    '''
+    Abstract class for the LP solver backends of the throughput
+
+    Solves the LP in sparse matrix form, i.e., maximize `objective @ x`
+    subject to `constraints @ x <= bounds` and `0 <= x <= 1`
+    '''
+
+    # Approximate solution, objective_bound is an upper bound of the optimum
+    APPROXIMATE: bool = False
+
+    def __init__(self) -> None:
+        # Optimal (or approximate) objective value, upper bound of the optimum and solution
+        self.objective_value: float
+        self.objective_bound: float
+        self.x: np.ndarray
+        # Optimal dual value (shadow price) of each constraint, not set by the approximate solvers
+        self.duals: np.ndarray
+
+    @abstractmethod
+    def solve(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        '''Solves the LP and sets objective_value, x and duals (exact solvers)
+
+        Parameters
+        ----------
+        objective: np.ndarray
+            Objective coefficient of each variable
+        constraints: csr_matrix
+            Constraint matrix (constraints x variables)
+        bounds: np.ndarray
+            Upper bound of each constraint
+        variable_names: list[str] | None, optional
+            Names of the variables (if supported by the solver)
+        constraint_names: list[str] | None, optional
+            Names of the constraints (if supported by the solver)
+        '''
+        pass
+
+    def update(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_keys: list,
+        constraint_keys: list,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        '''Solves the LP after the LP of the previous solve changed (warm start), the variables and constraints
+        are matched by their keys, the LP is solved from scratch by default
+
+        Parameters
+        ----------
+        objective: np.ndarray
+            Objective coefficient of each variable
+        constraints: csr_matrix
+            Constraint matrix (constraints x variables)
+        bounds: np.ndarray
+            Upper bound of each constraint
+        variable_keys: list
+            Unique hashable key of each variable
+        constraint_keys: list
+            Unique hashable key of each constraint
+        variable_names: list[str] | None, optional
+            Names of the variables (if supported by the solver)
+        constraint_names: list[str] | None, optional
+            Names of the constraints (if supported by the solver)
+        '''
+        self.solve(
+            objective, constraints, bounds, variable_names, constraint_names
+        )
+
+    @abstractmethod
+    def export(self, filename: str) -> str:
+        '''Writes the LP into a file
+
+        Parameters
+        ----------
+        filename: str
+            Path of the file without extension
+
+        Returns
+        -------
+        str
+            Path of the written file
+        '''
+        pass
+
+
+class GurobiLPSolver(LPSolver):
+    '''
+    Implements LPSolver with the Gurobi matrix API (requires gurobipy and a licence)
+
+    The model stays alive between the solves, `update` removes and adds only the variables and constraints
+    whose keys changed, changes the objective, bounds and the changed coefficients,
+    then Gurobi re-optimizes from the basis of the previous solve
+    '''
+
+    def __init__(self) -> None:
+        super().__init__()
+        if gp is None:
+            raise ModuleNotFoundError(
+                'gurobipy is not installed, use the HiGHS solver (highs)'
+            )
+        self.model: gp.Model | None = None
+
+        # Variables and constraints of the model in the LP order, their keys and the constraint matrix (warm start)
+        self._variables: list[gp.Var] = list()
+        self._constrs: list[gp.Constr] = list()
+        self._variable_index: dict = dict()
+        self._constraint_index: dict = dict()
+        self._constraints: csr_matrix | None = None
+        self._retired_variables: list[gp.Var] = list()
+        self._retired_constrs: list[gp.Constr] = list()
+
+        # Variables and constraints removed, added and coefficients changed by the last update
+        self.update_stats: dict[str, int] = dict()
+
+    def solve(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        self.model = gp.Model("ThroughputLP")
+        self.model.setParam("OutputFlag", False)
+
+        variables = self.model.addMVar(
+            len(objective), lb=0, ub=1, vtype=GRB.CONTINUOUS
+        )
+        self.model.setObjective(objective @ variables, GRB.MAXIMIZE)
+        constrs = self.model.addMConstr(constraints, variables, '<', bounds)
+
+        if variable_names is not None or constraint_names is not None:
+            self.model.update()
+        if variable_names is not None:
+            self.model.setAttr('VarName', variables.tolist(), variable_names)
+        if constraint_names is not None:
+            self.model.setAttr('ConstrName', constrs.tolist(), constraint_names)
+
+        self._variables = variables.tolist()
+        self._constrs = constrs.tolist()
+        self._constraints = constraints
+        self._variable_index, self._constraint_index = dict(), dict()
+        self._retired_variables, self._retired_constrs = list(), list()
+        self._optimize()
+
+    def update(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_keys: list,
+        constraint_keys: list,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        if self.model is None or not self._variable_index:
+            self.solve(
+                objective, constraints, bounds, variable_names, constraint_names
+            )
+            self._keep_keys(variable_keys, constraint_keys)
+            return
+
+        # Position of each variable and constraint in the previous LP (-1 when new)
+        previous_columns = np.array(
+            [self._variable_index.get(key, -1) for key in variable_keys], dtype=np.int64
+        )
+        previous_rows = np.array(
+            [self._constraint_index.get(key, -1) for key in constraint_keys], dtype=np.int64
+        )
+        kept_columns, kept_rows = previous_columns >= 0, previous_rows >= 0
+
+        # Variables and constraints not in the new LP, basic variables are fixed to 0 and binding constraints
+        # are relaxed instead of removed (removing them discards the basis), they are removed once nonbasic
+        # (basic slack) in a later update
+        removed_variables = np.ones(len(self._variables), dtype=bool)
+        removed_variables[previous_columns[kept_columns]] = False
+        removed_constrs = np.ones(len(self._constrs), dtype=bool)
+        removed_constrs[previous_rows[kept_rows]] = False
+
+        retired = self._retired_variables + [
+            self._variables[column] for column in np.flatnonzero(removed_variables).tolist()
+        ]
+        basic = np.array(self.model.getAttr('VBasis', retired), dtype=np.int64) == 0 \
+            if retired else np.empty(0, dtype=bool)
+        self._retired_variables = [
+            variable for variable, is_basic in zip(retired, basic.tolist()) if is_basic
+        ]
+        self.model.setAttr('UB', self._retired_variables, [0.0] * len(self._retired_variables))
+        self.model.setAttr('Obj', self._retired_variables, [0.0] * len(self._retired_variables))
+
+        # Relaxed bound above the row sum, finite since the solver discards the basis on infinite bounds
+        removed_rows = np.flatnonzero(removed_constrs)
+        self.model.setAttr(
+            'RHS', [self._constrs[row] for row in removed_rows.tolist()],
+            (abs(self._constraints[removed_rows]).sum(axis=1).A1 + 1).tolist()
+        )
+        retired_constrs = self._retired_constrs + [
+            self._constrs[row] for row in removed_rows.tolist()
+        ]
+        binding = np.array(self.model.getAttr('CBasis', retired_constrs), dtype=np.int64) != 0 \
+            if retired_constrs else np.empty(0, dtype=bool)
+        self._retired_constrs = [
+            constr for constr, is_binding in zip(retired_constrs, binding.tolist()) if is_binding
+        ]
+
+        self.model.remove(
+            [variable for variable, is_basic in zip(retired, basic.tolist()) if not is_basic]
+            + [constr for constr, is_binding in zip(retired_constrs, binding.tolist()) if not is_binding]
+        )
+
+        # New variables, then the objective of all the variables
+        variables = np.empty(len(variable_keys), dtype=object)
+        variables[kept_columns] = [
+            self._variables[column] for column in previous_columns[kept_columns].tolist()
+        ]
+        variables[~kept_columns] = self.model.addMVar(
+            int((~kept_columns).sum()), lb=0, ub=1, vtype=GRB.CONTINUOUS
+        ).tolist()
+        variables = variables.tolist()
+        self.model.setAttr('Obj', variables, objective.tolist())
+
+        # New constraints over all the variables
+        constrs = np.empty(len(constraint_keys), dtype=object)
+        constrs[kept_rows] = [
+            self._constrs[row] for row in previous_rows[kept_rows].tolist()
+        ]
+        if not kept_rows.all():
+            constrs[~kept_rows] = self.model.addMConstr(
+                constraints[~kept_rows], gp.MVar.fromlist(variables), '<', bounds[~kept_rows]
+            ).tolist()
+        constrs = constrs.tolist()
+
+        # Bounds of the kept constraints and their changed coefficients
+        kept_row_ids, kept_column_ids = np.flatnonzero(kept_rows), np.flatnonzero(kept_columns)
+        self.model.setAttr(
+            'RHS', [constrs[row] for row in kept_row_ids.tolist()], bounds[kept_rows].tolist()
+        )
+        kept_constraints = constraints[kept_row_ids]
+        changes = (
+            kept_constraints[:, kept_column_ids]
+            - self._constraints[previous_rows[kept_rows]][:, previous_columns[kept_columns]]
+        ).tocoo()
+        changed = changes.data != 0
+        rows = kept_row_ids[changes.row[changed]]
+        columns = kept_column_ids[changes.col[changed]]
+
+        # Coefficients of the new variables in the kept constraints
+        new_column_ids = np.flatnonzero(~kept_columns)
+        new_coefficients = kept_constraints[:, new_column_ids].tocoo()
+        rows = np.concatenate((rows, kept_row_ids[new_coefficients.row]))
+        columns = np.concatenate((columns, new_column_ids[new_coefficients.col]))
+
+        values = np.asarray(constraints[rows, columns]).ravel() if len(rows) else np.empty(0)
+        for row, column, value in zip(rows.tolist(), columns.tolist(), values.tolist()):
+            self.model.chgCoeff(constrs[row], variables[column], value)
+
+        self.update_stats = {
+            'removed_variables': int(removed_variables.sum()),
+            'added_variables': len(new_column_ids),
+            'removed_constraints': int(removed_constrs.sum()),
+            'added_constraints': int((~kept_rows).sum()),
+            'changed_coefficients': len(values)
+        }
+
+        if variable_names is not None:
+            self.model.setAttr('VarName', variables, variable_names)
+        if constraint_names is not None:
+            self.model.setAttr('ConstrName', constrs, constraint_names)
+
+        self._variables, self._constrs, self._constraints = variables, constrs, constraints
+        self._keep_keys(variable_keys, constraint_keys)
+        self._optimize()
+
+    def _keep_keys(self, variable_keys: list, constraint_keys: list) -> None:
+        'Index of the variables and constraints by their keys for the next update'
+        self._variable_index = {key: index for index, key in enumerate(variable_keys)}
+        self._constraint_index = {key: index for index, key in enumerate(constraint_keys)}
+
+    def _optimize(self) -> None:
+        self.model.optimize()
+        self.objective_value = self.objective_bound = self.model.objVal
+        self.x = np.array(self.model.getAttr('X', self._variables))
+        self.duals = np.array(self.model.getAttr('Pi', self._constrs))
+
+    def export(self, filename: str) -> str:
+        filename = f'{filename}.lp'
+        self.model.write(filename)
+        return filename
+
+
+class HiGHSLPSolver(LPSolver):
+    'Implements LPSolver with the HiGHS solver of scipy (`linprog`, no licence)'
+
+    # Solution values below the tolerance are not selected (zero as a basic solution of Gurobi)
+    TOLERANCE = 1e-9
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._objective: np.ndarray
+        self._constraints: csr_matrix
+        self._bounds: np.ndarray
+
+    def solve(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        self._objective, self._constraints, self._bounds = objective, constraints, bounds
+
+        # linprog rejects a LP with no variables (e.g., no flow has a route)
+        if len(objective) == 0:
+            self.x, self.duals = np.zeros(0), np.zeros(len(bounds))
+            self.objective_value = self.objective_bound = 0.0
+            return
+
+        result = linprog(
+            -objective, A_ub=constraints, b_ub=bounds, bounds=(0, 1), method='highs'
+        )
+        if not result.success:
+            raise RuntimeError(f'LP not solved: {result.message}')
+
+        self.x = np.clip(result.x, 0, 1)
+        self.x[self.x < self.TOLERANCE] = 0
+        # Marginals of the minimization of -objective
+        self.duals = -result.ineqlin.marginals
+        self.objective_value = self.objective_bound = float(-result.fun)
+
+    def export(self, filename: str) -> str:
+        return _export_sparse_LP(filename, self._objective, self._constraints, self._bounds)
+
+
+class GargKonemannLPSolver(LPSolver):
+    '''
+    Implements LPSolver with an approximate Garg-Könemann solver of the packing LP (no licence, vectorized NumPy)
+
+    - Constraint rows are normalized by their bounds and start with the length `delta / bound`, in each iteration
+      all the columns within `1 + epsilon` of the lowest length per objective unit (e.g., the shortest routes
+      per Gbps of demand) get their bottleneck amount, scaled down so that no row exceeds its bound in the iteration,
+      then the length of each row grows by `1 + epsilon * load / bound`
+    - The solution is the sum of the amounts scaled down to the most loaded row (always feasible)
+    - The dual lengths scaled by the lowest length per objective unit give an upper bound of the optimum
+      (objective_bound, weak duality)
+    - Stops when the objective is within `1 - epsilon` of the upper bound, i.e., objective_value
+      >= (1 - epsilon) * optimum, or at the Garg-Könemann limit of the lengths (sum of the lengths 1)
+
+    Constraint rows with no bound (zero capacity) block their columns, columns with no constraint entry
+    take their variable bound (x = 1) outside the iterations
+    '''
+
+    APPROXIMATE = True
+
+    def __init__(self, epsilon: float = 0.1) -> None:
+        '''
+        Parameters
+        ----------
+        epsilon: float, optional
+            Accuracy of the solution, default 0.1
+        '''
+        super().__init__()
+        self.epsilon = epsilon
+        self.iterations = 0
+
+        self._objective: np.ndarray
+        self._constraints: csr_matrix
+        self._bounds: np.ndarray
+
+    def solve(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        self._objective, self._constraints, self._bounds = objective, constraints, bounds
+        epsilon = self.epsilon
+
+        # No columns to price (e.g., no flow has a route)
+        if len(objective) == 0:
+            self.x = np.zeros(0)
+            self.objective_value = self.objective_bound = 0.0
+            self.iterations = 0
+            return
+
+        # Rows normalized by their bounds, columns blocked by the rows with no bound or with no objective
+        rows = bounds > 0
+        normalized = (diags(np.where(rows, 1 / np.where(rows, bounds, 1), 0)) @ constraints).tocsr()
+        normalized_T = normalized.T.tocsr()
+        columns = objective > 0
+        columns[constraints[~rows].indices] = False
+
+        # Bottleneck amount of each column, the columns in no row are bounded only by x <= 1
+        bottleneck = normalized_T.max(axis=1).toarray().ravel()
+        free = columns & (bottleneck <= 0)
+        columns &= ~free
+        amounts = np.where(columns & (bottleneck > 0), 1 / np.where(bottleneck > 0, bottleneck, 1), 0)
+
+        delta = max(np.exp(
+            np.log(1 + epsilon) - np.log((1 + epsilon) * normalized.shape[0]) / epsilon
+        ), 1e-300)
+        lengths = np.full(normalized.shape[0], delta)
+        x = np.zeros(len(objective))
+        loads = np.zeros(normalized.shape[0])
+        cost = np.full(len(objective), np.inf)
+
+        self.objective_value, self.objective_bound, self.iterations = 0.0, np.inf, 0
+        while True:
+            # Lowest length per objective unit of the columns, upper bound of the optimum
+            cost[columns] = (normalized_T @ lengths)[columns] / objective[columns]
+            lowest = cost.min()
+            self.objective_bound = min(
+                self.objective_bound, float(lengths.sum() / lowest)
+            )
+            if lengths.sum() >= 1 or self.objective_value >= (1 - epsilon) * self.objective_bound:
+                break
+
+            # Bottleneck amounts of the columns within 1 + epsilon of the lowest one
+            step = np.where(cost <= (1 + epsilon) * lowest, amounts, 0)
+            load = normalized @ step
+            scale = min(1.0, 1 / load.max())
+            x += scale * step
+            loads += scale * load
+            lengths *= 1 + epsilon * scale * load
+
+            self.objective_value = float(objective @ x) / loads.max()
+            self.iterations += 1
+
+        self.x = x / loads.max() if loads.max() > 0 else x
+        self.x[free] = 1
+        self.objective_value = float(objective @ self.x)
+        self.objective_bound += float(objective[free].sum())
+
+    def export(self, filename: str) -> str:
+        return _export_sparse_LP(filename, self._objective, self._constraints, self._bounds)
+
+
+class DecomposedLPSolver(LPSolver):
+    '''
+    Implements LPSolver by solving the independent blocks of the LP with another LP solver backend
+
+    - Blocks are the connected components of the rows and columns of the constraint matrix (`LP_blocks`),
+      e.g., flows of regional clusters of ground stations sharing no link with the others
+    - Blocks are spread over a process pool (largest first to the least loaded worker),
+      each worker solves its blocks one by one as separate LPs
+    - Solutions, duals and objective values of the blocks are merged into the solution of the LP
+    '''
+
+    def __init__(self, block_solver: type[LPSolver], max_workers: int | None = None, **parameters) -> None:
+        '''
+        Parameters
+        ----------
+        block_solver: type[LPSolver]
+            LP solver backend of the blocks
+        max_workers: int | None, optional
+            Number of worker processes, default number of CPUs
+        parameters:
+            Attributes of the block solvers (e.g., epsilon of GargKonemannLPSolver)
+        '''
+        super().__init__()
+        self.block_solver = block_solver
+        self.max_workers = max_workers if max_workers else os.cpu_count()
+        self.parameters = parameters
+        self.APPROXIMATE = block_solver.APPROXIMATE
+
+        # (rows, columns) of each block of the last solve, largest first
+        self.block_sizes: list[tuple[int, int]] = list()
+
+        self._objective: np.ndarray
+        self._constraints: csr_matrix
+        self._bounds: np.ndarray
+
+    def solve(
+        self,
+        objective: np.ndarray,
+        constraints: csr_matrix,
+        bounds: np.ndarray,
+        variable_names: list[str] | None = None,
+        constraint_names: list[str] | None = None
+    ) -> None:
+        self._objective, self._constraints, self._bounds = objective, constraints, bounds
+
+        blocks = LP_blocks(constraints)
+        self.block_sizes = [(len(rows), len(columns)) for rows, columns in blocks]
+
+        # Blocks of each worker, balanced by the non-zeros
+        nonzeros = np.diff(constraints.indptr)
+        workers: list[list[int]] = [list() for _ in range(min(self.max_workers, len(blocks)))]
+        worker_loads = np.zeros(len(workers))
+        for block, (rows, _) in enumerate(blocks):
+            worker = int(np.argmin(worker_loads))
+            workers[worker].append(block)
+            worker_loads[worker] += nonzeros[rows].sum() + 1
+
+        LPs = [
+            [(objective[columns], constraints[rows][:, columns], bounds[rows]) for rows, columns in (
+                blocks[block] for block in worker_blocks
+            )]
+            for worker_blocks in workers
+        ]
+        if len(LPs) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                mp_context=mp.get_context('fork'),
+                max_workers=len(LPs)
+            ) as executor:
+                solutions = list(executor.map(
+                    _solve_LP_blocks, [self.block_solver] * len(LPs), [self.parameters] * len(LPs), LPs
+                ))
+        else:
+            solutions = [_solve_LP_blocks(self.block_solver, self.parameters, LP) for LP in LPs]
+
+        self.x = np.zeros(len(objective))
+        self.duals = np.zeros(constraints.shape[0])
+        self.objective_value = self.objective_bound = 0.0
+        for worker_blocks, worker_solutions in zip(workers, solutions):
+            for block, (x, duals, objective_value, objective_bound) in zip(worker_blocks, worker_solutions):
+                rows, columns = blocks[block]
+                self.x[columns] = x
+                if duals is not None:
+                    self.duals[rows] = duals
+                self.objective_value += objective_value
+                self.objective_bound += objective_bound
+
+    def export(self, filename: str) -> str:
+        return _export_sparse_LP(filename, self._objective, self._constraints, self._bounds)
+
+
+def LP_blocks(constraints: csr_matrix) -> list[tuple[np.ndarray, np.ndarray]]:
+    '''Finds the independent blocks of a LP, i.e., connected components of the bipartite graph of the rows
+    and columns of the constraint matrix (a row and a column are linked by a non-zero coefficient)
+
+    Parameters
+    ----------
+    constraints: csr_matrix
+        Constraint matrix (constraints x variables)
+
+    Returns
+    -------
+    list[tuple[np.ndarray, np.ndarray]]
+        Rows and columns of each block, the largest block (most columns) first
+    '''
+
+    pattern = (constraints != 0).astype(np.int8)
+    count, labels = connected_components(
+        bmat([[None, pattern], [pattern.T, None]], format='csr'), directed=False
+    )
+    row_labels, column_labels = labels[:constraints.shape[0]], labels[constraints.shape[0]:]
+
+    row_order, column_order = np.argsort(row_labels, kind='stable'), np.argsort(column_labels, kind='stable')
+    rows = np.split(row_order, np.cumsum(np.bincount(row_labels, minlength=count))[:-1])
+    columns = np.split(column_order, np.cumsum(np.bincount(column_labels, minlength=count))[:-1])
+    return sorted(zip(rows, columns), key=lambda block: len(block[1]), reverse=True)
+
+
+def _solve_LP_blocks(
+    block_solver: type[LPSolver],
+    parameters: dict,
+    LPs: list[tuple[np.ndarray, csr_matrix, np.ndarray]]
+) -> list[tuple[np.ndarray, np.ndarray | None, float, float]]:
+    '''Solves the blocks of a LP one by one (worker process of DecomposedLPSolver)
+
+    Parameters
+    ----------
+    block_solver: type[LPSolver]
+        LP solver backend of the blocks
+    parameters: dict
+        Attributes of the block solver
+    LPs: list[tuple[np.ndarray, csr_matrix, np.ndarray]]
+        Objective, constraint matrix and bounds of each block
+
+    Returns
+    -------
+    list[tuple[np.ndarray, np.ndarray | None, float, float]]
+        Solution, duals (exact solvers), objective value and upper bound of each block
+    '''
+
+    solutions = list()
+    for objective, constraints, bounds in LPs:
+        solver = block_solver()
+        for name, value in parameters.items():
+            setattr(solver, name, value)
+        solver.solve(objective, constraints, bounds)
+        solutions.append((
+            solver.x, getattr(solver, 'duals', None), solver.objective_value, solver.objective_bound
+        ))
+    return solutions
+
+
+def _export_sparse_LP(filename: str, objective: np.ndarray, constraints: csr_matrix, bounds: np.ndarray) -> str:
+    '''Writes the constraint matrix (sparse npz), the objective and bounds are written alongside (npy)
+
+    Parameters
+    ----------
+    filename: str
+        Path of the file without extension
+    objective: np.ndarray
+        Objective coefficient of each variable
+    constraints: csr_matrix
+        Constraint matrix (constraints x variables)
+    bounds: np.ndarray
+        Upper bound of each constraint
+
+    Returns
+    -------
+    str
+        Path of the written file
+    '''
+    save_npz(f'{filename}.npz', constraints)
+    np.save(f'{filename}_objective.npy', objective)
+    np.save(f'{filename}_bounds.npy', bounds)
+    return f'{filename}.npz'
+
+
+# LP solver backends by name (ThroughputLP.LP_SOLVER)
+LP_SOLVERS: dict[str, type[LPSolver]] = {
+    'gurobi': GurobiLPSolver,
+    'highs': HiGHSLPSolver,
+    'garg_konemann': GargKonemannLPSolver
+}
@@ -43,14 +43,6 @@ class Stretch(Performance):
         self.v.log('Building stretch...')
         self._rcategories.classify()
 
-        # Connect all the ground station
-        self.v.rlog('Connecting all ground stations...')
-        for gid, _ in enumerate(self.leo_con.ground_stations.terminals):
-            self.leo_con.connect_ground_station(
-                self.leo_con.ground_stations.encode_name(gid)
-            )
-        self.v.clr()
-
     def compute(self) -> None:
         self.v.log('Computing stretch...')
 
@@ -125,14 +117,10 @@ class Stretch(Performance):
 
         # For each route of K routes
         for route in k_routes:
-            route_length_m = 0
-
             # Each edge in that route
-            for hop in range(len(route)-1):
-                route_length_m += self.leo_con.link_length(
-                    route[hop], route[hop+1]
-                )
-            routes_length_m.append(route_length_m)
+            routes_length_m.append(
+                self.leo_con.network_graph.path_length_m(route)
+            )
             routes_hop_count.append(len(route))
 
         return (
@@ -2,16 +2,22 @@ import json
 import time
 from abc import abstractmethod
 
-import gurobipy as gp
-from gurobipy import GRB
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
 
 from LEOCraft.constellations.constellation import Constellation
 from LEOCraft.constellations.LEO_aviation_constellation import \
     LEOAviationConstellation
 from LEOCraft.constellations.LEO_constellation import LEOConstellation
+from LEOCraft.performance.LP_solver import (LP_SOLVERS, DecomposedLPSolver,
+                                             GargKonemannLPSolver, LP_blocks,
+                                             LPSolver)
 from LEOCraft.performance.performance import Performance
 from LEOCraft.performance.route_classifier.flow_classifier import \
     FlowClassifier
+from LEOCraft.routing.link_flows import LinkFlowMatrix
+from LEOCraft.routing.route_store import RouteStore
+from LEOCraft.routing.shortest_paths import ShortestPaths
 
 
 class ThroughputLP(Performance):
@@ -20,6 +26,45 @@ class ThroughputLP(Performance):
     using multi-commodity flow (MCNF) across ground stations using linear program
     """
 
+    # Name the variables and constraints of the LP by flows and links (e.g., export_LP_model),
+    # otherwise solver default names (faster LP formation)
+    LP_NAMES_MODE: bool = False
+
+    # LP solver backend (LP_solver.LP_SOLVERS), i.e., gurobi (licence), highs (scipy, no licence)
+    # or garg_konemann (approximate, no licence), set on an instance or globally on the class
+    LP_SOLVER: str = 'gurobi'
+
+    # Accuracy of the approximate solver (garg_konemann), throughput within 1 - epsilon of the optimum
+    APPROXIMATION_EPSILON: float = 0.1
+
+    # Keep the LP of the previous compute alive (next time step or `warm_start_from` a neighbouring design),
+    # update only the changed routes, links, capacities and demands and re-optimize from the previous basis
+    # (Gurobi, HiGHS solves from scratch)
+    WARM_START_MODE: bool = False
+
+    # Presolve the LP before the solver, i.e., drop the links that can not saturate even with the full demand
+    # of every flow through them and keep one row of the links with the same routes (tightest capacity)
+    PRESOLVE_MODE: bool = False
+
+    # Column generation, i.e., the LP starts with the first (shortest) route of each flow (K = 1 routing is enough),
+    # new routes of any length are priced by the shortest paths over the dual-weighted links and added
+    # until no route improves the throughput (exact solvers, i.e., gurobi or highs)
+    COLUMN_GENERATION_MODE: bool = False
+
+    # Limits of the column generation, routes of a flow and LP solves
+    COLUMN_GENERATION_MAX_ROUTES: int = 20
+    COLUMN_GENERATION_MAX_ITERATIONS: int = 100
+
+    # Split the LP into its independent blocks (flows sharing no link, e.g., regional clusters of ground stations
+    # or a network split by coverage gaps) solved as separate LPs in a process pool (no warm start)
+    DECOMPOSITION_MODE: bool = False
+
+    # Worker processes of the decomposition, default number of CPUs
+    DECOMPOSITION_MAX_WORKERS: int | None = None
+
+    # Find and report the sizes of the independent blocks of the LP (LP_block_sizes) without the decomposition
+    LP_BLOCKS_REPORT_MODE: bool = False
+
     def __init__(self, leo_con: Constellation | LEOConstellation | LEOAviationConstellation, tm_path: str) -> None:
         super().__init__(leo_con)
         self._traffic_metrics_file = tm_path
@@ -30,9 +75,16 @@ class ThroughputLP(Performance):
 
         # Computer throughput using LP
         self.throughput_Gbps: float
+        # Upper bound of the throughput (same as throughput_Gbps unless approximate)
+        self.throughput_upper_bound_Gbps: float
         # Extract routes selected by the LP solver (results)
         self.total_accommodated_flow: float
 
+        # Fraction of each flow (rows in the order of the route store) via each of the K routes (columns)
+        self.path_selection_matrix: csr_matrix
+        # Dict view of path_selection_matrix, decoded on the first access of path_selection
+        self._path_selection: dict[str, dict[int, float]] | None = None
+
         # % of routes selected in each flow catagory
         self.NS_selt: float
         self.EW_selt: float
@@ -42,6 +94,24 @@ class ThroughputLP(Performance):
 
         self._rcategories: FlowClassifier
 
+        # LP solver backend of the last compute
+        self.solver: LPSolver | None = None
+
+        # Rows eliminated by the presolve of the last compute (PRESOLVE_MODE)
+        self.presolve_stats: dict[str, int] = dict()
+        # Rows of the LP kept by the presolve (all the rows without presolve)
+        self._LP_rows: np.ndarray
+
+        # (rows, columns) of the independent blocks of the last LP, largest first
+        # (DECOMPOSITION_MODE or LP_BLOCKS_REPORT_MODE)
+        self.LP_block_sizes: list[tuple[int, int]] = list()
+
+        # Routes of the LP generated by the column generation (COLUMN_GENERATION_MODE),
+        # route indices of path_selection refer to these routes instead of the routes of the constellation
+        self.generated_routes: RouteStore | None = None
+        # LP solves and routes added by the column generation of the last compute
+        self.column_generation_stats: dict[str, int] = dict()
+
     def build(self) -> None:
         self.v.nl()
         self.v.log('Building throughput...')
@@ -49,17 +119,15 @@ class ThroughputLP(Performance):
 
         self.v.rlog('Processing traffic_metrics...')
         self._process_traffic_metrics()
-
-        self.v.rlog('Connecting all ground stations...')
-        for gid, _ in enumerate(self.leo_con.ground_stations.terminals):
-            self.leo_con.connect_ground_station(
-                self.leo_con.ground_stations.encode_name(gid)
-            )
         self.v.clr()
 
     def compute(self) -> None:
         self.v.log('Computing throughput...')
-        self._solve_linear_program()
+        if self.COLUMN_GENERATION_MODE:
+            self._solve_column_generation()
+        else:
+            self.generated_routes = None
+            self._solve_linear_program()
         self._extract_path_selection()
 
         # Analytics
@@ -74,78 +142,435 @@ class ThroughputLP(Performance):
         '''
         pass
 
-    def _solve_linear_program(self) -> None:
-        'Form a LP and solve for the throughput using gurobi package'
+    def _build_linear_program(self, link_flows: LinkFlowMatrix | None = None) -> tuple[np.ndarray, csr_matrix, np.ndarray]:
+        """Form the LP in sparse matrix form from the link-route incidence matrix (`link_flows`),
+        one variable per route (flow x K in the order of the route store), i.e.,
+        maximize `objective @ x` subject to `constraints @ x <= bounds` and `0 <= x <= 1`
 
-        # Gurobi LP/ILP formation
-        self.v.rlog('LP formation...')
-        flows = self.leo_con.routes.keys()
-        links = self.leo_con.link_load.keys()
+        - Route selection rows: the selected fractions of the K routes of a flow sum up to at most 1
+        - Link capacity rows: the demand-scaled routes through a link sum up to at most its capacity
 
-        self.model = gp.Model("ThroughputLP")
+        Parameters
+        ----------
+        link_flows: LinkFlowMatrix | None, optional
+            Incidence matrix of the routes of the LP (default routes of the constellation)
 
-        # Variables
-        flow_via_route = self.model.addVars(
-            flows, self.leo_con.k,
-            vtype=GRB.CONTINUOUS,
-            lb=0, ub=1,
-            name="R"
+        Returns
+        -------
+        tuple[np.ndarray, csr_matrix, np.ndarray]
+            Demand (Gbps) of the flow of each route as objective, constraint matrix
+            (route selection rows of the flows followed by link capacity rows of `link_flows.links`)
+            and upper bounds of the constraints
+        """
+
+        if link_flows is None:
+            link_flows = self.leo_con.link_flows
+        flows = link_flows.flows
+        links = link_flows.links
+
+        objective = np.repeat(
+            np.array([self.demand_metrics[flow] for flow in flows], dtype=np.float64),
+            np.diff(link_flows.column_offsets)
         )
 
-        # Objective function
-        obj_fun = gp.quicksum(
-            flow_via_route.sum(flow, '*') * self.demand_metrics[flow] for flow in flows
+        selection = csr_matrix(
+            (
+                np.ones(len(objective), dtype=np.float64),
+                np.arange(len(objective), dtype=np.int64),
+                link_flows.column_offsets
+            ),
+            shape=(len(flows), len(objective))
         )
-        self.model.setObjective(obj_fun, GRB.MAXIMIZE)
-
-        # Route selection constraints
-        # Selecting path(s) out of K path
-        self.model.addConstrs(
-            (flow_via_route.sum(flow, '*') <= 1 for flow in flows), name="select_path"
+        link_capacity = csr_matrix(
+            link_flows.matrix[links].multiply(objective[np.newaxis, :])
         )
 
-        # Link capacity constraints
-        # Flow through a link must be less than equal to the capacity of the link
-        for link in links:
-            self.model.addConstr(
-                (
-                    gp.quicksum(
-                        flow_via_route[flow, index] * self.demand_metrics[flow] for flow, index in self.leo_con.link_load[link]
-                    ) <= self.leo_con.link_capacity(link[0], link[1])
-                ),
-                name=f"link_cap_ub_{link[0]}_{link[1]}"
-            )
+        constraints = vstack([selection, link_capacity], format='csr')
+        bounds = np.concatenate((
+            np.ones(len(flows), dtype=np.float64),
+            self.leo_con.network_graph.edge_capacities[links].astype(np.float64)
+        ))
+        return objective, constraints, bounds
 
-        self.model.setParam("OutputFlag", False)
+    def _solve_linear_program(self, link_flows: LinkFlowMatrix | None = None, warm_start: bool | None = None) -> None:
+        '''Form a LP and solve for the throughput with the LP solver backend (LP_SOLVER)
 
-        self.v.rlog(f"Optimizing... ")
+        Parameters
+        ----------
+        link_flows: LinkFlowMatrix | None, optional
+            Incidence matrix of the routes of the LP (default routes of the constellation)
+        warm_start: bool | None, optional
+            Update the LP of the previous solve (default WARM_START_MODE), not with DECOMPOSITION_MODE
+        '''
+
+        if warm_start is None:
+            warm_start = self.WARM_START_MODE
+        warm_start = warm_start and not self.DECOMPOSITION_MODE
+
+        # LP formation in sparse matrix form
+        self.v.rlog('LP formation...')
         start_time = time.perf_counter()
-        self.model.optimize()
+        objective, constraints, bounds = self._build_linear_program(link_flows)
+        variable_names, constraint_names = self._LP_names(link_flows) if self.LP_NAMES_MODE else (None, None)
+        if warm_start:
+            variable_keys, constraint_keys = self._LP_keys(link_flows)
+        self._LP_rows = np.arange(constraints.shape[0], dtype=np.int64)
+        if self.PRESOLVE_MODE:
+            self._LP_rows, bounds = self._presolve_linear_program(objective, constraints, bounds)
+            constraints = constraints[self._LP_rows]
+            if constraint_names is not None:
+                constraint_names = [constraint_names[row] for row in self._LP_rows.tolist()]
+            if warm_start:
+                constraint_keys = [constraint_keys[row] for row in self._LP_rows.tolist()]
         end_time = time.perf_counter()
         self.v.clr()
+        self.v.log(f'LP formed in: {round((end_time-start_time)/60, 2)}m')
+        if self.PRESOLVE_MODE:
+            self.v.log(f'''Presolve eliminated rows:\t{self.presolve_stats['eliminated_rows']} ({
+                       self.presolve_stats['slack_rows']} slack, {self.presolve_stats['duplicate_rows']} duplicate)''')
 
-        self.throughput_Gbps = self.model.objVal
+        self.v.rlog(f"Optimizing ({self.LP_SOLVER})... ")
+        start_time = time.perf_counter()
+        solver = LP_SOLVERS[self.LP_SOLVER]
+        parameters = {'epsilon': self.APPROXIMATION_EPSILON} if issubclass(solver, GargKonemannLPSolver) else dict()
+        if self.DECOMPOSITION_MODE:
+            self.solver = DecomposedLPSolver(
+                solver, self.DECOMPOSITION_MAX_WORKERS, **parameters
+            )
+        else:
+            if not warm_start or type(self.solver) is not solver:
+                self.solver = solver()
+            for name, value in parameters.items():
+                setattr(self.solver, name, value)
+        if warm_start:
+            self.solver.update(
+                objective, constraints, bounds, variable_keys, constraint_keys, variable_names, constraint_names
+            )
+        else:
+            self.solver.solve(
+                objective, constraints, bounds, variable_names, constraint_names
+            )
+        end_time = time.perf_counter()
+        self.v.clr()
+
+        self.throughput_Gbps = self.solver.objective_value
+        self.throughput_upper_bound_Gbps = self.solver.objective_bound
         self.v.log(f'Optimized in: {round((end_time-start_time)/60, 2)}m')
         self.v.log(f'Throughput:\t{round(self.throughput_Gbps, 3)} Gbps')
+        if self.solver.APPROXIMATE:
+            self.v.log(
+                f'Throughput upper bound:\t{round(self.throughput_upper_bound_Gbps, 3)} Gbps'
+            )
 
-    def _extract_path_selection(self) -> None:
-        'Process the output of LP solver to extract selected routes'
+        self.LP_block_sizes = list()
+        if self.DECOMPOSITION_MODE:
+            self.LP_block_sizes = self.solver.block_sizes
+        elif self.LP_BLOCKS_REPORT_MODE:
+            self.LP_block_sizes = [(len(rows), len(columns)) for rows, columns in LP_blocks(constraints)]
+        if self.LP_block_sizes:
+            self.v.log(f'''LP blocks:\t{len(self.LP_block_sizes)} (largest {
+                       self.LP_block_sizes[0][0]} rows x {self.LP_block_sizes[0][1]} columns)''')
+
+    def _presolve_linear_program(
+        self, objective: np.ndarray, constraints: csr_matrix, bounds: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Eliminate the link capacity rows that do not change the feasible region of the LP (`_build_linear_program`)
+
+        - Slack links: at most the full demand of a flow crosses a link (route selection rows),
+          the link can not saturate when the demands of the flows through it sum up to at most its capacity
+        - Duplicate links: links with the same routes (e.g., consecutive ISLs of a route segment,
+          GSL of a satellite serving one ground station) have the same row, one row with the tightest capacity is kept
+
+        Parameters
+        ----------
+        objective: np.ndarray
+            Demand (Gbps) of the flow of each route
+        constraints: csr_matrix
+            Constraint matrix, route selection rows followed by link capacity rows
+        bounds: np.ndarray
+            Upper bounds of the constraints
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Kept rows of the constraints (route selection rows and kept link capacity rows in order)
+            and their upper bounds
+        """
+
+        flow_count = len(self.leo_con.route_store.flows)
+        selection = constraints[:flow_count]
+        link_rows = constraints[flow_count:]
+
+        # Flows through each link, counted once however many of its routes cross the link
+        link_flows = (link_rows != 0).astype(np.float64) @ selection.T
+        link_flows.data[:] = 1
+        flow_demands = selection.multiply(objective[np.newaxis, :]).max(axis=1).toarray().ravel()
+        slack = link_flows @ flow_demands <= bounds[flow_count:]
+
+        # Same routes, same demand coefficients
+        link_rows.sort_indices()
+        indptr, indices = link_rows.indptr, link_rows.indices
+        kept_links: dict[bytes, int] = dict()
+        link_bounds = bounds[flow_count:].copy()
+        for link in np.flatnonzero(~slack).tolist():
+            row = indices[indptr[link]:indptr[link+1]].tobytes()
+            kept_link = kept_links.setdefault(row, link)
+            if kept_link != link:
+                link_bounds[kept_link] = min(link_bounds[kept_link], link_bounds[link])
+
+        links = np.array(sorted(kept_links.values()), dtype=np.int64)
+        self.presolve_stats = {
+            'slack_rows': int(slack.sum()),
+            'duplicate_rows': int(len(slack) - slack.sum() - len(links)),
+            'eliminated_rows': int(len(slack) - len(links)),
+        }
+        return np.concatenate((
+            np.arange(flow_count, dtype=np.int64), links + flow_count
+        )), np.concatenate((bounds[:flow_count], link_bounds[links]))
+
+    def _solve_column_generation(self) -> None:
+        '''Solve the LP by column generation from the first (shortest) route of each flow (COLUMN_GENERATION_MODE)
+
+        - Restricted LP: the generated routes (`generated_routes`) of each flow
+        - Pricing: the shortest path of each flow over the links weighted by their duals (`_price_routes`)
+          is added when it improves the throughput
+        - Stops when no route improves the throughput (optimum over all the routes of the network graph),
+          no improving flow has room for routes (COLUMN_GENERATION_MAX_ROUTES) or at COLUMN_GENERATION_MAX_ITERATIONS
+        '''
+
+        if LP_SOLVERS[self.LP_SOLVER].APPROXIMATE:
+            raise ValueError(
+                f'Column generation needs the duals of an exact LP solver (gurobi or highs), not {self.LP_SOLVER}'
+            )
+
+        route_store = self.leo_con.route_store
+        routes = [route_store.node_paths(flow)[:1] for flow in route_store.flows]
+
+        self.column_generation_stats = {'iterations': 0, 'added_routes': 0}
+        for iteration in range(self.COLUMN_GENERATION_MAX_ITERATIONS):
+            self.generated_routes = RouteStore(self.leo_con.network_graph)
+            for flow, paths in zip(route_store.flows, routes):
+                self.generated_routes.add_node_paths(flow, paths)
+            link_flows = LinkFlowMatrix(
+                self.leo_con.network_graph, self.leo_con.satellite_count, self.generated_routes, None
+            )
+
+            # Each LP updates the LP of the previous iteration
+            self._solve_linear_program(
+                link_flows, warm_start=self.WARM_START_MODE or iteration > 0
+            )
+            self.column_generation_stats['iterations'] += 1
+
+            added_routes = 0
+            for flow_index, path in self._price_routes(link_flows):
+                if len(routes[flow_index]) < self.COLUMN_GENERATION_MAX_ROUTES:
+                    routes[flow_index].append(path)
+                    added_routes += 1
+            if not added_routes:
+                break
+            self.column_generation_stats['added_routes'] += added_routes
+            self.v.log(f'Column generation added routes:\t{added_routes}')
+
+        self.v.log(f'''Column generation:\t{self.column_generation_stats['iterations']} LPs, {
+                   len(self.generated_routes.path_offsets) - 1} routes''')
+
+    def _price_routes(self, link_flows: LinkFlowMatrix) -> list[tuple[int, np.ndarray]]:
+        '''Find the routes that improve the throughput of the last LP solve (column generation),
+        a route of a flow improves it when `demand * (1 - sum of the duals of its links)` exceeds
+        the dual of the route selection of the flow, the shortest path over the dual-weighted links
+        (ties broken by the length) of each flow is the most improving route
+
+        Parameters
+        ----------
+        link_flows: LinkFlowMatrix
+            Incidence matrix of the routes of the last LP
+
+        Returns
+        -------
+        list[tuple[int, np.ndarray]]
+            Index of the flow and the node IDs of its improving route
+        '''
+
+        network_graph = self.leo_con.network_graph
+        flows = link_flows.flows
+
+        # Duals of the rows eliminated by the presolve and of the links without routes are 0
+        duals = np.zeros(len(flows) + len(link_flows.links))
+        duals[self._LP_rows] = np.maximum(self.solver.duals, 0)
+        link_duals = np.zeros(network_graph.number_of_edges)
+        link_duals[link_flows.links] = duals[len(flows):]
+
+        # Length (meters) as a small cost of the links, shortest among the routes of the same dual cost
+        link_costs = link_duals + 1e-12 * network_graph.edge_weights
+        shortest_paths = ShortestPaths(
+            network_graph, self.leo_con.satellite_count, link_costs
+        )
+
+        def terminal_links(terminal: int) -> list[tuple[int, float]]:
+            start, end = network_graph.indptr[terminal], network_graph.indptr[terminal+1]
+            return list(zip(
+                network_graph.indices[start:end].tolist(), link_costs[network_graph.edge_ids[start:end]].tolist()
+            ))
+
+        # Flows of each source terminal
+        sources: dict[int, list[tuple[int, int]]] = dict()
+        for flow_index, flow in enumerate(flows):
+            source, destination = map(network_graph.node_id, flow.split('_'))
+            sources.setdefault(source, list()).append((flow_index, destination))
+
+        flow_indices: list[int] = list()
+        paths: list[list[int]] = list()
+        for source, destinations in sources.items():
+            for (flow_index, destination), path in zip(destinations, shortest_paths.paths_from_source(
+                terminal_links(source), [terminal_links(destination) for _, destination in destinations]
+            )):
+                if path is not None:
+                    flow_indices.append(flow_index)
+                    paths.append([source, *path, destination])
+        if not paths:
+            return []
+
+        # Dual cost of all the paths at once
+        hops = np.array([len(path) - 1 for path in paths], dtype=np.int64)
+        nodes = np.fromiter((node for path in paths for node in path), dtype=np.int64)
+        hop_starts = np.ones(len(nodes), dtype=bool)
+        hop_starts[np.cumsum(hops + 1) - 1] = False
+        hop_costs = link_duals[network_graph.edge_ids_between(
+            nodes[hop_starts], nodes[1:][hop_starts[:-1]]
+        )]
+        path_costs = np.add.reduceat(hop_costs, np.cumsum(hops) - hops)
+
+        demands = np.array([self.demand_metrics[flows[flow_index]] for flow_index in flow_indices])
+        reduced_costs = demands * (1 - path_costs) - duals[flow_indices]
+
+        route_store = link_flows.route_store
+        improving_routes: list[tuple[int, np.ndarray]] = list()
+        for position in np.flatnonzero(reduced_costs > 1e-6 * demands).tolist():
+            flow_index = flow_indices[position]
+            path = np.array(paths[position], dtype=np.int32)
+            if not any(np.array_equal(path, route) for route in route_store.node_paths(flows[flow_index])):
+                improving_routes.append((flow_index, path))
+        return improving_routes
+
+    def _LP_names(self, link_flows: LinkFlowMatrix | None = None) -> tuple[list[str], list[str]]:
+        """Names of the variables R[flow,k] and constraints select_path[flow], link_cap_ub_hop_hop of the LP (e.g., export_LP_model)
+
+        Parameters
+        ----------
+        link_flows: LinkFlowMatrix | None, optional
+            Incidence matrix of the routes of the LP (default routes of the constellation)
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            Variable names and constraint names in the order of `_build_linear_program`
+        """
+
+        if link_flows is None:
+            link_flows = self.leo_con.link_flows
+        flows = link_flows.flows
+        routes = np.diff(link_flows.column_offsets).tolist()
+
+        return [
+            f'R[{flow},{index}]' for flow, count in zip(flows, routes) for index in range(count)
+        ], [
+            f'select_path[{flow}]' for flow in flows
+        ] + [
+            'link_cap_ub_{}_{}'.format(*link_flows.link_name(edge_id)) for edge_id in link_flows.links.tolist()
+        ]
+
+    def _LP_keys(self, link_flows: LinkFlowMatrix | None = None) -> tuple[list[tuple[str, bytes | int]], list[str | tuple[int, int]]]:
+        """Keys of the variables and constraints of the LP to match them with the LP of the previous compute (warm start)
+
+        Parameters
+        ----------
+        link_flows: LinkFlowMatrix | None, optional
+            Incidence matrix of the routes of the LP (default routes of the constellation)
 
-        self.path_selection = {}
+        Returns
+        -------
+        tuple[list[tuple[str, bytes | int]], list[str | tuple[int, int]]]
+            (flow, node IDs of the route) of each variable, (flow, route index) when the flow has no route,
+            flow of each route selection constraint and node IDs of each link capacity constraint
+        """
+
+        if link_flows is None:
+            link_flows = self.leo_con.link_flows
+        route_store = link_flows.route_store
+        nodes, path_offsets, flow_offsets = route_store.nodes, route_store.path_offsets.tolist(), route_store.flow_offsets.tolist()
+        routes = np.diff(link_flows.column_offsets).tolist()
+
+        variable_keys: list[tuple[str, bytes | int]] = list()
+        for flow_index, flow in enumerate(route_store.flows):
+            paths = range(flow_offsets[flow_index], flow_offsets[flow_index+1])
+            for index in range(routes[flow_index]):
+                variable_keys.append((
+                    flow, nodes[path_offsets[paths[index]]:path_offsets[paths[index]+1]].tobytes()
+                ) if index < len(paths) else (flow, index))
+
+        link_nodes = np.sort(
+            self.leo_con.network_graph.edge_nodes[link_flows.links], axis=1
+        )
+        return variable_keys, list(route_store.flows) + list(map(tuple, link_nodes.tolist()))
+
+    def warm_start_from(self, throughput: 'ThroughputLP') -> None:
+        """Continues from the LP of another throughput (e.g., previous design of a black-box optimizer),
+        the next compute updates its LP instead of forming a new one (WARM_START_MODE)
+
+        The solver is handed over, not shared: it is cleared on the other throughput, whose solution
+        (i.e., solver x, duals, objective value and exported model) is overwritten by the next compute
+
+        Parameters
+        ----------
+        throughput: ThroughputLP
+            Throughput computed before
+        """
+        self.solver, throughput.solver = throughput.solver, None
 
-        # Extract seleted paths from gurobi model
-        for v in self.model.getVars():
-            if v.x:
-                key = v.varName[2:-1].split(',')
-                flow = key[0]
-                path = int(key[1])
+    def _extract_path_selection(self) -> None:
+        'Process the output of LP solver to extract selected routes'
 
-                if flow not in self.path_selection.keys():
-                    self.path_selection[flow] = dict()
-                self.path_selection[flow][path] = v.x
+        # All the routes of the LP solution at once, (flow, route index) from the column order
+        # (flows x K, or the generated routes of each flow)
+        flow_via_route = self.solver.x
+        if self.generated_routes is None:
+            column_offsets = np.arange(0, len(flow_via_route) + 1, self.leo_con.k, dtype=np.int64)
+        else:
+            column_offsets = self.generated_routes.flow_offsets
+        routes = np.diff(column_offsets)
+
+        self.path_selection_matrix = csr_matrix(
+            (
+                flow_via_route,
+                np.arange(len(flow_via_route)) - np.repeat(column_offsets[:-1], routes),
+                column_offsets
+            ),
+            shape=(len(routes), max(self.leo_con.k, int(routes.max(initial=0)))),
+            copy=True
+        )
+        self.path_selection_matrix.eliminate_zeros()
+        self._path_selection = None
+
+    @property
+    def path_selection(self) -> dict[str, dict[int, float]]:
+        "Fraction of each flow via the selected routes as dict, {flow: {route index: fraction}}"
+
+        if self._path_selection is None:
+            flows = self.leo_con.route_store.flows
+            indptr = self.path_selection_matrix.indptr.tolist()
+            indices = self.path_selection_matrix.indices.tolist()
+            data = self.path_selection_matrix.data.tolist()
+            self._path_selection = {
+                flows[flow_index]: dict(zip(indices[start:end], data[start:end]))
+                for flow_index, (start, end) in enumerate(zip(indptr[:-1], indptr[1:]))
+                if start != end
+            }
+        return self._path_selection
 
     def export_path_selection(self, prefix_path: str = '.') -> str:
-        '''Writes path selection into a JSON file
+        '''Writes path selection into a JSON file, the route indices refer to the routes of the constellation
+        (`export_routes`) or, in COLUMN_GENERATION_MODE, to the generated routes written alongside
+        (`export_generated_routes`)
 
         Returns
         --------
@@ -161,10 +586,14 @@ class ThroughputLP(Performance):
         with open(filename, 'w') as json_file:
             json_file.write(json.dumps(self.path_selection))
 
+        if self.generated_routes is not None:
+            self.export_generated_routes(prefix_path)
+
         return filename
 
-    def export_LP_model(self, prefix_path: str = '.') -> str:
-        '''Writes LP into a file
+    def export_generated_routes(self, prefix_path: str = '.') -> str:
+        '''Writes the routes generated by the column generation (COLUMN_GENERATION_MODE) into a JSON file,
+        same format as the routes of the constellation (`export_routes`)
 
         Returns
         --------
@@ -172,23 +601,38 @@ class ThroughputLP(Performance):
             Path of the written file
         '''
 
+        assert self.generated_routes is not None, 'No generated routes, compute in COLUMN_GENERATION_MODE'
+
         # Get the directory of time delta
         dir = self._create_export_dir(prefix_path)
 
         # Write inside time delta
-        filename = f'{dir}/{self.__class__.__name__}.lp'
-        self.model.write(filename)
+        filename = f'{dir}/generated_routes.json'
+        with open(filename, 'w') as json_file:
+            json_file.write(json.dumps(self.generated_routes.to_dict()))
 
         return filename
 
+    def export_LP_model(self, prefix_path: str = '.') -> str:
+        '''Writes LP into a file (LP format of Gurobi, sparse matrices of HiGHS)
+
+        Returns
+        --------
+        str
+            Path of the written file
+        '''
+
+        # Get the directory of time delta
+        dir = self._create_export_dir(prefix_path)
+
+        # Write inside time delta
+        return self.solver.export(f'{dir}/{self.__class__.__name__}')
+
     def _compute_total_accommodated_flow(self) -> None:
         'Calculate % of flow accommodated by the constellation'
 
         total_flow = len(self.demand_metrics.keys())
-        accommodated_flow = 0.0
-
-        for _, rindex_flow_fraction in self.path_selection.items():
-            accommodated_flow += sum(rindex_flow_fraction.values())
+        accommodated_flow = float(self.path_selection_matrix.sum())
 
         self.total_accommodated_flow = (accommodated_flow/total_flow)*100
 
@@ -198,26 +642,46 @@ class ThroughputLP(Performance):
     def _compute_total_route_selection(self) -> None:
         'Calculate % of routes end to end routes selected of each flow class'
 
-        self.NS_selt = self._count_route_selection(
-            self._rcategories.route_north_south)/(len(self._rcategories.route_north_south)*self.leo_con.k)*100
+        self.NS_selt = self._route_selection_percentage(self._rcategories.route_north_south)
         self.v.log(f'NS path selection:\t{round(self.NS_selt, 3)} %')
 
-        self.EW_selt = self._count_route_selection(
-            self._rcategories.route_east_west)/(len(self._rcategories.route_east_west)*self.leo_con.k)*100
+        self.EW_selt = self._route_selection_percentage(self._rcategories.route_east_west)
         self.v.log(f'EW path selection:\t{round(self.EW_selt, 3)} %')
 
-        self.NESW_selt = self._count_route_selection(self._rcategories.route_northeast_southwest)/(
-            len(self._rcategories.route_northeast_southwest)*self.leo_con.k)*100
+        self.NESW_selt = self._route_selection_percentage(self._rcategories.route_northeast_southwest)
         self.v.log(f'NESW path selection:\t{round(self.NESW_selt, 3)} %')
 
-        self.HG_selt = self._count_route_selection(
-            self._rcategories.route_high_geodesic)/(len(self._rcategories.route_high_geodesic)*self.leo_con.k)*100
+        self.HG_selt = self._route_selection_percentage(self._rcategories.route_high_geodesic)
         self.v.log(f'HG path selection:\t{round(self.HG_selt, 3)} %')
 
-        self.LG_selt = self._count_route_selection(
-            self._rcategories.route_low_geodesic)/(len(self._rcategories.route_low_geodesic)*self.leo_con.k)*100
+        self.LG_selt = self._route_selection_percentage(self._rcategories.route_low_geodesic)
         self.v.log(f'LG path selection:\t{round(self.LG_selt, 3)} %')
 
+    def _route_selection_percentage(self, flows: set[str]) -> float:
+        '''Percentage of the routes of a given flow category selected by the LP, out of the K routes of each flow
+        or the routes of each flow generated by the column generation (COLUMN_GENERATION_MODE).
+        Works as helper method of _compute_total_route_selection
+
+        Parameters
+        -------
+        flows: set[str]
+            Set of flows
+
+        Returns
+        ------
+        float
+            Selected routes in %
+        '''
+
+        if self.generated_routes is None:
+            routes = len(flows) * self.leo_con.k
+        else:
+            route_store = self.generated_routes
+            flow_indices = [route_store.index(flow) for flow in flows if flow in route_store]
+            routes = int(np.diff(route_store.flow_offsets)[flow_indices].sum())
+
+        return self._count_route_selection(flows) / routes * 100 if routes else 0.0
+
     def _count_route_selection(self, flows: set[str]) -> int:
         '''Counts the number of path selected from a given flow category. Works as helper method of _compute_total_route_selection
 
@@ -232,10 +696,6 @@ class ThroughputLP(Performance):
             Selected path count
         '''
 
-        counter = 0
-        for flow in flows:
-            route_selection = self.path_selection.get(flow)
-            if route_selection:
-                counter += len(route_selection.keys())
-
-        return counter
+        route_store = self.leo_con.route_store
+        flow_indices = [route_store.index(flow) for flow in flows if flow in route_store]
+        return int(np.diff(self.path_selection_matrix.indptr)[flow_indices].sum())
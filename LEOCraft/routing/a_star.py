@@ -0,0 +1,245 @@
+import heapq
+
+import numpy as np
+
+from LEOCraft.routing.k_shortest_paths import _CandidatePaths
+from LEOCraft.routing.network_graph import NetworkGraph
+
+
+class _AdjacencyWeights:
+    "Lookup of the edge weights (meters) of the adjacency of a flow keyed by (node, node)"
+
+    def __init__(self, adjacency: list[dict[int, float]]) -> None:
+        self._adjacency = adjacency
+
+    def __getitem__(self, edge: tuple[int, int]) -> float:
+        return self._adjacency[edge[0]][edge[1]]
+
+
+class AStarKShortestPaths:
+    """
+    Yen's K shortest simple paths with A* spur searches on the array-backed (CSR) satellite network graph
+
+    - Heuristic of a satellite is the shortest straight-line (ECEF) distance to a satellite linked to the destination
+      terminal plus the length of that link, ISLs are straight lines between the satellites so the heuristic is
+      admissible and consistent for any terminal link (e.g., mean FSL length of a flight cluster), and never lower
+      than the straight-line distance to a ground station (scaled down by 1e-9 for the rounding of the link lengths)
+    - A spur search stops at the destination or once the lowest estimate exceeds the length bound of Yen's
+      K shortest paths, the number of nodes expanded by all the searches is counted in `nodes_expanded`
+    - Without the heuristic (`heuristic=False`) the searches are plain Dijkstra for comparison
+    - Terminals are not transit nodes, the source and destination terminals of a flow are the node IDs
+      `satellite_count` and `satellite_count+1` as in `KShortestPaths`
+
+    Usage: build once per network graph (i.e., time step) then query the flows
+    """
+
+    def __init__(self, network_graph: NetworkGraph, satellite_count: int, satellite_positions_m: np.ndarray, heuristic: bool = True) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Built network graph with satellites at the node IDs from 0 to satellite_count-1
+        satellite_count: int
+            Number of satellites of the constellation
+        satellite_positions_m: np.ndarray
+            (satellite_count, 3) array of cartesian coordinates (x, y, z) in meters of the satellites in the ID order
+        heuristic: bool, optional
+            Use the straight-line distance heuristic (A*), otherwise Dijkstra
+        """
+
+        self.network_graph = network_graph
+        self.satellite_count = satellite_count
+        self.satellite_positions_m = satellite_positions_m
+        self.heuristic = heuristic
+
+        # Adjacency of the satellites (ISLs only)
+        graph = network_graph.to_csr_matrix(satellite_count)
+        self._adjacency: list[dict[int, float]] = [
+            dict(zip(
+                graph.indices[graph.indptr[sid]:graph.indptr[sid+1]].tolist(),
+                graph.data[graph.indptr[sid]:graph.indptr[sid+1]].tolist()
+            ))
+            for sid in range(satellite_count)
+        ]
+
+        self.source_id = satellite_count
+        self.destination_id = satellite_count + 1
+
+        # Nodes expanded by the searches
+        self.nodes_expanded = 0
+
+    def _estimates_m(self, destination_links: dict[int, float]) -> list[float]:
+        "Lower bound of the distance (meters) from each satellite to the destination terminal"
+        if not self.heuristic or not destination_links:
+            return [0.0]*self.satellite_count
+
+        sids = list(destination_links)
+        return (np.min(
+            np.linalg.norm(
+                self.satellite_positions_m[:, np.newaxis] - self.satellite_positions_m[np.newaxis, sids],
+                axis=2
+            ) + np.array([destination_links[sid] for sid in sids]),
+            axis=1
+        ) * (1 - 1e-9)).tolist()
+
+    def _search(
+        self,
+        adjacency: list[dict[int, float]],
+        destination_links: dict[int, float],
+        estimates_m: list[float],
+        spur_node: int,
+        ignore_nodes: set[int],
+        ignore_edges: set[tuple[int, int]],
+        limit: float
+    ) -> tuple[float, list[int]] | None:
+        """A* search from the spur node to the destination terminal without the ignored nodes and edges
+
+        Returns
+        -------
+        tuple[float, list[int]] | None
+            Length in meters and path of node IDs, None when there is no path within the limit
+        """
+
+        distances = {spur_node: 0.0}
+        predecessors: dict[int, int] = dict()
+        closed: set[int] = set()
+        frontier = [(0.0, 0.0, spur_node)]
+
+        while frontier:
+            estimate, distance, node = heapq.heappop(frontier)
+            if node in closed:
+                continue
+            if estimate > limit:
+                return None
+
+            if node == self.destination_id:
+                path = [node]
+                while node != spur_node:
+                    node = predecessors[node]
+                    path.append(node)
+                path.reverse()
+                return distance, path
+
+            closed.add(node)
+            self.nodes_expanded += 1
+
+            neighbors = adjacency[node].items()
+            if node in destination_links:
+                neighbors = [*neighbors, (self.destination_id, destination_links[node])]
+
+            for neighbor, weight in neighbors:
+                if neighbor in closed or neighbor in ignore_nodes or (node, neighbor) in ignore_edges or (neighbor, node) in ignore_edges:
+                    continue
+                neighbor_distance = distance + weight
+                if neighbor_distance < distances.get(neighbor, np.inf):
+                    distances[neighbor] = neighbor_distance
+                    predecessors[neighbor] = node
+                    heapq.heappush(frontier, (
+                        neighbor_distance + (
+                            estimates_m[neighbor] if neighbor < self.satellite_count else 0.0
+                        ),
+                        neighbor_distance,
+                        neighbor
+                    ))
+
+        return None
+
+    def paths(
+        self,
+        source_links: list[tuple[int, float]],
+        destination_links: list[tuple[int, float]],
+        k: int
+    ) -> list[list[int]]:
+        """Computes K shortest simple paths from the source to the destination terminal
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destination_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the destination terminal
+        k: int
+            Number of shortest paths
+
+        Returns
+        -------
+        list[list[int]]
+            Up to K paths of node IDs (source ID `satellite_count`, destination ID `satellite_count+1`)
+            in the order of length
+        """
+
+        adjacency = self._adjacency + [dict(source_links), dict()]
+        weights = _AdjacencyWeights(adjacency)
+        destination_links = dict(destination_links)
+        estimates_m = self._estimates_m(destination_links)
+
+        state = _CandidatePaths(k)
+        spur = self._search(
+            adjacency, destination_links, estimates_m, self.source_id, set(), set(), np.inf
+        )
+        if spur is not None:
+            state.push(*spur)
+
+        while (prev_path := state.pop()) is not None and not state.done:
+            ignore_nodes = set()
+            for root, root_length, ignore_edges in state.roots(prev_path, weights):
+                if ignore_edges is not None:
+                    spur = self._search(
+                        adjacency, destination_links, estimates_m, root[-1], ignore_nodes, ignore_edges,
+                        state.length_bound() - root_length
+                    )
+                    if spur is not None:
+                        length, spur = spur
+                        state.push(root_length + length, root[:-1] + spur)
+                ignore_nodes.add(root[-1])
+
+        return state.paths_found
+
+    def k_shortest_paths(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destination: str,
+        destination_links: list[tuple[str, float]],
+        k: int
+    ) -> tuple[bool, str, list[list[str]]]:
+        """Find K shortest path between two terminals,
+        drop-in for `LEOCraft.utilities.k_shortest_paths` with the terminal links instead of a graph
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destination: str
+            Destination terminal name
+        destination_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the destination terminal
+        k: int
+            Number of sortest routes
+
+        Returns
+        -------
+        tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path
+        """
+
+        node_id = self.network_graph.node_id
+        paths = self.paths(
+            [(node_id(sat_name), distance_m) for sat_name, distance_m in source_links],
+            [(node_id(sat_name), distance_m) for sat_name, distance_m in destination_links],
+            k
+        )
+
+        flow = f'{source}_{destination}'
+        if not paths:
+            print(f'Exeption[{flow}]: No path between {source} and {destination}.')
+            return False, flow, []
+
+        node_names = self.network_graph.node_names
+        names = {self.source_id: source, self.destination_id: destination}
+        return True, flow, [
+            [names[node] if node in names else node_names[node] for node in path]
+            for path in paths
+        ]
@@ -0,0 +1,294 @@
+import numpy as np
+
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
+
+
+class PlusGridRouting:
+    """
+    Closed-form K shortest routes of a single +Grid shell (`PlusGridShell`) without graph search
+
+    - Satellite ID `orbit * sat_per_orbit + n_sat` is at the grid coordinates (orbit, n_sat) of a torus,
+      with ISLs to the next satellite in the orbit and to the same satellite of the next orbit
+    - Candidate paths between an entry and an exit satellite ride the entry orbit up to a crossing row,
+      cross the orbits along that row, then ride the exit orbit (each part in either direction),
+      i.e., the staircase paths with one crossing and the ones detouring over a shorter row (e.g., towards a pole)
+    - Candidate lengths are looked up from prefix sums of the ISL lengths (constant time per candidate),
+      vectorized over the pairs of terminal links, crossing rows and directions, the K shortest candidates are the routes
+    - Candidates are a subset of the simple paths, so routes can be longer than the ones of a graph search,
+      `validate` cross-checks the routes against a generic engine
+
+    Usage: build once per network graph (i.e., time step) then query the flows
+    """
+
+    def __init__(self, network_graph: NetworkGraph, shell: PlusGridShell) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Built network graph with the satellites and ISLs of the shell
+        shell: PlusGridShell
+            The only shell of the constellation
+
+        Raises
+        ------
+        ValueError
+            When the shell is not a +Grid torus of at least 3 orbits and 3 satellites per orbit
+        """
+
+        if not isinstance(shell, PlusGridShell) or shell.orbits < 3 or shell.sat_per_orbit < 3:
+            raise ValueError(
+                'Grid routing requires a +Grid shell of at least 3 orbits and 3 satellites per orbit'
+            )
+
+        self.network_graph = network_graph
+        self.orbits = shell.orbits
+        self.sat_per_orbit = shell.sat_per_orbit
+        self.offset = network_graph.node_id(shell.encode_sat_name(0))
+
+        orbit, n_sat = np.meshgrid(
+            np.arange(self.orbits), np.arange(self.sat_per_orbit), indexing='ij'
+        )
+        sids = self._sid(orbit, n_sat)
+
+        # ISL lengths to the next satellite in the orbit and to the next orbit, (orbits, sat_per_orbit)
+        in_orbit_m = self._isl_lengths_m(
+            sids, self._sid(orbit, (n_sat + 1) % self.sat_per_orbit)
+        )
+        cross_orbit_m = self._isl_lengths_m(
+            sids, self._sid((orbit + 1) % self.orbits, n_sat)
+        )
+
+        # Prefix sums over two laps, i.e., length of d hops from x is prefix[x+d] - prefix[x]
+        self._in_orbit_prefix = np.zeros((self.orbits, 2*self.sat_per_orbit + 1))
+        np.cumsum(np.tile(in_orbit_m, 2), axis=1, out=self._in_orbit_prefix[:, 1:])
+        self._cross_orbit_prefix = np.zeros((self.sat_per_orbit, 2*self.orbits + 1))
+        np.cumsum(np.tile(cross_orbit_m.T, 2), axis=1, out=self._cross_orbit_prefix[:, 1:])
+
+    def _sid(self, orbit: np.ndarray, n_sat: np.ndarray) -> np.ndarray:
+        "Node ID of the satellite at the grid coordinates"
+        return self.offset + orbit * self.sat_per_orbit + n_sat
+
+    def _isl_lengths_m(self, sids_a: np.ndarray, sids_b: np.ndarray) -> np.ndarray:
+        "Lengths (meters) of the ISLs between the satellites"
+        return self.network_graph.edge_weights[[
+            self.network_graph.edge_id(sid_a, sid_b)
+            for sid_a, sid_b in zip(sids_a.ravel().tolist(), sids_b.ravel().tolist())
+        ]].reshape(sids_a.shape)
+
+    def _in_orbit_m(self, orbit: np.ndarray, n_sat: np.ndarray, hops: np.ndarray) -> np.ndarray:
+        "Length of the hops up the orbit from the satellite"
+        return self._in_orbit_prefix[orbit, n_sat + hops] - self._in_orbit_prefix[orbit, n_sat]
+
+    def _cross_orbit_m(self, n_sat: np.ndarray, orbit: np.ndarray, hops: np.ndarray) -> np.ndarray:
+        "Length of the hops to the next orbits along the row of the satellite"
+        return self._cross_orbit_prefix[n_sat, orbit + hops] - self._cross_orbit_prefix[n_sat, orbit]
+
+    def paths(
+        self,
+        source_links: list[tuple[int, float]],
+        destination_links: list[tuple[int, float]],
+        k: int
+    ) -> list[list[int]]:
+        """Computes the K shortest candidate paths from the source to the destination terminal
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destination_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the destination terminal
+        k: int
+            Number of shortest paths
+
+        Returns
+        -------
+        list[list[int]]
+            Up to K paths of satellite node IDs (without the terminals) in the order of length
+        """
+
+        if not source_links or not destination_links:
+            return []
+
+        # All the pairs of entry and exit satellites
+        entry_sids, exit_sids = np.meshgrid(
+            np.array([sid for sid, _ in source_links]) - self.offset,
+            np.array([sid for sid, _ in destination_links]) - self.offset,
+            indexing='ij'
+        )
+        links_m = np.add.outer(
+            np.array([distance_m for _, distance_m in source_links]),
+            np.array([distance_m for _, distance_m in destination_links])
+        ).ravel()
+        orbit_1, n_sat_1 = np.divmod(entry_sids.ravel(), self.sat_per_orbit)
+        orbit_2, n_sat_2 = np.divmod(exit_sids.ravel(), self.sat_per_orbit)
+        same_orbit = orbit_1 == orbit_2
+
+        # Entry and exit in the same orbit: up or down the orbit, (pairs, direction)
+        hops_up = (n_sat_2 - n_sat_1) % self.sat_per_orbit
+        direct_m = np.stack([
+            self._in_orbit_m(orbit_1, n_sat_1, hops_up),
+            np.where(
+                hops_up > 0,
+                self._in_orbit_m(orbit_1, n_sat_2, (n_sat_1 - n_sat_2) % self.sat_per_orbit),
+                np.inf
+            )
+        ], axis=1) + links_m[:, np.newaxis]
+        direct_m[~same_orbit] = np.inf
+
+        # Other orbits: entry orbit to the crossing row, across the orbits, exit orbit from the crossing row,
+        # (pairs, row, entry orbit direction, crossing direction, exit orbit direction)
+        row = np.arange(self.sat_per_orbit)[np.newaxis, :]
+        o_1, n_1, o_2, n_2 = (
+            orbit_1[:, np.newaxis], n_sat_1[:, np.newaxis], orbit_2[:, np.newaxis], n_sat_2[:, np.newaxis]
+        )
+
+        entry_hops_up = (row - n_1) % self.sat_per_orbit
+        entry_m = np.stack([
+            self._in_orbit_m(o_1, n_1, entry_hops_up),
+            np.where(entry_hops_up > 0, self._in_orbit_m(o_1, row, (n_1 - row) % self.sat_per_orbit), np.inf)
+        ], axis=-1)
+        crossing_hops = (o_2 - o_1) % self.orbits
+        crossing_m = np.stack([
+            self._cross_orbit_m(row, o_1, crossing_hops),
+            self._cross_orbit_m(row, o_2, self.orbits - crossing_hops)
+        ], axis=-1)
+        exit_hops_up = (n_2 - row) % self.sat_per_orbit
+        exit_m = np.stack([
+            self._in_orbit_m(o_2, row, exit_hops_up),
+            np.where(exit_hops_up > 0, self._in_orbit_m(o_2, n_2, (row - n_2) % self.sat_per_orbit), np.inf)
+        ], axis=-1)
+
+        staircase_m = (
+            entry_m[:, :, :, np.newaxis, np.newaxis] +
+            crossing_m[:, :, np.newaxis, :, np.newaxis] +
+            exit_m[:, :, np.newaxis, np.newaxis, :] +
+            links_m[:, np.newaxis, np.newaxis, np.newaxis, np.newaxis]
+        )
+        staircase_m[same_orbit] = np.inf
+
+        # K shortest candidates (ties in the order of the candidates)
+        lengths_m = np.concatenate([direct_m.ravel(), staircase_m.ravel()])
+        if k < len(lengths_m):
+            shortest = np.flatnonzero(
+                lengths_m <= np.partition(lengths_m, k-1)[k-1]
+            )
+        else:
+            shortest = np.arange(len(lengths_m))
+        shortest = shortest[np.argsort(lengths_m[shortest], kind='stable')][:k]
+        shortest = shortest[np.isfinite(lengths_m[shortest])]
+
+        paths = list()
+        for candidate in shortest.tolist():
+            if candidate < direct_m.size:
+                pair_id, direction = divmod(candidate, 2)
+                path = self._ride(
+                    orbit_1[pair_id], n_sat_1[pair_id], n_sat_2[pair_id], direction
+                )
+            else:
+                pair_id, crossing_row, entry_direction, crossing_direction, exit_direction = np.unravel_index(
+                    candidate - direct_m.size, staircase_m.shape
+                )
+                path = self._ride(
+                    orbit_1[pair_id], n_sat_1[pair_id], crossing_row, entry_direction
+                )
+                path += self._cross(
+                    crossing_row, orbit_1[pair_id], orbit_2[pair_id], crossing_direction
+                )[1:]
+                path += self._ride(
+                    orbit_2[pair_id], crossing_row, n_sat_2[pair_id], exit_direction
+                )[1:]
+            paths.append(path)
+        return paths
+
+    def _ride(self, orbit: int, n_sat_from: int, n_sat_to: int, direction: int) -> list[int]:
+        "Satellites along the orbit, up (direction 0) or down (direction 1)"
+        step = 1 if direction == 0 else -1
+        hops = (step * (n_sat_to - n_sat_from)) % self.sat_per_orbit
+        return [
+            int(self._sid(orbit, (n_sat_from + step*hop) % self.sat_per_orbit)) for hop in range(hops+1)
+        ]
+
+    def _cross(self, n_sat: int, orbit_from: int, orbit_to: int, direction: int) -> list[int]:
+        "Satellites along the row across the orbits, to the next (direction 0) or previous (direction 1) orbits"
+        step = 1 if direction == 0 else -1
+        hops = (step * (orbit_to - orbit_from)) % self.orbits
+        return [
+            int(self._sid((orbit_from + step*hop) % self.orbits, n_sat)) for hop in range(hops+1)
+        ]
+
+    def k_shortest_paths(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destination: str,
+        destination_links: list[tuple[str, float]],
+        k: int
+    ) -> tuple[bool, str, list[list[str]]]:
+        """Find K shortest candidate path between two terminals,
+        same output as `LEOCraft.utilities.k_shortest_paths` with the terminal links instead of a graph
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destination: str
+            Destination terminal name
+        destination_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the destination terminal
+        k: int
+            Number of sortest routes
+
+        Returns
+        -------
+        tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path
+        """
+
+        node_id = self.network_graph.node_id
+        paths = self.paths(
+            [(node_id(sat_name), distance_m) for sat_name, distance_m in source_links],
+            [(node_id(sat_name), distance_m) for sat_name, distance_m in destination_links],
+            k
+        )
+
+        flow = f'{source}_{destination}'
+        if not paths:
+            print(f'Exeption[{flow}]: No path between {source} and {destination}.')
+            return False, flow, []
+
+        node_names = self.network_graph.node_names
+        return True, flow, [
+            [source, *(node_names[node] for node in path), destination] for path in paths
+        ]
+
+    def validate(
+        self,
+        routes: tuple[bool, str, list[list[str]]],
+        expected_routes: tuple[bool, str, list[list[str]]]
+    ) -> tuple[float, float, int]:
+        """Cross-checks the routes of a flow against the routes of a generic engine
+
+        Parameters
+        ----------
+        routes: tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path of this engine
+        expected_routes: tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path of a generic engine (e.g., `KShortestPaths`)
+
+        Returns
+        -------
+        tuple[float, float, int]
+            Length (meters) of the shortest route of this and of the generic engine, number of common routes
+        """
+
+        path_length_m = self.network_graph.path_length_m
+        _, _, k_path = routes
+        _, _, expected_k_path = expected_routes
+        return (
+            path_length_m(k_path[0]) if k_path else np.inf,
+            path_length_m(expected_k_path[0]) if expected_k_path else np.inf,
+            len(set(map(tuple, k_path)) & set(map(tuple, expected_k_path)))
+        )
@@ -0,0 +1,315 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.routing.route_store import RouteStore
+
+
+class IncrementalRouting:
+    """
+    Incremental maintenance of the K shortest routes over time steps of the same constellation
+
+    - Keeps the routes of the previous time step with the satellites and ISLs (edge IDs) along each route
+    - In the next step the routes are re-evaluated with the new ISL and terminal link lengths, the routes of a flow
+      are kept (re-sorted by the new lengths) only when all of them are still valid (no terminal link lost)
+      and no other path can have overtaken the K-th route:
+        - For a factor `f` up to the lowest ratio of the new to the previous length of an ISL, the new length of a
+          path is `f * previous length + sum(new - f * previous)` over its links, where the previous length of any
+          other path over links of both steps was not shorter than the previous K-th route nor the previous shortest
+          path over the same pair of terminal links, and the sum is not lower than the shortest path over the
+          ISLs weighted by `new - f * previous` (one multi-source Dijkstra per factor and step)
+        - A path over a new terminal link is not shorter than the new link plus the straight-line (ECEF)
+          distance to a satellite linked to the other terminal and its link
+    - ISLs never break between the steps (ISL range violation is an error while building the network graph),
+      ISLs are matched by the edge IDs, i.e., the satellites and ISLs are added in the same order in each step
+    - Other flows (routes broken or possibly overtaken, new flows, fewer than K routes) are recomputed
+
+    Usage: `reusable_routes` of the network graph of a time step before routing, then `record` its routes
+    """
+
+    # Factors of the lowest ISL length ratio (`scale`) of the bounds, the bound of a flow is the highest one
+    BOUND_FACTORS: tuple[float, ...] = (1.0, 0.99, 0.9, 0.5)
+
+    def __init__(self) -> None:
+        self.k = 0
+        self.satellite_count = 0
+
+        # ISL lengths (meters) in the edge ID order
+        self._isl_lengths_m = np.empty(0, dtype=np.float64)
+        # Terminal links, terminal name -> {satellite node ID: distance in meters}
+        self._terminal_links: dict[str, dict[int, float]] = dict()
+
+        # Routes of each flow and their slice of the route arrays
+        self._route_store: RouteStore | None = None
+        self._flows: list[tuple[str, str, str, int, int]] = list()
+
+        # Route arrays: first and last satellite, ISL edge IDs (CSR with offsets) and length in meters
+        self._first_satellites = np.empty(0, dtype=np.int64)
+        self._last_satellites = np.empty(0, dtype=np.int64)
+        self._edge_offsets = np.zeros(1, dtype=np.int64)
+        self._edge_ids = np.empty(0, dtype=np.int64)
+        self._lengths_m = np.empty(0, dtype=np.float64)
+
+    @staticmethod
+    def _isl_mask(network_graph: NetworkGraph, satellite_count: int) -> np.ndarray:
+        "Edges between two satellites"
+        return (network_graph.edge_nodes < satellite_count).all(axis=1)
+
+    @staticmethod
+    def _terminal_links_of(network_graph: NetworkGraph, satellite_count: int) -> dict[str, dict[int, float]]:
+        "Links of each terminal node, terminal name -> {satellite node ID: distance in meters}"
+        return {
+            network_graph.node_names[node]: dict(zip(
+                network_graph.neighbors(node)[0].tolist(),
+                network_graph.neighbors(node)[1].tolist()
+            ))
+            for node in range(satellite_count, network_graph.number_of_nodes)
+        }
+
+    def record(self, network_graph: NetworkGraph, satellite_count: int, route_store: RouteStore, k: int) -> None:
+        """Keeps the routes of a time step
+
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Network graph of the time step with satellites at the node IDs from 0 to satellite_count-1
+            followed by the terminals and their links
+        satellite_count: int
+            Number of satellites of the constellation
+        route_store: RouteStore
+            K routes of each flow as node IDs (flows with fewer than K routes are not kept)
+        k: int
+            Number of shortest routes
+        """
+
+        isl_mask = self._isl_mask(network_graph, satellite_count)
+        self.k = k
+        self.satellite_count = satellite_count
+        self._isl_lengths_m = network_graph.edge_weights[isl_mask].copy()
+        self._terminal_links = self._terminal_links_of(
+            network_graph, satellite_count
+        )
+        self._route_store = route_store
+
+        # Paths of the flows with K routes
+        flow_offsets = route_store.flow_offsets
+        kept = np.flatnonzero(np.diff(flow_offsets) == k)
+        paths = (flow_offsets[kept][:, np.newaxis] + np.arange(k)).ravel()
+        path_starts = route_store.path_offsets[paths]
+        path_ends = route_store.path_offsets[paths + 1]
+        route_nodes = route_store.nodes.astype(np.int64)
+
+        node_names = network_graph.node_names
+        self._flows = [
+            (
+                route_store.flows[flow_index],
+                node_names[route_nodes[path_starts[index * k]]],
+                node_names[route_nodes[path_ends[index * k] - 1]],
+                index * k,
+                (index + 1) * k
+            )
+            for index, flow_index in enumerate(kept.tolist())
+        ]
+
+        # Satellite node IDs of all the routes (without the terminals at both ends)
+        satellite_counts = path_ends - path_starts - 2
+        satellite_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum(satellite_counts, out=satellite_offsets[1:])
+        nodes = route_nodes[
+            np.repeat(path_starts + 1 - satellite_offsets[:-1], satellite_counts)
+            + np.arange(satellite_offsets[-1])
+        ]
+
+        hops = satellite_counts - 1
+        self._first_satellites = nodes[satellite_offsets[:-1]]
+        self._last_satellites = nodes[satellite_offsets[1:] - 1]
+        self._edge_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum(hops, out=self._edge_offsets[1:])
+
+        # ISL edge ID of each hop from the sorted (node, node) keys of the ISLs
+        hop_starts = np.ones(len(nodes), dtype=bool)
+        hop_starts[satellite_offsets[1:] - 1] = False
+        node_a, node_b = nodes[hop_starts], nodes[1:][hop_starts[:-1]]
+
+        isl_ids = np.flatnonzero(isl_mask)
+        isl_nodes = network_graph.edge_nodes[isl_ids]
+        isl_keys = isl_nodes.min(axis=1) * satellite_count + isl_nodes.max(axis=1)
+        order = np.argsort(isl_keys)
+        self._edge_ids = order[np.searchsorted(
+            isl_keys[order],
+            np.minimum(node_a, node_b) * satellite_count + np.maximum(node_a, node_b)
+        )]
+
+        self._lengths_m = self._route_lengths_m(
+            self._isl_lengths_m, self._terminal_links
+        )
+
+    def _route_lengths_m(self, isl_lengths_m: np.ndarray, terminal_links: dict[str, dict[int, float]]) -> np.ndarray:
+        "Length (meters) of each kept route with the ISL and terminal link lengths (NaN when a terminal link is lost)"
+
+        cumulative_m = np.zeros(len(self._edge_ids) + 1, dtype=np.float64)
+        np.cumsum(isl_lengths_m[self._edge_ids], out=cumulative_m[1:])
+        lengths_m = cumulative_m[self._edge_offsets[1:]] - \
+            cumulative_m[self._edge_offsets[:-1]]
+
+        for _, source, destination, start, end in self._flows:
+            source_links = terminal_links.get(source, dict())
+            destination_links = terminal_links.get(destination, dict())
+            lengths_m[start:end] += [
+                source_links.get(sid, np.nan) for sid in self._first_satellites[start:end].tolist()
+            ]
+            lengths_m[start:end] += [
+                destination_links.get(sid, np.nan) for sid in self._last_satellites[start:end].tolist()
+            ]
+        return lengths_m
+
+    @staticmethod
+    def _new_links_bound_m(
+        satellite_positions_m: np.ndarray,
+        new_links: list[int],
+        links: dict[int, float],
+        other_links: dict[int, float]
+    ) -> float:
+        "Lower bound of the length (meters) of the paths over new links of a terminal"
+        if not new_links:
+            return np.inf
+
+        others = list(other_links)
+        return float(np.min(
+            np.array([links[sid] for sid in new_links])[:, np.newaxis] + np.linalg.norm(
+                satellite_positions_m[new_links][:, np.newaxis] - satellite_positions_m[np.newaxis, others],
+                axis=2
+            ) + np.array([other_links[sid] for sid in others])
+        ) * (1 - 1e-9))
+
+    def reusable_routes(
+        self,
+        network_graph: NetworkGraph,
+        satellite_count: int,
+        satellite_positions_m: np.ndarray,
+        k: int
+    ) -> dict[str, list[list[str]]]:
+        """Finds the flows of the previous time step whose routes are still the K shortest routes
+
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Network graph of the new time step (same satellites and ISLs as the previous step)
+        satellite_count: int
+            Number of satellites of the constellation
+        satellite_positions_m: np.ndarray
+            (satellite_count, 3) array of cartesian coordinates (x, y, z) in meters of the satellites in the ID order
+        k: int
+            Number of shortest routes
+
+        Returns
+        -------
+        dict[str, list[list[str]]]
+            K routes of each reusable flow in the order of the new lengths
+        """
+
+        isl_mask = self._isl_mask(network_graph, satellite_count)
+        if (
+            not self._flows or k != self.k or satellite_count != self.satellite_count
+            or np.count_nonzero(isl_mask) != len(self._isl_lengths_m)
+        ):
+            return dict()
+
+        isl_lengths_m = network_graph.edge_weights[isl_mask]
+        terminal_links = self._terminal_links_of(
+            network_graph, satellite_count
+        )
+        lengths_m = self._route_lengths_m(isl_lengths_m, terminal_links)
+
+        # Lowest ratio of the new to the previous ISL lengths and the terminal links of both steps
+        scale = min(
+            1.0, float(np.min(isl_lengths_m / self._isl_lengths_m, initial=1.0))
+        ) * (1 - 1e-9)
+        common_links: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = dict()
+        for terminal in {terminal for _, source, destination, _, _ in self._flows for terminal in (source, destination)}:
+            links = [
+                (sid, distance_m, self._terminal_links[terminal][sid])
+                for sid, distance_m in terminal_links[terminal].items() if sid in self._terminal_links[terminal]
+            ]
+            sids, distances_m, previous_m = zip(*links) if links else ((), (), ())
+            common_links[terminal] = (
+                np.array(sids, dtype=np.int64),
+                np.array(distances_m, dtype=np.float64),
+                np.array(previous_m, dtype=np.float64)
+            )
+
+        # Shortest distances between the satellites of those terminal links with the previous ISL lengths
+        # and with the bound weights `new - factor * previous` of each factor
+        satellites = np.unique(np.concatenate(
+            [sids for sids, _, _ in common_links.values()] + [np.empty(0, dtype=np.int64)]
+        ))
+        satellite_index = np.full(satellite_count, -1, dtype=np.int64)
+        satellite_index[satellites] = np.arange(len(satellites))
+        isl_nodes = network_graph.edge_nodes[isl_mask]
+        factors = scale * np.array(self.BOUND_FACTORS)[:, np.newaxis, np.newaxis]
+        previous_distances, *bound_distances = (
+            dijkstra(
+                csr_matrix(
+                    (
+                        np.concatenate((weights, weights)),
+                        (
+                            np.concatenate((isl_nodes[:, 0], isl_nodes[:, 1])),
+                            np.concatenate((isl_nodes[:, 1], isl_nodes[:, 0]))
+                        )
+                    ),
+                    shape=(satellite_count, satellite_count)
+                ),
+                directed=True, indices=satellites
+            ).reshape(len(satellites), -1)[:, satellites]
+            for weights in [self._isl_lengths_m] + [isl_lengths_m - factor * self._isl_lengths_m for factor in factors.ravel()]
+        )
+        bound_distances = np.stack(bound_distances)
+
+        reusable: dict[str, list[list[str]]] = dict()
+        for flow, source, destination, start, end in self._flows:
+            route_lengths_m = lengths_m[start:end]
+            if np.isnan(route_lengths_m).any():
+                continue
+            longest_m = route_lengths_m.max()
+
+            # Paths over the links of the terminals in both steps, not shorter than the previous K-th route
+            # nor the previous shortest path over the same pair of links
+            source_sids, source_m, source_previous_m = common_links[source]
+            destination_sids, destination_m, destination_previous_m = common_links[destination]
+            if len(source_sids) and len(destination_sids):
+                pairs = np.ix_(
+                    satellite_index[source_sids], satellite_index[destination_sids]
+                )
+                previous_m = np.maximum(
+                    self._lengths_m[start:end].max(),
+                    source_previous_m[:, np.newaxis] + previous_distances[pairs] + destination_previous_m[np.newaxis]
+                )
+                bounds_m = factors * previous_m + bound_distances[:, pairs[0], pairs[1]] + \
+                    (source_m - factors[:, 0] * source_previous_m)[:, :, np.newaxis] + \
+                    (destination_m - factors * destination_previous_m)
+                if longest_m > bounds_m.min(axis=(1, 2)).max() * (1 + 1e-9):
+                    continue
+
+            # Paths over new links of the terminals
+            source_links = terminal_links[source]
+            destination_links = terminal_links[destination]
+            if longest_m > self._new_links_bound_m(
+                satellite_positions_m,
+                [sid for sid in source_links if sid not in self._terminal_links[source]],
+                source_links, destination_links
+            ):
+                continue
+            if longest_m > self._new_links_bound_m(
+                satellite_positions_m,
+                [sid for sid in destination_links if sid not in self._terminal_links[destination]],
+                destination_links, source_links
+            ):
+                continue
+
+            k_path = self._route_store.k_path(flow)
+            reusable[flow] = [
+                k_path[index] for index in np.argsort(route_lengths_m, kind='stable').tolist()
+            ]
+
+        return reusable
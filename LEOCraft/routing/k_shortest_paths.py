@@ -0,0 +1,566 @@
+import heapq
+import itertools
+from typing import Iterator
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from LEOCraft.routing.network_graph import NetworkGraph
+
+
+class _CandidatePaths:
+    """
+    Yen's state of a flow, K shortest paths found so far and the candidate paths
+    in a binary heap with duplicate check (same tie breaking as `networkx.shortest_simple_paths`)
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.paths_found: list[list[int]] = list()
+
+        self._candidates: list[tuple[float, int, list[int]]] = list()
+        self._candidate_paths: set[tuple[int, ...]] = set()
+        self._counter = itertools.count()
+
+        # Largest of the shortest (k - paths found) candidate lengths (negated max heap),
+        # longer spur paths are never within the K shortest paths and not searched
+        self._bound: list[float] = list()
+
+        # Ignored edges of the last spur search of each root, the same search again
+        # would only find the path already in the candidates
+        self._searched: dict[tuple[int, ...], frozenset[tuple[int, int]]] = dict()
+
+    def push(self, length: float, path: list[int]) -> None:
+        if tuple(path) not in self._candidate_paths:
+            heapq.heappush(self._candidates, (length, next(self._counter), path))
+            self._candidate_paths.add(tuple(path))
+
+            if len(self._bound) < self.k - len(self.paths_found):
+                heapq.heappush(self._bound, -length)
+            elif length < -self._bound[0]:
+                heapq.heapreplace(self._bound, -length)
+
+    def pop(self) -> list[int] | None:
+        """Moves the shortest candidate path into the paths found
+
+        Returns
+        -------
+        list[int] | None
+            Path found or None when there is no candidate or K paths are found already
+        """
+
+        if not self._candidates or len(self.paths_found) == self.k:
+            return None
+
+        _, _, path = heapq.heappop(self._candidates)
+        self._candidate_paths.remove(tuple(path))
+        self.paths_found.append(path)
+
+        self._bound = [-length for length, _, _ in heapq.nsmallest(
+            self.k - len(self.paths_found), self._candidates
+        )]
+        heapq.heapify(self._bound)
+        return path
+
+    @property
+    def done(self) -> bool:
+        "K paths are found"
+        return len(self.paths_found) == self.k
+
+    def length_bound(self) -> float:
+        "Length of a path beyond which it is never within the K shortest paths"
+        if len(self._bound) < self.k - len(self.paths_found):
+            return np.inf
+        # Margin for the rounding of the lengths
+        return -self._bound[0] * (1 + 1e-9)
+
+    def roots(self, prev_path: list[int], weights: dict[tuple[int, int], float]) -> Iterator[tuple[list[int], float, set[tuple[int, int]] | None]]:
+        """Yields the roots of the spur paths of the last path found
+
+        Parameters
+        ----------
+        prev_path: list[int]
+            Last path found
+        weights: dict[tuple[int, int], float]
+            Edge weights (meters) keyed by (node, node)
+
+        Yields
+        ------
+        tuple[list[int], float, set[tuple[int, int]] | None]
+            Root path, root length, ignored edges (None when the same spur search was done already),
+            the ignored nodes are the root nodes except the spur node
+        """
+
+        ignore_edges = set()
+        root_length = 0
+        for i in range(1, len(prev_path)):
+            root = prev_path[:i]
+            if i > 1:
+                root_length += weights[(root[-2], root[-1])]
+            for path in self.paths_found:
+                if path[:i] == root:
+                    ignore_edges.add((path[i-1], path[i]))
+
+            if self._searched.get(tuple(root)) == ignore_edges:
+                yield root, root_length, None
+            else:
+                self._searched[tuple(root)] = frozenset(ignore_edges)
+                yield root, root_length, ignore_edges
+
+
+class _EdgeWeights(dict):
+    "Lazy lookup of the edge weights (meters) of a CSR graph keyed by (node, node)"
+
+    def __init__(self, graph: csr_matrix) -> None:
+        super().__init__()
+        self._graph = graph
+        self._weights = graph.data.copy()
+        self._positions: dict[tuple[int, int], int] = dict()
+
+    def position(self, node_a: int, node_b: int) -> int:
+        "Position of the edge in the CSR arrays"
+        if (node_a, node_b) not in self._positions:
+            start, end = self._graph.indptr[node_a], self._graph.indptr[node_a+1]
+            self._positions[(node_a, node_b)] = int(
+                start + np.searchsorted(self._graph.indices[start:end], node_b)
+            )
+        return self._positions[(node_a, node_b)]
+
+    def __missing__(self, edge: tuple[int, int]) -> float:
+        self[edge] = float(self._weights[self.position(*edge)])
+        return self[edge]
+
+
+class KShortestPaths:
+    """
+    Yen's K shortest simple paths on the array-backed (CSR) satellite network graph
+
+    - Terminals are not transit nodes, only the source and destination terminals of a flow are
+      attached to the satellite graph as two extra nodes with their links
+    - Spur paths are computed by scipy (`scipy.sparse.csgraph.dijkstra`) over a reverse shortest-path tree
+      from the destination, the unrestricted tree is computed once per flow and its path is reused
+      for a spur node whenever it avoids the ignored nodes and edges
+    - Candidate paths are kept in a binary heap with duplicate check, paths and their ordering
+      follow `networkx.shortest_simple_paths` (i.e., `LEOCraft.utilities.k_shortest_paths`)
+    - All the flows of a source can be routed together (`paths_from_source`), spur searches are run
+      forward from the spur node and shared by all the destinations with the same root and ignored edges
+
+    Usage: build once per network graph (i.e., time step) then query the flows
+    """
+
+    def __init__(self, network_graph: NetworkGraph, satellite_count: int) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Built network graph with satellites at the node IDs from 0 to satellite_count-1
+        satellite_count: int
+            Number of satellites of the constellation
+        """
+
+        self.network_graph = network_graph
+        self.satellite_count = satellite_count
+
+        # Satellite part of the CSR graph (ISLs only)
+        self._satellite_graph = network_graph.to_csr_matrix(satellite_count)
+
+        # Node IDs of the source and destination terminals of a flow
+        self.source_id = satellite_count
+        self.destination_id = satellite_count + 1
+
+    def _flow_graph(
+        self,
+        source_links: list[tuple[int, float]],
+        destination_links: list[tuple[int, float]]
+    ) -> tuple[csr_matrix, np.ndarray]:
+        """Builds the CSR graph of a flow, satellites with the source and destination terminals attached
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destination_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the destination terminal
+
+        Returns
+        -------
+        tuple[csr_matrix, np.ndarray]
+            (n+2, n+2) symmetric sparse matrix of edge weights in meters,
+            position of the reverse direction of each CSR entry
+        """
+
+        graph = self._satellite_graph.tocoo()
+        rows, cols, weights = [graph.row], [graph.col], [graph.data]
+        for terminal_id, links in (
+            (self.source_id, source_links), (self.destination_id, destination_links)
+        ):
+            if not links:
+                continue
+            sids, distances_m = zip(*links)
+            sids = np.array(sids, dtype=np.int32)
+            terminal_ids = np.full(len(sids), terminal_id, dtype=np.int32)
+            rows += [terminal_ids, sids]
+            cols += [sids, terminal_ids]
+            weights += [np.array(distances_m, dtype=np.float64)]*2
+
+        number_of_nodes = self.satellite_count + 2
+        graph = csr_matrix(
+            (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(number_of_nodes, number_of_nodes)
+        )
+
+        rows = np.repeat(
+            np.arange(number_of_nodes, dtype=np.int64), np.diff(graph.indptr)
+        )
+        cols = graph.indices.astype(np.int64)
+        mirror = np.searchsorted(
+            rows * number_of_nodes + cols, cols * number_of_nodes + rows
+        )
+        return graph, mirror
+
+    @staticmethod
+    def _block_nodes(restricted: np.ndarray, graph: csr_matrix, mirror: np.ndarray, nodes: list[int]) -> None:
+        "Removes all the edges of the nodes (infinite weight) in both directions"
+        if nodes:
+            positions = np.concatenate([
+                np.arange(graph.indptr[node], graph.indptr[node+1]) for node in nodes
+            ])
+            restricted[positions] = np.inf
+            restricted[mirror[positions]] = np.inf
+
+    @staticmethod
+    def _follow(predecessors: np.ndarray, node: int, end: int) -> list[int]:
+        "Path from the node to the end node along the predecessors of a search from the end node"
+        path = [node]
+        while node != end:
+            node = int(predecessors[node])
+            path.append(node)
+        return path
+
+    def paths(
+        self,
+        source_links: list[tuple[int, float]],
+        destination_links: list[tuple[int, float]],
+        k: int
+    ) -> list[list[int]]:
+        """Computes K shortest simple paths from the source to the destination terminal
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destination_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the destination terminal
+        k: int
+            Number of shortest paths
+
+        Returns
+        -------
+        list[list[int]]
+            Up to K paths of node IDs (source ID `satellite_count`, destination ID `satellite_count+1`)
+            in the order of length
+        """
+
+        graph, mirror = self._flow_graph(source_links, destination_links)
+        weights = _EdgeWeights(graph)
+        base_weights = graph.data.copy()
+
+        # Unrestricted reverse shortest-path tree from the destination, computed once
+        tree_distances, tree_predecessors = dijkstra(
+            graph, directed=True, indices=self.destination_id, return_predecessors=True
+        )
+        tree_distances = tree_distances.tolist()
+
+        def spur_path(
+            spur_node: int,
+            ignore_nodes: set[int],
+            ignore_edges: set[tuple[int, int]],
+            node_restricted: np.ndarray,
+            limit: float
+        ) -> tuple[float, list[int]] | None:
+            # The unrestricted distance is a lower bound of the spur path length
+            if tree_distances[spur_node] == np.inf or tree_distances[spur_node] > limit:
+                return None
+
+            # Reuse the unrestricted tree path when it is not affected
+            path = self._follow(tree_predecessors, spur_node, self.destination_id)
+            if ignore_nodes.isdisjoint(path) and not any(
+                (path[hop], path[hop+1]) in ignore_edges or
+                (path[hop+1], path[hop]) in ignore_edges
+                for hop in range(len(path)-1)
+            ):
+                return tree_distances[spur_node], path
+
+            # Restricted search without the ignored nodes and edges (graph weights are overwritten)
+            np.copyto(graph.data, node_restricted)
+            ignored = [weights.position(*edge) for edge in ignore_edges]
+            graph.data[ignored] = np.inf
+            graph.data[mirror[ignored]] = np.inf
+
+            distances, predecessors = dijkstra(
+                graph, directed=True, indices=self.destination_id, return_predecessors=True,
+                limit=limit
+            )
+            if not np.isfinite(distances[spur_node]):
+                return None
+            return float(distances[spur_node]), self._follow(predecessors, spur_node, self.destination_id)
+
+        state = _CandidatePaths(k)
+        spur = spur_path(self.source_id, set(), set(), base_weights, np.inf)
+        if spur is not None:
+            state.push(*spur)
+
+        while (prev_path := state.pop()) is not None and not state.done:
+            ignore_nodes = set()
+            node_restricted = base_weights.copy()
+            for root, root_length, ignore_edges in state.roots(prev_path, weights):
+                if ignore_edges is not None:
+                    spur = spur_path(
+                        root[-1], ignore_nodes, ignore_edges, node_restricted,
+                        state.length_bound() - root_length
+                    )
+                    if spur is not None:
+                        length, spur = spur
+                        state.push(root_length + length, root[:-1] + spur)
+
+                ignore_nodes.add(root[-1])
+                self._block_nodes(node_restricted, graph, mirror, [root[-1]])
+
+        return state.paths_found
+
+    def paths_from_source(
+        self,
+        source_links: list[tuple[int, float]],
+        destinations_links: list[list[tuple[int, float]]],
+        k: int
+    ) -> list[list[list[int]]]:
+        """Computes K shortest simple paths from the source terminal to each of the destination terminals together.
+        Yen's iterations of all the destinations run in lockstep, a spur search runs forward from the spur node
+        once for all the destinations with the same root and ignored edges (e.g., the shared prefixes of the
+        shortest-path tree of the source), and the spur path to each destination is the shortest over its links
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destinations_links: list[list[tuple[int, float]]]
+            List of (satellite node ID, distance in meters) of each destination terminal
+        k: int
+            Number of shortest paths
+
+        Returns
+        -------
+        list[list[list[int]]]
+            Up to K paths of node IDs of each destination (source ID `satellite_count`,
+            destination ID `satellite_count+1`) in the order of length
+        """
+
+        # Destinations are not attached, their links are added after the search
+        graph, mirror = self._flow_graph(source_links, [])
+        weights = _EdgeWeights(graph)
+        base_weights = graph.data.copy()
+
+        destination_sids, destination_distances_m = list(), list()
+        for links in destinations_links:
+            sids, distances_m = zip(*links) if links else ((), ())
+            destination_sids.append(np.array(sids, dtype=np.int64))
+            destination_distances_m.append(np.array(distances_m, dtype=np.float64))
+
+        def search(spur_node: int, ignore_nodes: list[int], ignore_edges: frozenset[tuple[int, int]], limit: float) -> tuple[np.ndarray, np.ndarray]:
+            "Forward search from the spur node without the ignored nodes and edges"
+
+            np.copyto(graph.data, base_weights)
+            self._block_nodes(graph.data, graph, mirror, ignore_nodes)
+            ignored = [weights.position(*edge) for edge in ignore_edges]
+            graph.data[ignored] = np.inf
+            graph.data[mirror[ignored]] = np.inf
+            return dijkstra(
+                graph, directed=True, indices=spur_node, return_predecessors=True, limit=limit
+            )
+
+        def spur_path(
+            did: int, spur_node: int, distances: np.ndarray, predecessors: np.ndarray, excluded: set[int]
+        ) -> tuple[float, list[int]] | None:
+            "Spur path to a destination from the forward search of the spur node"
+
+            lengths = distances[destination_sids[did]] + destination_distances_m[did]
+            for position, sid in enumerate(destination_sids[did].tolist()):
+                if sid in excluded:
+                    lengths[position] = np.inf
+            if not len(lengths):
+                return None
+            position = int(np.argmin(lengths))
+            if not np.isfinite(lengths[position]):
+                return None
+
+            path = self._follow(
+                predecessors, int(destination_sids[did][position]), spur_node
+            )
+            path.reverse()
+            path.append(self.destination_id)
+            return float(lengths[position]), path
+
+        states = [_CandidatePaths(k) for _ in destinations_links]
+
+        # Shortest paths of all the destinations from the shortest-path tree of the source
+        distances, predecessors = search(self.source_id, [], frozenset(), np.inf)
+        for did, state in enumerate(states):
+            spur = spur_path(did, self.source_id, distances, predecessors, set())
+            if spur is not None:
+                state.push(*spur)
+
+        active = [
+            did for did, state in enumerate(states)
+            if state.pop() is not None and not state.done
+        ]
+        while active:
+
+            # Spur searches of the current iteration of all the destinations
+            spur_searches: list[tuple[int, tuple, list[int], float, set[int]]] = list()
+            limits: dict[tuple, float] = dict()
+            for did in active:
+                state = states[did]
+                for root, root_length, ignore_edges in state.roots(state.paths_found[-1], weights):
+                    if ignore_edges is None:
+                        continue
+
+                    # Ignored links to the destination only exclude the satellite from its spur path
+                    excluded = {
+                        node_a for node_a, node_b in ignore_edges if node_b == self.destination_id
+                    }
+                    key = (
+                        tuple(root),
+                        frozenset(edge for edge in ignore_edges if edge[1] != self.destination_id)
+                    )
+                    spur_searches.append((did, key, root, root_length, excluded))
+                    limits[key] = max(
+                        limits.get(key, -np.inf), state.length_bound() - root_length
+                    )
+
+            # One search for each group of the same root and ignored edges
+            groups: dict[tuple, list[int]] = dict()
+            for search_id, (_, key, _, _, _) in enumerate(spur_searches):
+                groups.setdefault(key, list()).append(search_id)
+
+            spurs: list[tuple[float, list[int]] | None] = [None]*len(spur_searches)
+            for (root, ignore_edges), search_ids in groups.items():
+                limit = limits[(root, ignore_edges)]
+                if limit < 0:
+                    continue
+                distances, predecessors = search(
+                    root[-1], list(root[:-1]), ignore_edges, limit
+                )
+                for search_id in search_ids:
+                    did, _, _, _, excluded = spur_searches[search_id]
+                    spurs[search_id] = spur_path(
+                        did, root[-1], distances, predecessors, excluded
+                    )
+
+            # Candidates are pushed in the order of the roots of each destination
+            for (did, _, root, root_length, _), spur in zip(spur_searches, spurs):
+                if spur is not None:
+                    length, spur = spur
+                    states[did].push(root_length + length, root[:-1] + spur)
+
+            active = [
+                did for did in active
+                if states[did].pop() is not None and not states[did].done
+            ]
+
+        return [state.paths_found for state in states]
+
+    def _named_paths(self, source: str, destination: str, paths: list[list[int]]) -> tuple[bool, str, list[list[str]]]:
+        "Converts the paths of node IDs of a flow into routes (status, flow, list of k shortest path)"
+
+        flow = f'{source}_{destination}'
+        if not paths:
+            print(f'Exeption[{flow}]: No path between {source} and {destination}.')
+            return False, flow, []
+
+        node_names = self.network_graph.node_names
+        names = {self.source_id: source, self.destination_id: destination}
+        return True, flow, [
+            [names[node] if node in names else node_names[node] for node in path]
+            for path in paths
+        ]
+
+    def _node_links(self, links: list[tuple[str, float]]) -> list[tuple[int, float]]:
+        "Converts links of (satellite name, distance in meters) into (satellite node ID, distance in meters)"
+        return [
+            (self.network_graph.node_id(sat_name), distance_m)
+            for sat_name, distance_m in links
+        ]
+
+    def k_shortest_paths(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destination: str,
+        destination_links: list[tuple[str, float]],
+        k: int
+    ) -> tuple[bool, str, list[list[str]]]:
+        """Find K shortest path between two terminals,
+        drop-in for `LEOCraft.utilities.k_shortest_paths` with the terminal links instead of a graph
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destination: str
+            Destination terminal name
+        destination_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the destination terminal
+        k: int
+            Number of sortest routes
+
+        Returns
+        -------
+        tuple[bool, str, list[list[str]]]
+            Status, flow, list of k shortest path
+        """
+        return self._named_paths(
+            source,
+            destination,
+            self.paths(
+                self._node_links(source_links), self._node_links(destination_links), k
+            )
+        )
+
+    def k_shortest_paths_from_source(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destinations: list[tuple[str, list[tuple[str, float]]]],
+        k: int
+    ) -> list[tuple[bool, str, list[list[str]]]]:
+        """Find K shortest path from a terminal to each of the destination terminals (see `paths_from_source`)
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destinations: list[tuple[str, list[tuple[str, float]]]]
+            List of (destination terminal name, list of (satellite name, distance in meters))
+        k: int
+            Number of sortest routes
+
+        Returns
+        -------
+        list[tuple[bool, str, list[list[str]]]]
+            Status, flow, list of k shortest path of each destination
+        """
+
+        destinations_paths = self.paths_from_source(
+            self._node_links(source_links),
+            [self._node_links(links) for _, links in destinations],
+            k
+        )
+        return [
+            self._named_paths(source, destination, paths)
+            for (destination, _), paths in zip(destinations, destinations_paths)
+        ]
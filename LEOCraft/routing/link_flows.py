@@ -0,0 +1,179 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.routing.route_store import RouteStore
+
+
+class LinkFlowMatrix:
+    """
+    Sparse incidence matrix of the links and the routes (flow-paths) of a constellation
+
+    - Rows are the edge IDs of the network graph (ISLs, GSLs and FSLs), columns are the routes,
+      route `k_index` of the flow at `flow_index` (order of the route store) is the column `flow_index * k + k_index`
+      (K columns per flow) or `column_offsets[flow_index] + k_index` without K (any number of routes per flow,
+      e.g., routes generated by the column generation of the throughput)
+    - Built in bulk from the node ID arrays of the route store, one vectorized edge ID lookup of all the hops
+    - Per link flow counts and loads are sparse matrix reductions and products
+
+    Usage: build once per routing (i.e., `Constellation.route_store` of a time step), then query the links
+    """
+
+    def __init__(self, network_graph: NetworkGraph, satellite_count: int, route_store: RouteStore, k: int | None) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Network graph of the routes with satellites at the node IDs from 0 to satellite_count-1
+            followed by the terminals and their links
+        satellite_count: int
+            Number of satellites of the constellation
+        route_store: RouteStore
+            Up to K routes of each flow as node IDs
+        k: int | None
+            Number of shortest routes, None for one column per route of the route store
+        """
+
+        self.network_graph = network_graph
+        self.satellite_count = satellite_count
+        self.route_store = route_store
+        self.k = k
+        self.flows: list[str] = list(route_store.flows)
+
+        nodes = route_store.nodes.astype(np.int64)
+        path_offsets = route_store.path_offsets
+        flow_offsets = route_store.flow_offsets
+
+        # Column of each path from its flow and its index in the flow
+        path_flows = np.repeat(
+            np.arange(len(self.flows), dtype=np.int64), np.diff(flow_offsets)
+        )
+        if k is None:
+            columns = np.arange(len(path_flows), dtype=np.int64)
+            self.column_offsets = flow_offsets.copy()
+        else:
+            columns = path_flows * k + np.arange(len(path_flows)) - flow_offsets[path_flows]
+            self.column_offsets = np.arange(0, len(self.flows) * k + 1, k, dtype=np.int64)
+
+        # Both ends of each hop
+        hops = np.diff(path_offsets) - 1
+        hop_starts = np.ones(len(nodes), dtype=bool)
+        hop_starts[path_offsets[1:] - 1] = False
+
+        self.matrix = csr_matrix(
+            (
+                np.ones(int(hops.sum()), dtype=np.int8),
+                (
+                    network_graph.edge_ids_between(
+                        nodes[hop_starts], nodes[1:][hop_starts[:-1]]
+                    ),
+                    np.repeat(columns, hops)
+                )
+            ),
+            shape=(network_graph.number_of_edges, int(self.column_offsets[-1]))
+        )
+        # A link counts once per route
+        self.matrix.sum_duplicates()
+        self.matrix.data[:] = 1
+
+    @property
+    def links(self) -> np.ndarray:
+        "Edge IDs of the links with at least one route"
+        return np.flatnonzero(np.diff(self.matrix.indptr))
+
+    def flow_counts(self) -> np.ndarray:
+        """Number of routes through each link
+
+        Returns
+        -------
+        np.ndarray
+            Route count of each edge ID
+        """
+        return np.diff(self.matrix.indptr)
+
+    def load(self, route_weights: np.ndarray) -> np.ndarray:
+        """Load of each link from the weights of the routes (e.g., data rate in Gbps of each route)
+
+        Parameters
+        ----------
+        route_weights: np.ndarray
+            Weight of each route in the column order (flows x K or routes of each flow)
+
+        Returns
+        -------
+        np.ndarray
+            Sum of the weights of the routes through each edge ID
+        """
+        return self.matrix @ np.asarray(route_weights, dtype=np.float64).ravel()
+
+    def demand_load(self, demands: dict[str, float]) -> np.ndarray:
+        """Demand-weighted load of each link when every route carries the full demand of its flow
+
+        Parameters
+        ----------
+        demands: dict[str, float]
+            Demand (Gbps) of each flow
+
+        Returns
+        -------
+        np.ndarray
+            Sum of the demands of the routes through each edge ID
+        """
+        return self.load(np.repeat(
+            np.array([demands[flow] for flow in self.flows], dtype=np.float64), np.diff(self.column_offsets)
+        ))
+
+    def link_name(self, edge_id: int) -> tuple[str, str]:
+        """Get the name of a link, (terminal, satellite) for the terminal links
+        otherwise the satellite names in order
+
+        Parameters
+        ----------
+        edge_id: int
+            Edge ID
+
+        Returns
+        -------
+        tuple[str, str]
+            Link name i.e., (G-X, S0-Y) or (S0-X, S0-Y)
+        """
+        node_a, node_b = self.network_graph.edge_nodes[edge_id].tolist()
+        if node_a < node_b:
+            node_a, node_b = node_b, node_a
+        name_a, name_b = self.network_graph.node_names[node_a], self.network_graph.node_names[node_b]
+        if node_a >= self.satellite_count:
+            return name_a, name_b
+        return (name_a, name_b) if name_a < name_b else (name_b, name_a)
+
+    def link_routes(self, edge_id: int) -> list[tuple[str, int]]:
+        """Get the routes through a link
+
+        Parameters
+        ----------
+        edge_id: int
+            Edge ID
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            List of (flow, route index)
+        """
+        columns = self.matrix.indices[self.matrix.indptr[edge_id]:self.matrix.indptr[edge_id+1]]
+        flow_indices = np.searchsorted(self.column_offsets, columns, side='right') - 1
+        return [
+            (self.flows[flow_index], index)
+            for flow_index, index in zip(flow_indices.tolist(), (columns - self.column_offsets[flow_indices]).tolist())
+        ]
+
+    def link_load(self) -> dict[tuple[str, str], set[tuple[str, int]]]:
+        """Get the routes through each link as a dict
+
+        Returns
+        -------
+        dict[tuple[str, str], set[tuple[str, int]]]
+            Set of (flow, route index) with a key link name (hop, hop)
+        """
+        return {
+            self.link_name(edge_id): set(self.link_routes(edge_id))
+            for edge_id in self.links.tolist()
+        }
@@ -0,0 +1,394 @@
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class NetworkGraph:
+    """
+    Array-backed undirected network graph of a LEO constellation
+
+    - Nodes have contiguous integer IDs (satellites of each shell, then terminals) with a name <-> ID mapping
+    - Edges are stored in CSR (compressed sparse row) with parallel arrays of neighbor, weight (length in meters) and capacity (Gbps)
+    - Each undirected edge has an edge ID and appears in the CSR rows of both end nodes
+
+    Usage: add all the nodes and edges, then build once
+    """
+
+    def __init__(self) -> None:
+        # Name <-> ID mapping
+        self.node_names: list[str] = list()
+        self._node_ids: dict[str, int] = dict()
+
+        # Edge buffers until the graph is built
+        self._buffer_a: list[np.ndarray] = list()
+        self._buffer_b: list[np.ndarray] = list()
+        self._buffer_weights: list[np.ndarray] = list()
+        self._buffer_capacities: list[np.ndarray] = list()
+
+        # Undirected edges, index is the edge ID
+        self.edge_nodes = np.empty((0, 2), dtype=np.int64)
+        self.edge_weights = np.empty(0, dtype=np.float64)
+        self.edge_capacities = np.empty(0, dtype=np.float64)
+
+        # CSR arrays, neighbors of node u: indices[indptr[u]:indptr[u+1]] (sorted)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.capacities = np.empty(0, dtype=np.float64)
+        self.edge_ids = np.empty(0, dtype=np.int64)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_names)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.edge_weights)
+
+    def add_nodes(self, names: list[str]) -> int:
+        """Adds nodes with contiguous IDs
+
+        Parameters
+        ----------
+        names: list[str]
+            Node names (i.e., satellite or terminal names)
+
+        Returns
+        -------
+        int
+            ID of the first added node
+        """
+        first_id = len(self.node_names)
+        for name in names:
+            assert name not in self._node_ids, f'Duplicate node {name}'
+            self._node_ids[name] = len(self.node_names)
+            self.node_names.append(name)
+        return first_id
+
+    def add_edges(
+        self,
+        nodes_a: list[int] | np.ndarray,
+        nodes_b: list[int] | np.ndarray,
+        weights: list[float] | np.ndarray,
+        capacities: list[float] | np.ndarray
+    ) -> None:
+        """Adds undirected edges, an edge added again replaces the previous one
+
+        Parameters
+        ----------
+        nodes_a: list[int] | np.ndarray
+            Node IDs of one end
+        nodes_b: list[int] | np.ndarray
+            Node IDs of the other end
+        weights: list[float] | np.ndarray
+            Lengths in meters
+        capacities: list[float] | np.ndarray
+            Capacities in Gbps
+        """
+        self._buffer_a.append(np.asarray(nodes_a, dtype=np.int64))
+        self._buffer_b.append(np.asarray(nodes_b, dtype=np.int64))
+        self._buffer_weights.append(np.asarray(weights, dtype=np.float64))
+        self._buffer_capacities.append(
+            np.asarray(capacities, dtype=np.float64)
+        )
+
+    def build(self) -> None:
+        "Compiles the added edges into CSR arrays"
+
+        if self._buffer_a:
+            nodes_a = np.concatenate([self.edge_nodes[:, 0], *self._buffer_a])
+            nodes_b = np.concatenate([self.edge_nodes[:, 1], *self._buffer_b])
+            weights = np.concatenate([self.edge_weights, *self._buffer_weights])
+            capacities = np.concatenate(
+                [self.edge_capacities, *self._buffer_capacities]
+            )
+            self._buffer_a, self._buffer_b = list(), list()
+            self._buffer_weights, self._buffer_capacities = list(), list()
+
+            # Keep the last added copy of a duplicate edge at the place of its first insertion
+            keys = np.minimum(nodes_a, nodes_b) * self.number_of_nodes + \
+                np.maximum(nodes_a, nodes_b)
+            _, first = np.unique(keys, return_index=True)
+            _, last = np.unique(keys[::-1], return_index=True)
+            last = len(keys) - 1 - last
+            order = np.argsort(first, kind='stable')
+
+            self.edge_nodes = np.stack(
+                (nodes_a[first[order]], nodes_b[first[order]]), axis=1
+            )
+            self.edge_weights = weights[last[order]]
+            self.edge_capacities = capacities[last[order]]
+
+        # Both directions of each edge, sorted by (node, neighbor)
+        rows = np.concatenate((self.edge_nodes[:, 0], self.edge_nodes[:, 1]))
+        cols = np.concatenate((self.edge_nodes[:, 1], self.edge_nodes[:, 0]))
+        edge_ids = np.tile(np.arange(self.number_of_edges), 2)
+        order = np.lexsort((cols, rows))
+
+        self.indices = cols[order]
+        self.edge_ids = edge_ids[order]
+        self.weights = self.edge_weights[self.edge_ids]
+        self.capacities = self.edge_capacities[self.edge_ids]
+        self.indptr = np.zeros(self.number_of_nodes+1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(rows, minlength=self.number_of_nodes),
+            out=self.indptr[1:]
+        )
+
+    def node_id(self, name: str) -> int:
+        """Get the node ID of a satellite/terminal name
+
+        Parameters
+        ----------
+        name: str
+            Satellite/ground station name
+
+        Returns
+        -------
+        int
+            Node ID
+        """
+        return self._node_ids[name]
+
+    def node_name(self, node_id: int) -> str:
+        """Get the satellite/terminal name of a node ID
+
+        Parameters
+        ----------
+        node_id: int
+            Node ID
+
+        Returns
+        -------
+        str
+            Satellite/ground station name
+        """
+        return self.node_names[node_id]
+
+    def has_node(self, name: str) -> bool:
+        return name in self._node_ids
+
+    def neighbors(self, node_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Get the neighbors of a node
+
+        Parameters
+        ----------
+        node_id: int
+            Node ID
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Neighbor node IDs, corresponding edge weights (lengths in meters)
+        """
+        start, end = self.indptr[node_id], self.indptr[node_id+1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def edge_id(self, node_a: int, node_b: int) -> int:
+        """Get the edge ID between two nodes
+
+        Parameters
+        ----------
+        node_a: int
+            Node ID
+        node_b: int
+            Node ID
+
+        Returns
+        -------
+        int
+            Edge ID
+
+        Raises
+        ------
+        KeyError
+            When there is no edge between the nodes
+        """
+        start, end = self.indptr[node_a], self.indptr[node_a+1]
+        position = start + np.searchsorted(self.indices[start:end], node_b)
+        if position == end or self.indices[position] != node_b:
+            raise KeyError(
+                f'No edge between {self.node_name(node_a)} and {self.node_name(node_b)}'
+            )
+        return int(self.edge_ids[position])
+
+    def path_edge_ids(self, path: list[int]) -> list[int]:
+        """Get the edge IDs along a path
+
+        Parameters
+        ----------
+        path: list[int]
+            Node IDs of the path
+
+        Returns
+        -------
+        list[int]
+            Edge IDs of each hop
+        """
+        return [
+            self.edge_id(path[hop], path[hop+1]) for hop in range(len(path)-1)
+        ]
+
+    def edge_ids_between(self, nodes_a: np.ndarray, nodes_b: np.ndarray) -> np.ndarray:
+        """Get the edge IDs between pairs of nodes (vectorized `edge_id`)
+
+        Parameters
+        ----------
+        nodes_a: np.ndarray
+            Node IDs of one end
+        nodes_b: np.ndarray
+            Node IDs of the other end
+
+        Returns
+        -------
+        np.ndarray
+            Edge ID of each pair
+
+        Raises
+        ------
+        KeyError
+            When there is no edge between a pair of nodes
+        """
+
+        nodes_a, nodes_b = np.asarray(nodes_a, dtype=np.int64), np.asarray(nodes_b, dtype=np.int64)
+        edge_keys = self.edge_nodes.min(axis=1) * self.number_of_nodes + self.edge_nodes.max(axis=1)
+        order = np.argsort(edge_keys)
+        keys = np.minimum(nodes_a, nodes_b) * self.number_of_nodes + np.maximum(nodes_a, nodes_b)
+
+        positions = np.minimum(
+            np.searchsorted(edge_keys[order], keys), max(len(order) - 1, 0)
+        )
+        missing = np.flatnonzero(
+            edge_keys[order][positions] != keys
+        ) if len(order) else np.arange(len(keys))
+        if len(missing):
+            raise KeyError(
+                f'No edge between {self.node_name(int(nodes_a[missing[0]]))} and {self.node_name(int(nodes_b[missing[0]]))}'
+            )
+        return order[positions]
+
+    def link_length(self, name_a: str, name_b: str) -> float:
+        """Get the length (meters) of a link
+
+        Parameters
+        -------
+        name_a: str
+            Satellite/ground station name
+        name_b: str
+            Satellite/ground station name
+
+        Returns
+        -------
+        float
+            Length in meters
+        """
+        return float(self.edge_weights[
+            self.edge_id(self.node_id(name_a), self.node_id(name_b))
+        ])
+
+    def link_capacity(self, name_a: str, name_b: str) -> float:
+        """Get the capacity (Gbps) of a link
+
+        Parameters
+        -------
+        name_a: str
+            Satellite/ground station name
+        name_b: str
+            Satellite/ground station name
+
+        Returns
+        -------
+        float
+            Data rate in Gbps
+        """
+        return float(self.edge_capacities[
+            self.edge_id(self.node_id(name_a), self.node_id(name_b))
+        ])
+
+    def path_length_m(self, path: list[str]) -> float:
+        """Calculates the length of a path in meters (hop lengths are added in the path order)
+
+        Parameters
+        ----------
+        path: list[str]
+            Satellite/ground station names of the path
+
+        Returns
+        -------
+        float
+            Length in meters
+        """
+        node_ids = [self.node_id(name) for name in path]
+        return sum(self.edge_weights[self.path_edge_ids(node_ids)].tolist())
+
+    def to_csr_matrix(self, number_of_nodes: int | None = None, edge_weights: np.ndarray | None = None) -> csr_matrix:
+        """Get the weighted adjacency matrix of the first nodes (i.e., satellites only)
+
+        Parameters
+        ----------
+        number_of_nodes: int | None, optional
+            Number of nodes from ID 0 (default all the nodes)
+        edge_weights: np.ndarray | None, optional
+            Weight of each edge ID (default edge lengths in meters)
+
+        Returns
+        -------
+        csr_matrix
+            (n, n) sparse matrix of edge weights
+        """
+
+        if number_of_nodes is None:
+            number_of_nodes = self.number_of_nodes
+
+        indptr = self.indptr[:number_of_nodes+1]
+        indices = self.indices[:indptr[-1]]
+        weights = self.weights[:indptr[-1]] if edge_weights is None else edge_weights[self.edge_ids[:indptr[-1]]]
+
+        # Drop the edges to the excluded nodes
+        keep = indices < number_of_nodes
+        rows = np.repeat(np.arange(number_of_nodes), np.diff(indptr))[keep]
+        _indptr = np.zeros(number_of_nodes+1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=number_of_nodes), out=_indptr[1:])
+
+        return csr_matrix(
+            (weights[keep], indices[keep], _indptr),
+            shape=(number_of_nodes, number_of_nodes)
+        )
+
+    def to_networkx(self, number_of_nodes: int | None = None) -> nx.Graph:
+        """Converts the graph of the first nodes (i.e., satellites only) into a networkx graph with names as nodes,
+        nodes and edges are added in the ID order
+
+        Parameters
+        ----------
+        number_of_nodes: int | None, optional
+            Number of nodes from ID 0 (default all the nodes)
+
+        Returns
+        -------
+        nx.Graph
+            Network graph with edge attributes weight (meters) and capacity (Gbps)
+        """
+
+        if number_of_nodes is None:
+            number_of_nodes = self.number_of_nodes
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self.node_names[:number_of_nodes])
+
+        keep = np.flatnonzero(
+            (self.edge_nodes[:, 0] < number_of_nodes) &
+            (self.edge_nodes[:, 1] < number_of_nodes)
+        )
+        graph.add_edges_from(
+            (
+                self.node_names[node_a], self.node_names[node_b],
+                {'weight': weight, 'capacity': capacity}
+            )
+            for (node_a, node_b), weight, capacity in zip(
+                self.edge_nodes[keep].tolist(),
+                self.edge_weights[keep].tolist(),
+                self.edge_capacities[keep].tolist()
+            )
+        )
+        return graph
@@ -0,0 +1,226 @@
+from array import array
+
+import numpy as np
+
+from LEOCraft.routing.network_graph import NetworkGraph
+
+
+class RouteStore:
+    """
+    Compact store of the routes of the flows as node IDs of the network graph
+
+    - All the paths are one contiguous int32 array of node IDs with the offsets of each path (`path_offsets`)
+      and the offsets of the paths of each flow (`flow_offsets`), i.e., flows -> paths -> nodes in CSR
+    - Buffers grow while adding the routes, paths are decoded to the node names only on request
+    - `nodes`, `path_offsets` and `flow_offsets` are zero-copy views of the buffers, the buffers can not grow
+      while a view is alive (adding the routes raises BufferError and leaves the store unchanged)
+    - Pickled as raw byte buffers without the network graph (e.g., chunks of routes from the worker processes),
+      merged with `extend`
+
+    Usage: add the routes of a time step, then read the arrays or decode the flows
+    """
+
+    def __init__(self, network_graph: NetworkGraph) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Network graph of the node IDs (satellites and terminals)
+        """
+
+        self.network_graph = network_graph
+
+        self.flows: list[str] = list()
+        self._flow_index: dict[str, int] = dict()
+
+        self._nodes = array('i')
+        self._path_offsets = array('q', [0])
+        self._flow_offsets = array('q', [0])
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['network_graph'] = None
+        del state['_flow_index']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._flow_index = {flow: index for index, flow in enumerate(self.flows)}
+
+    def __len__(self) -> int:
+        return len(self.flows)
+
+    def __contains__(self, flow: str) -> bool:
+        return flow in self._flow_index
+
+    def __iter__(self):
+        return iter(self.flows)
+
+    @property
+    def nodes(self) -> np.ndarray:
+        "Node IDs of all the paths"
+        return np.frombuffer(self._nodes, dtype=np.int32)
+
+    @property
+    def path_offsets(self) -> np.ndarray:
+        "Offset of each path into the node IDs, the last one is the number of node IDs"
+        return np.frombuffer(self._path_offsets, dtype=np.int64)
+
+    @property
+    def flow_offsets(self) -> np.ndarray:
+        "Offset of the paths of each flow, the last one is the number of paths"
+        return np.frombuffer(self._flow_offsets, dtype=np.int64)
+
+    def index(self, flow: str) -> int:
+        """Get the index of a flow in the order of the flows
+
+        Parameters
+        ----------
+        flow: str
+            Flow name (G-X_G-Y) or (G-X_F-Y)
+
+        Returns
+        -------
+        int
+            Index of the flow
+        """
+        return self._flow_index[flow]
+
+    def add_node_paths(self, flow: str, paths: list[list[int]]) -> None:
+        """Adds the routes of a flow
+
+        Parameters
+        ----------
+        flow: str
+            Flow name (G-X_G-Y) or (G-X_F-Y)
+        paths: list[list[int]]
+            List of paths of node IDs
+        """
+
+        assert flow not in self._flow_index, f'Duplicate flow {flow}'
+
+        nodes = array('i')
+        path_offsets = array('q')
+        for path in paths:
+            nodes.extend(path)
+            path_offsets.append(len(self._nodes) + len(nodes))
+
+        self._grow_buffers(
+            nodes, path_offsets,
+            array('q', [len(self._path_offsets) - 1 + len(path_offsets)])
+        )
+        self._flow_index[flow] = len(self.flows)
+        self.flows.append(flow)
+
+    def add(self, flow: str, k_path: list[list[str]]) -> None:
+        """Adds the routes of a flow
+
+        Parameters
+        ----------
+        flow: str
+            Flow name (G-X_G-Y) or (G-X_F-Y)
+        k_path: list[list[str]]
+            List of paths of node names
+        """
+        node_id = self.network_graph.node_id
+        self.add_node_paths(flow, [list(map(node_id, path)) for path in k_path])
+
+    def extend(self, other: 'RouteStore') -> None:
+        """Appends the routes of another store (e.g., a chunk from a worker process)
+
+        Parameters
+        ----------
+        other: RouteStore
+            Store of the routes of other flows
+        """
+
+        for flow in other.flows:
+            assert flow not in self._flow_index, f'Duplicate flow {flow}'
+
+        self._grow_buffers(
+            other._nodes,
+            array('q', (other.path_offsets[1:] + len(self._nodes)).tolist()),
+            array('q', (other.flow_offsets[1:] + len(self._path_offsets) - 1).tolist())
+        )
+        for flow in other.flows:
+            self._flow_index[flow] = len(self.flows)
+            self.flows.append(flow)
+
+    def _grow_buffers(self, nodes: array, path_offsets: array, flow_offsets: array) -> None:
+        'Appends to all the buffers or to none of them (i.e., BufferError while a view of a buffer is alive)'
+
+        grown: list[tuple[array, int]] = list()
+        try:
+            for buffer, values in (
+                (self._nodes, nodes),
+                (self._path_offsets, path_offsets),
+                (self._flow_offsets, flow_offsets)
+            ):
+                size = len(buffer)
+                buffer.extend(values)
+                grown.append((buffer, size))
+        except BufferError:
+            # Grown buffers have no views, so they can shrink back
+            for buffer, size in grown:
+                del buffer[size:]
+            raise
+
+    def node_paths(self, flow: str) -> list[np.ndarray]:
+        """Get the routes of a flow as node IDs
+
+        Parameters
+        ----------
+        flow: str
+            Flow name (G-X_G-Y) or (G-X_F-Y)
+
+        Returns
+        -------
+        list[np.ndarray]
+            List of paths of node IDs (copies, not views of the buffers)
+        """
+
+        flow_index = self._flow_index[flow]
+        path_offsets = self._path_offsets
+        return [
+            np.array(self._nodes[path_offsets[path]:path_offsets[path+1]], dtype=np.int32)
+            for path in range(self._flow_offsets[flow_index], self._flow_offsets[flow_index+1])
+        ]
+
+    def k_path(self, flow: str) -> list[list[str]]:
+        """Get the routes of a flow as node names
+
+        Parameters
+        ----------
+        flow: str
+            Flow name (G-X_G-Y) or (G-X_F-Y)
+
+        Returns
+        -------
+        list[list[str]]
+            List of paths of node names
+        """
+        node_names = self.network_graph.node_names
+        return [
+            [node_names[node] for node in path.tolist()] for path in self.node_paths(flow)
+        ]
+
+    def to_dict(self) -> dict[str, list[list[str]]]:
+        """Decodes all the routes to the node names
+
+        Returns
+        -------
+        dict[str, list[list[str]]]
+            List of paths of node names with a key flow
+        """
+
+        node_names = self.network_graph.node_names
+        names = [node_names[node] for node in self.nodes.tolist()]
+        path_offsets = self.path_offsets.tolist()
+        flow_offsets = self.flow_offsets.tolist()
+        return {
+            flow: [
+                names[path_offsets[path]:path_offsets[path+1]]
+                for path in range(flow_offsets[flow_index], flow_offsets[flow_index+1])
+            ]
+            for flow_index, flow in enumerate(self.flows)
+        }
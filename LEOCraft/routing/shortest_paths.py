@@ -0,0 +1,167 @@
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from LEOCraft.routing.network_graph import NetworkGraph
+
+
+class ShortestPaths:
+    """
+    Shortest path (K=1) routing of the terminals on the array-backed (CSR) satellite network graph
+
+    - A terminal to terminal shortest path is the minimum over the pairs of their links of
+      `link_a + d(sat_a, sat_b) + link_b`, terminals are not transit nodes
+    - One multi-source Dijkstra (`scipy.sparse.csgraph.dijkstra`) from only the satellites linked to a terminal
+      gives a compact distance matrix between those satellites and their predecessor matrix
+    - Routes of all the destinations of a source are resolved by vectorized min-reductions over their links
+    - Equal length paths (ties) may differ from `LEOCraft.utilities.k_shortest_paths`, the lengths are the same
+    - Other costs of the edges (e.g., dual-weighted links of the throughput column generation) replace the lengths
+      with `edge_weights`, the link distances of the terminals are then their costs
+
+    Usage: build once per network graph (i.e., time step) with the terminals added, then query the flows
+    """
+
+    def __init__(self, network_graph: NetworkGraph, satellite_count: int, edge_weights: np.ndarray | None = None) -> None:
+        """
+        Parameters
+        ----------
+        network_graph: NetworkGraph
+            Built network graph with satellites at the node IDs from 0 to satellite_count-1
+            followed by the terminals and their links
+        satellite_count: int
+            Number of satellites of the constellation
+        edge_weights: np.ndarray | None, optional
+            Positive cost of each edge ID (default edge lengths in meters)
+        """
+
+        self.network_graph = network_graph
+        self.satellite_count = satellite_count
+
+        # Satellites linked to any terminal and their index in the compact matrices
+        self.satellites = np.unique(
+            network_graph.indices[network_graph.indptr[satellite_count]:]
+        )
+        self._satellite_index = np.full(satellite_count, -1, dtype=np.int64)
+        self._satellite_index[self.satellites] = np.arange(len(self.satellites))
+
+        distances, self.predecessors = dijkstra(
+            network_graph.to_csr_matrix(satellite_count, edge_weights), directed=True,
+            indices=self.satellites, return_predecessors=True
+        )
+        self.predecessors = self.predecessors.reshape(len(self.satellites), -1)
+
+        # Distance (meters) between the satellites linked to the terminals
+        self.distances = distances.reshape(len(self.satellites), -1)[:, self.satellites]
+
+    def _link_arrays(self, links: list[tuple[int, float]]) -> tuple[np.ndarray, np.ndarray]:
+        "Compact indices of the linked satellites and the link distances in meters"
+        sids, distances_m = zip(*links) if links else ((), ())
+        return self._satellite_index[np.array(sids, dtype=np.int64)], np.array(distances_m, dtype=np.float64)
+
+    def paths_from_source(
+        self,
+        source_links: list[tuple[int, float]],
+        destinations_links: list[list[tuple[int, float]]]
+    ) -> list[list[int] | None]:
+        """Computes the shortest path from the source terminal to each of the destination terminals
+
+        Parameters
+        ----------
+        source_links: list[tuple[int, float]]
+            List of (satellite node ID, distance in meters) of the source terminal
+        destinations_links: list[list[tuple[int, float]]]
+            List of (satellite node ID, distance in meters) of each destination terminal
+
+        Returns
+        -------
+        list[list[int] | None]
+            Satellite node IDs of the shortest path (without the terminals) of each destination,
+            None when there is no path
+        """
+
+        source_index, source_distances_m = self._link_arrays(source_links)
+        if not len(destinations_links):
+            return []
+        if not len(source_index):
+            return [None]*len(destinations_links)
+
+        # Distance from the source terminal to each linked satellite and the first satellite on the way
+        via_first = self.distances[source_index] + source_distances_m[:, np.newaxis]
+        first = np.argmin(via_first, axis=0)
+        to_satellites = via_first[first, np.arange(len(self.satellites))]
+
+        # Links of the destinations padded to the same length
+        width = max(1, max(len(links) for links in destinations_links))
+        last_index = np.zeros((len(destinations_links), width), dtype=np.int64)
+        last_distances_m = np.full((len(destinations_links), width), np.inf)
+        for did, links in enumerate(destinations_links):
+            last_index[did, :len(links)], last_distances_m[did, :len(links)] = self._link_arrays(links)
+
+        via_last = to_satellites[last_index] + last_distances_m
+        last = np.argmin(via_last, axis=1)
+        lengths = via_last[np.arange(len(destinations_links)), last]
+
+        paths: list[list[int] | None] = list()
+        for did in range(len(destinations_links)):
+            if not np.isfinite(lengths[did]):
+                paths.append(None)
+                continue
+
+            # Follow the predecessors of the search from the first satellite back from the last satellite
+            last_satellite = int(last_index[did, last[did]])
+            first_satellite = int(source_index[first[last_satellite]])
+            predecessors = self.predecessors[first_satellite]
+            node, end = int(self.satellites[last_satellite]), int(self.satellites[first_satellite])
+            path = [node]
+            while node != end:
+                node = int(predecessors[node])
+                path.append(node)
+            path.reverse()
+            paths.append(path)
+
+        return paths
+
+    def shortest_paths_from_source(
+        self,
+        source: str,
+        source_links: list[tuple[str, float]],
+        destinations: list[tuple[str, list[tuple[str, float]]]]
+    ) -> list[tuple[bool, str, list[list[str]]]]:
+        """Find the shortest path from a terminal to each of the destination terminals,
+        same output as `LEOCraft.utilities.k_shortest_paths` with K=1
+
+        Parameters
+        ----------
+        source: str
+            Source terminal name
+        source_links: list[tuple[str, float]]
+            List of (satellite name, distance in meters) of the source terminal
+        destinations: list[tuple[str, list[tuple[str, float]]]]
+            List of (destination terminal name, list of (satellite name, distance in meters))
+
+        Returns
+        -------
+        list[tuple[bool, str, list[list[str]]]]
+            Status, flow, list of the shortest path of each destination
+        """
+
+        node_id = self.network_graph.node_id
+        node_names = self.network_graph.node_names
+        destinations_paths = self.paths_from_source(
+            [(node_id(sat_name), distance_m) for sat_name, distance_m in source_links],
+            [
+                [(node_id(sat_name), distance_m) for sat_name, distance_m in links]
+                for _, links in destinations
+            ]
+        )
+
+        routes = list()
+        for (destination, _), path in zip(destinations, destinations_paths):
+            flow = f'{source}_{destination}'
+            if path is None:
+                print(f'Exeption[{flow}]: No path between {source} and {destination}.')
+                routes.append((False, flow, []))
+            else:
+                routes.append(
+                    (True, flow, [[source, *(node_names[node] for node in path), destination]])
+                )
+        return routes
@@ -2,11 +2,14 @@ import csv
 import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 
-import ephem
+import numpy as np
 from astropy import units as u
 from astropy.time import TimeDelta
+from scipy.spatial import cKDTree
 
+from LEOCraft.satellite_topology.propagator import ShellPropagator
 from LEOCraft.satellite_topology.satellite import LEOSatellite
 from LEOCraft.user_terminals.terminal import TerminalCoordinates, UserTerminal
 
@@ -52,6 +55,11 @@ class LEOSatelliteTopology(ABC):
     [2] Kassing S, Bhattacherjee D, Águas AB, Saethre JE, Singla A. Exploring the" Internet from space" with Hypatia. InProceedings of the ACM Internet Measurement conference 2020 Oct 27 (pp. 214-229).
     """
 
+    # Working memory budget (bytes) of one batch propagation pass
+    PROPAGATION_MEMORY_BYTES: int = 256 * 1024 * 1024
+    # Working memory cap (bytes) of one tile of the terminal x satellite range matrix
+    VISIBILITY_MEMORY_BYTES: int = 256 * 1024 * 1024
+
     def __init__(
         self,
         id: int,
@@ -99,6 +107,15 @@ class LEOSatelliteTopology(ABC):
 
         self.universal_epoch = None
 
+        # Vectorized propagator of all the satellites of this shell
+        self._propagator: ShellPropagator | None = None
+        # Satellite positions (ECEF) of the last propagated time delta
+        self._positions_cache: tuple[float, np.ndarray] | None = None
+        # Spatial index (KD-tree) over the last queried satellite positions (array of the positions cache)
+        self._spatial_index: tuple[np.ndarray, cKDTree] | None = None
+        # Satellite altitudes and tangents of min angle of elevation for the GSL ranges
+        self._GSL_geometry: tuple[np.ndarray, np.ndarray] | None = None
+
     @abstractmethod
     def build_ISLs(self) -> None:
         "Creates ISL links (sat_1, sat_2)"
@@ -122,10 +139,218 @@ class LEOSatelliteTopology(ABC):
         # return f'{self.__class__.__name__}_{self.id}_o{self.orbits}n{self.sat_per_orbit}h{self.altitude_m}i{self.inclination_degree}e{self.angle_of_elevation_degree}p{self.phase_offset}'
         pass
 
+    @property
+    def propagator(self) -> ShellPropagator:
+        """Get the vectorized propagator of all the satellites of this shell
+
+        Returns
+        -------
+        ShellPropagator
+            Propagator built from the orbital elements of the satellites
+        """
+
+        if self._propagator is None or self._propagator.size != len(self.satellites):
+            assert len(self.satellites) > 0, 'Satellites are not built'
+            self._propagator = ShellPropagator(
+                self.universal_epoch,
+                *zip(*[sat.orbital_elements() for sat in self.satellites])
+            )
+            self._positions_cache = None
+
+        return self._propagator
+
+    def satellite_positions_m(
+            self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
+    ) -> np.ndarray:
+        """Computes the positions of all the satellites of this shell in ECEF at given time
+
+        Parameters
+        ----------
+        time_delta : TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of cartesian coordinates (x, y, z) in meters, row index is the satellite ID
+        """
+
+        time_s = ShellPropagator.time_delta_s(time_delta)
+        propagator = self.propagator
+
+        if self._positions_cache is None or self._positions_cache[0] != time_s:
+            self._positions_cache = (
+                time_s, propagator.ecef_positions_m(time_delta)
+            )
+
+        return self._positions_cache[1]
+
+    def satellite_positions_batch_m(
+            self, time_deltas: Iterable[TimeDelta | float], max_memory_bytes: int | None = None
+    ) -> np.ndarray:
+        """Computes the positions of all the satellites of this shell in ECEF for multiple time steps.
+        Time steps are propagated in vectorized chunks so that the working memory of a pass stays within the budget
+
+        Parameters
+        ----------
+        time_deltas: Iterable[TimeDelta | float]
+            Time passed from the epoch of each step, plain numbers are read as seconds (e.g., range(200))
+        max_memory_bytes: int | None, optional
+            Working memory budget of one propagation pass (default PROPAGATION_MEMORY_BYTES)
+
+        Returns
+        -------
+        np.ndarray
+            (T, N, 3) array of cartesian coordinates (x, y, z) in meters, row index of a step is the satellite ID
+        """
+
+        times_s = ShellPropagator.time_deltas_s(time_deltas)
+        positions_m = np.empty((len(times_s), len(self.satellites), 3))
+
+        for start, chunk_m in self._propagate_chunks(times_s, max_memory_bytes):
+            positions_m[start:start+len(chunk_m)] = chunk_m
+
+        return positions_m
+
+    def iter_satellite_positions_m(
+            self, time_deltas: Iterable[TimeDelta | float], max_memory_bytes: int | None = None
+    ) -> Iterator[tuple[TimeDelta, np.ndarray]]:
+        """Iterates over the positions of all the satellites of this shell in ECEF for multiple time steps.
+        Positions are propagated in vectorized chunks and each step is loaded as the current positions of the shell,
+        so the distance/GSL computations at that time delta do not propagate again
+
+        Parameters
+        ----------
+        time_deltas: Iterable[TimeDelta | float]
+            Time passed from the epoch of each step, plain numbers are read as seconds (e.g., range(200))
+        max_memory_bytes: int | None, optional
+            Working memory budget of one propagation pass (default PROPAGATION_MEMORY_BYTES)
+
+        Yields
+        ------
+        tuple[TimeDelta, np.ndarray]
+            Time delta of the step, (N, 3) array of cartesian coordinates (x, y, z) in meters
+        """
+
+        time_deltas = [
+            time_delta if isinstance(time_delta, TimeDelta)
+            else TimeDelta(float(time_delta) * u.second)
+            for time_delta in time_deltas
+        ]
+        times_s = ShellPropagator.time_deltas_s(time_deltas)
+
+        for start, chunk_m in self._propagate_chunks(times_s, max_memory_bytes):
+            for step, positions_m in enumerate(chunk_m):
+                self.load_satellite_positions(time_deltas[start+step], positions_m)
+                yield time_deltas[start+step], positions_m
+
+    def _propagate_chunks(
+            self, times_s: np.ndarray, max_memory_bytes: int | None
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        'Propagates the time steps (seconds) in chunks within the memory budget, yields (first step index, positions)'
+
+        propagator = self.propagator
+        steps = propagator.steps_per_chunk(
+            self.PROPAGATION_MEMORY_BYTES if max_memory_bytes is None else max_memory_bytes
+        )
+        for start in range(0, len(times_s), steps):
+            yield start, propagator.ecef_positions_batch_m(times_s[start:start+steps])
+
+    def load_satellite_positions(self, time_delta: TimeDelta, positions_m: np.ndarray) -> None:
+        """Loads precomputed positions (i.e., one step of a batch propagation) as the positions of the satellites at given time
+
+        Parameters
+        ----------
+        time_delta: TimeDelta
+            Time passed from the epoch
+        positions_m: np.ndarray
+            (N, 3) array of cartesian coordinates (x, y, z) in meters
+        """
+        assert positions_m.shape == (len(self.satellites), 3), 'Positions shape error'
+        self._positions_cache = (
+            ShellPropagator.time_delta_s(time_delta), positions_m
+        )
+
+    def satellite_nadirs(
+            self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
+    ) -> np.ndarray:
+        """Calculates satellite shadow/nadir of all the satellites of this shell at given time
+
+        Parameters
+        ----------
+        time_delta : TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of (latitude, longitude, elevation in meter), row index is the satellite ID
+        """
+        return ShellPropagator.ecef_to_nadir(self.satellite_positions_m(time_delta))
+
+    def _satellite_GSL_geometry(self) -> tuple[np.ndarray, np.ndarray]:
+        'Get the satellite altitudes (m) and tangents of min angle of elevation, index is the satellite ID'
+        if self._GSL_geometry is None or len(self._GSL_geometry[0]) != len(self.satellites):
+            self._GSL_geometry = (
+                np.array([sat.altitude_m for sat in self.satellites]),
+                np.tan(np.radians(
+                    [sat.angle_of_elevation_e_degree for sat in self.satellites]
+                ))
+            )
+        return self._GSL_geometry
+
+    def max_GSL_lengths_m(self, ut_altitude_m: float = 0.0, sids: np.ndarray | None = None) -> np.ndarray:
+        """Calculates maximum possible GSL length in meters of the satellites at a given altitude (default 0m)
+
+        Parameters
+        -------
+        ut_altitude_m: float, optional
+            User Terminal altitude in meters
+        sids: np.ndarray | None, optional
+            Satellite IDs (default all the satellites)
+
+        Returns
+        -------
+        np.ndarray
+            Length in meter(s), index is the satellite ID (or index of sids)
+        """
+
+        sat_altitude_m, tan_angle_of_elevation = self._satellite_GSL_geometry()
+        if sids is not None:
+            sat_altitude_m = sat_altitude_m[sids]
+            tan_angle_of_elevation = tan_angle_of_elevation[sids]
+
+        altitude_m = sat_altitude_m - ut_altitude_m
+        _coverage_cone_radius_m = altitude_m / tan_angle_of_elevation
+        return np.sqrt(
+            np.power(_coverage_cone_radius_m, 2) + np.power(altitude_m, 2)
+        )
+
+    def spatial_index(self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)) -> cKDTree:
+        """Get the spatial index (KD-tree) over the satellite positions in ECEF at given time,
+        the index is rebuilt once per positions array (i.e., time delta, loaded positions or rebuilt propagator)
+
+        Parameters
+        ----------
+        time_delta : TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        cKDTree
+            KD-tree of satellite positions, data index is the satellite ID
+        """
+
+        positions_m = self.satellite_positions_m(time_delta)
+        if self._spatial_index is None or self._spatial_index[0] is not positions_m:
+            self._spatial_index = (positions_m, cKDTree(positions_m))
+
+        return self._spatial_index[1]
+
     def cartesian_coordinates_of_sat(
             self, sid: int, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
     ) -> tuple[float, float, float]:
-        """Convert from satellites TLE to cartesian coordinates (x, y, z) system respect to lat: 0, long: 0, elevation: 0
+        """Get cartesian coordinates (x, y, z) of a satellite in ECEF
 
         Parameters
         ----------
@@ -140,30 +365,7 @@ class LEOSatelliteTopology(ABC):
             cartesian coordinates (x, y, z)
         """
 
-        _satellite = self.satellites[sid].get_satellite()
-
-        # Set an observer location and date/time
-        _observer = ephem.Observer()
-        _observer.lat = '0'   # Equator
-        _observer.lon = '0'   # Prime meridian
-        _observer.elevation = 0
-
-        _observer.epoch = str(self.universal_epoch)
-        _observer.date = str(self.universal_epoch+time_delta)
-
-        # Compute the satellite position
-        _satellite.compute(_observer)
-
-        # Get the x, y, z coordinates
-        r = _satellite.range  # Distance to satellite in meters
-        alt = _satellite.alt  # Altitude in radians
-        az = _satellite.az    # Azimuth in radians
-
-        # Convert spherical coordinates (range, altitude, azimuth) to Cartesian coordinates (x, y, z)
-        x = r * math.cos(alt) * math.cos(az)
-        y = r * math.cos(alt) * math.sin(az)
-        z = r * math.sin(alt)
-
+        x, y, z = self.satellite_positions_m(time_delta)[sid].tolist()
         return x, y, z
 
     def euclidean_distance_between_sat_m(
@@ -221,51 +423,75 @@ class LEOSatelliteTopology(ABC):
         tuple[float, bool]
             (Distance in meters, if satellites in ISL range)
         """
+        return self.euclidean_distance_between_sat_m(sid_a, sid_b, time_delta)
 
-        # Create an observer somewhere on the planet
-        observer = ephem.Observer()
-        observer.epoch = str(self.universal_epoch)
-        observer.date = str(self.universal_epoch+time_delta)
-        observer.lat = '0'
-        observer.lon = '0'
-        # lat, long = self.satellites[sid_a].nadir()
-        # observer.lat, observer.lon = str(lat), str(long)
-        observer.elevation = 0
-
-        # Calculate the relative location of the satellites to this observer
-        _satellite_a = self.satellites[sid_a].get_satellite()
-        _satellite_b = self.satellites[sid_b].get_satellite()
-
-        _satellite_a.compute(observer)
-        _satellite_b.compute(observer)
-
-        # print('_satellite_a', round(_satellite_a.range/1000, 1), 'km')
-        # print('_satellite_b', round(_satellite_b.range/1000, 1), 'km')
-
-        # Calculate the angle observed by the observer to the satellites (this is done because the .compute() calls earlier)
-        angle_radians = float(
-            repr(ephem.separation(_satellite_a, _satellite_b))
-        )
-        # print('Angle C:', math.degrees(angle_radians))
-
-        # Now we have a triangle with three knows:
-        # (1) a = sat1.range (distance observer to satellite 1)
-        # (2) b = sat2.range (distance observer to satellite 2)
-        # (3) C = angle (the angle at the observer point within the triangle)
-        #
-        # Using the formula:
-        # c^2 = a^2 + b^2 - 2 * a * b * cos(C)
-        #
-        # This gives us side c, the distance between the two satellites
-        distance_m = math.sqrt(
-            _satellite_a.range ** 2 + _satellite_b.range ** 2 -
-            (2 * _satellite_a.range * _satellite_b.range * math.cos(angle_radians))
+    def ISL_lengths_m(
+            self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculates the lengths of all the ISLs of this shell in meters and checks the range of the ISLs
+
+        Parameters
+        ----------
+        time_delta : TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            (E, 2) array of ISLs (sid_a, sid_b) in the iteration order of the ISL set, distances in meters, if satellites in ISL range
+        """
+
+        isls = np.array(list(self.isls), dtype=np.int64).reshape(-1, 2)
+        positions_m = self.satellite_positions_m(time_delta)
+
+        difference_m = positions_m[isls[:, 0]] - positions_m[isls[:, 1]]
+        distances_m = np.sqrt(np.sum(difference_m * difference_m, axis=1))
+
+        max_ISL_lengths_m = np.array(
+            [sat.max_ISL_length_m() for sat in self.satellites]
         )
+        in_ISL_range = (max_ISL_lengths_m[isls[:, 0]] >= distances_m) & \
+            (max_ISL_lengths_m[isls[:, 1]] >= distances_m)
 
-        in_ISL_range = self.satellites[sid_a].max_ISL_length_m(
-        ) >= distance_m and self.satellites[sid_b].max_ISL_length_m() >= distance_m
+        return isls, distances_m, in_ISL_range
 
-        return distance_m, in_ISL_range
+    @staticmethod
+    def terminal_position_m(terminal: TerminalCoordinates) -> np.ndarray:
+        """Computes the position of a user terminal in ECEF from its geodetic coordinates
+
+        Parameters
+        -------------
+        terminal: TerminalCoordinates
+            Location coordinates of a user terminal
+
+        Returns
+        ------------
+        np.ndarray
+            cartesian coordinates (x, y, z) in meters
+        """
+        return np.array(UserTerminal.geodetic_to_cartesian(
+            float(terminal.latitude_degree),
+            float(terminal.longitude_degree),
+            terminal.elevation_m
+        ))
+
+    @classmethod
+    def terminal_positions_m(cls, terminals: list[TerminalCoordinates]) -> np.ndarray:
+        """Computes the positions of user terminals in ECEF from their geodetic coordinates
+
+        Parameters
+        -------------
+        terminals: list[TerminalCoordinates]
+            Location coordinates of user terminals
+
+        Returns
+        ------------
+        np.ndarray
+            (M, 3) array of cartesian coordinates (x, y, z) in meters, row index is the terminal index
+        """
+        return np.array(
+            [cls.terminal_position_m(terminal) for terminal in terminals]
+        ).reshape(-1, 3)
 
     def distance_between_terminal_sat_m(
             self, terminal: TerminalCoordinates, sat: LEOSatellite, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
@@ -277,7 +503,7 @@ class LEOSatelliteTopology(ABC):
         terminal: TerminalCoordinates
             Location coordinates of a user terminal
         sat: LEOSatellite
-            LEO satellite
+            LEO satellite of this shell
         time_delta : float, optional
             Time passed from the epoch
 
@@ -287,23 +513,12 @@ class LEOSatelliteTopology(ABC):
             The distance between the ground station and the satellite in meters
         """
 
-        # Create an observer on the planet where the ground station is
-        observer = ephem.Observer()
-        observer.epoch = str(sat.epoch)
-        observer.date = str(sat.epoch+time_delta)
-
-        # Very important: string argument is in degrees.
-        # DO NOT pass a float as it is interpreted as radians
-        observer.lat = str(terminal.latitude_degree)
-        observer.lon = str(terminal.longitude_degree)
-        observer.elevation = terminal.elevation_m
-
-        # Compute distance from satellite to observer
-        _satellite = sat.get_satellite()
-        _satellite.compute(observer)
-
-        # Return distance
-        return _satellite.range
+        # Satellite IDs of a shell follows the catalog number
+        sid = sat.satellite_catalog_number - 1
+        return float(np.linalg.norm(
+            self.satellite_positions_m(time_delta)[sid] -
+            self.terminal_position_m(terminal)
+        ))
 
     def get_satellites_in_range(
             self, terminal: TerminalCoordinates, tid: int = -1, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
@@ -325,21 +540,177 @@ class LEOSatelliteTopology(ABC):
             User terminal ID (if given), List of satellite names, List of corresponding distance in meters
         """
 
-        visible_sats = list()
-        sats_range_m = list()
-        for sid, sat in enumerate(self.satellites):
-            distance_m = self.distance_between_terminal_sat_m(
-                terminal, sat, time_delta
+        (visible_sats, sats_range_m), = self.get_satellites_in_range_of_terminals(
+            [terminal], time_delta
+        )
+        return tid, visible_sats, sats_range_m
+
+    def get_satellites_in_range_of_terminals(
+            self, terminals: list[TerminalCoordinates], time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
+    ) -> list[tuple[list[str], list[float]]]:
+        """Generates lists of satellites of this shell in the range of each given user terminal.
+        Only the satellites inside the maximum GSL length (the spatial index query radius) of a terminal are examined
+
+        Parameters
+        ------
+        terminals: list[TerminalCoordinates]
+            User terminal coordinates (i.e., ground stations or flights)
+        time_delta: TimeDelta, optional
+            Time passed from epoch. Default value: TimeDelta(0.0 * u.nanosecond)
+
+        Returns
+        -------
+        list[tuple[list[str], list[float]]]
+            List of satellite names, List of corresponding distance in meters, list index is the terminal index
+        """
+
+        tids, sids, distances_m = self.satellites_in_range_index(
+            self.terminal_positions_m(terminals),
+            np.array([terminal.elevation_m for terminal in terminals], dtype=np.float64),
+            time_delta
+        )
+
+        # Pairs are ordered by terminal index
+        bounds = np.searchsorted(tids, np.arange(len(terminals)+1)).tolist()
+        sat_names = [self.encode_sat_name(sid) for sid in sids.tolist()]
+        distances_m = distances_m.tolist()
+
+        return [
+            (sat_names[bounds[tid]:bounds[tid+1]], distances_m[bounds[tid]:bounds[tid+1]])
+            for tid in range(len(terminals))
+        ]
+
+    def satellites_in_range_index(
+            self,
+            terminal_positions_m: np.ndarray,
+            elevations_m: np.ndarray,
+            time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the satellites of this shell in the range of each user terminal through the spatial index.
+        Only the satellites inside the maximum GSL length (the spatial index query radius) of a terminal are examined
+
+        Parameters
+        ------
+        terminal_positions_m: np.ndarray
+            (M, 3) array of cartesian coordinates (x, y, z) in meters of user terminals
+        elevations_m: np.ndarray
+            (M,) array of user terminal altitudes in meters
+        time_delta: TimeDelta, optional
+            Time passed from epoch. Default value: TimeDelta(0.0 * u.nanosecond)
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            Terminal indices, satellite IDs, and distances in meters of all the terminal-satellite pairs in range,
+            ordered by terminal index then satellite ID
+        """
+
+        positions_m = self.satellite_positions_m(time_delta)
+        elevations_m = np.asarray(elevations_m, dtype=np.float64)
+
+        # Longest GSL of the shell at each terminal altitude (with a margin of 1m for rounding)
+        query_radius_m = {
+            elevation_m: self.max_GSL_lengths_m(elevation_m).max() + 1.0
+            for elevation_m in set(elevations_m.tolist())
+        }
+        candidates = self.spatial_index(time_delta).query_ball_point(
+            terminal_positions_m,
+            r=[query_radius_m[elevation_m] for elevation_m in elevations_m.tolist()],
+            return_sorted=True
+        )
+
+        # Flatten the candidate terminal-satellite pairs
+        tids = np.repeat(
+            np.arange(len(terminal_positions_m)),
+            [len(_sids) for _sids in candidates]
+        )
+        sids = np.fromiter(
+            (sid for _sids in candidates for sid in _sids), dtype=np.int64, count=len(tids)
+        )
+        distances_m = np.linalg.norm(
+            positions_m[sids] - terminal_positions_m[tids], axis=1
+        )
+
+        # Maximum GSL length of each satellite at the terminal altitude
+        sat_altitude_m, tan_angle_of_elevation = self._satellite_GSL_geometry()
+        altitude_m = sat_altitude_m[sids] - elevations_m[tids]
+        coverage_cone_radius_m = altitude_m / tan_angle_of_elevation[sids]
+        max_GSL_length_m = np.sqrt(
+            np.power(coverage_cone_radius_m, 2) + np.power(altitude_m, 2)
+        )
+
+        # Out of range so GSL not possible
+        visible = distances_m <= max_GSL_length_m
+        return tids[visible], sids[visible], distances_m[visible]
+
+    def satellites_in_range_matrix(
+            self,
+            terminal_positions_m: np.ndarray,
+            elevations_m: np.ndarray,
+            time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond),
+            max_memory_bytes: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Computes the terminal x satellite range matrix of this shell with broadcasting and masks it with
+        the maximum GSL length of each satellite at the terminal altitude.
+        The matrix is computed in tiles of terminals so that a tile stays within the memory cap
+
+        Parameters
+        ------
+        terminal_positions_m: np.ndarray
+            (M, 3) array of cartesian coordinates (x, y, z) in meters of user terminals
+        elevations_m: np.ndarray
+            (M,) array of user terminal altitudes in meters
+        time_delta: TimeDelta, optional
+            Time passed from epoch. Default value: TimeDelta(0.0 * u.nanosecond)
+        max_memory_bytes: int | None, optional
+            Working memory cap of one tile (default VISIBILITY_MEMORY_BYTES)
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            Terminal indices, satellite IDs, and distances in meters of all the terminal-satellite pairs in range,
+            ordered by terminal index then satellite ID
+        """
+
+        positions_m = self.satellite_positions_m(time_delta)
+        elevations_m = np.asarray(elevations_m, dtype=np.float64)
+
+        sat_altitude_m, tan_angle_of_elevation = self._satellite_GSL_geometry()
+
+        if max_memory_bytes is None:
+            max_memory_bytes = self.VISIBILITY_MEMORY_BYTES
+
+        # About six (tile, N) float64 arrays are alive per tile
+        tile_size = max(
+            1, int(max_memory_bytes // (6 * 8 * max(1, len(self.satellites))))
+        )
+
+        tids, sids, distances_m = list(), list(), list()
+        for start in range(0, len(terminal_positions_m), tile_size):
+            tile_positions_m = terminal_positions_m[start:start+tile_size]
+            tile_elevations_m = elevations_m[start:start+tile_size]
+
+            distance_m = np.linalg.norm(
+                positions_m[np.newaxis, :, :] - tile_positions_m[:, np.newaxis, :], axis=2
+            )
+
+            # Maximum GSL length of each satellite at the terminal altitude (tile, N)
+            altitude_m = sat_altitude_m[np.newaxis, :] - tile_elevations_m[:, np.newaxis]
+            coverage_cone_radius_m = altitude_m / tan_angle_of_elevation
+            max_GSL_length_m = np.sqrt(
+                np.power(coverage_cone_radius_m, 2) + np.power(altitude_m, 2)
             )
 
             # Out of range so GSL not possible
-            if distance_m > sat.max_GSL_length_m(terminal.elevation_m):
-                continue
+            tile_tids, tile_sids = np.nonzero(distance_m <= max_GSL_length_m)
+            tids.append(tile_tids + start)
+            sids.append(tile_sids)
+            distances_m.append(distance_m[tile_tids, tile_sids])
 
-            visible_sats.append(self.encode_sat_name(sid))
-            sats_range_m.append(distance_m)
+        if len(tids) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
 
-        return tid, visible_sats, sats_range_m
+        return np.concatenate(tids), np.concatenate(sids), np.concatenate(distances_m)
 
     @property
     def name(self) -> str:
@@ -435,8 +806,8 @@ class LEOSatelliteTopology(ABC):
             Satellite details
         """
 
-        latitude, longitude, elevation_m = self.satellites[sid].nadir(
-            time_delta)
+        latitude, longitude, elevation_m = self.satellite_nadirs(
+            time_delta)[sid].tolist()
 
         # Nadir altitude comes with few km of error
         # So updated with actual altitude input paramater
@@ -0,0 +1,403 @@
+import math
+from typing import Iterable
+
+import numpy as np
+from astropy import units as u
+from astropy.time import Time, TimeDelta
+
+
+class ShellPropagator:
+    """
+    Vectorized SGP4 propagator for a group of satellites (i.e., all the satellites of a shell)
+
+    - Propagates all the satellites at a given time in one call
+    - Propagates all the satellites at multiple time steps in one call (T, N, 3)
+    - Computes satellite positions in ECEF (N, 3) and nadir (latitude, longitude, elevation)
+
+    Follows the near-Earth SGP4 model used by ephem (libastro) for the TLEs generated by LEOSatellite,
+    i.e., circular orbits without drag (BSTAR = 0), so that positions stay consistent with the ephem computations.
+
+
+    Reference:
+    [1] Hoots FR, Roehrich RL. Models for propagation of NORAD element sets. Spacetrack Report No. 3, 1980.
+    [2] https://github.com/brandon-rhodes/pyephem/tree/master/libastro
+    """
+
+    # SGP4 constants (WGS72)
+    XKE: float = 0.0743669161
+    XJ2: float = 1.082616e-3
+    XJ3: float = -0.253881e-5
+    XJ4: float = -1.65597e-6
+    CK2: float = 0.5 * XJ2
+    CK4: float = -0.375 * XJ4
+    A3OVK2: float = -XJ3 / CK2
+
+    # Earth radius (m) per SGP4 distance unit and Earth model of the site/nadir computation (libastro)
+    EARTH_RADIUS_M: float = 6378160.0
+    EARTH_FLATTENING: float = 1/298.25
+
+    # Sidereal day rate
+    SIDEREAL_SOLAR: float = 1.0027379093
+
+    # Julian date of 1899-12-31 00:00:00 (reference day of the sidereal time in libastro)
+    JD_REFERENCE: float = 2415019.5
+
+    MINUTES_PER_DAY: float = 1440.0
+
+    # Approximate number of (T, N) float64 arrays alive during one propagation pass
+    WORKSPACE_ARRAYS: int = 40
+
+    def __init__(
+        self,
+        epoch: Time,
+        inclination_degree: list[float],
+        raan_degree: list[float],
+        mean_anomaly_degree: list[float],
+        mean_motion_rev_per_day: list[float],
+        eccentricity: list[float],
+        arg_of_perigee_degree: list[float]
+    ) -> None:
+        """Create a propagator and initialize the secular rates of all the satellites
+
+        Parameters
+        ----------
+        epoch: Time
+            Epoch of the TLEs
+        inclination_degree: list[float]
+            Angle of inclination in degree of each satellite
+        raan_degree: list[float]
+            Right Ascension of the Ascending Node (RAAN) in degree of each satellite
+        mean_anomaly_degree: list[float]
+            Mean anomaly in degree of each satellite
+        mean_motion_rev_per_day: list[float]
+            Mean motion in revolutions per day of each satellite
+        eccentricity: list[float]
+            Eccentricity of each satellite
+        arg_of_perigee_degree: list[float]
+            Argument of perigee in degree of each satellite
+        """
+
+        self.epoch = epoch
+
+        # Days from the reference day to the epoch (read as UT, same as ephem)
+        self._epoch_day = epoch.jd1 - self.JD_REFERENCE + epoch.jd2
+
+        # ephem stores the angular elements in single precision
+        self._inclination = self._single(np.radians(self._single(inclination_degree)))
+        self._raan = self._single(np.radians(self._single(raan_degree)))
+        self._mean_anomaly = self._single(np.radians(self._single(mean_anomaly_degree)))
+        self._arg_of_perigee = self._single(np.radians(self._single(arg_of_perigee_degree)))
+        self._eccentricity = self._single(eccentricity)
+        mean_motion = np.asarray(
+            mean_motion_rev_per_day, dtype=np.float64
+        ) * (2*math.pi/self.MINUTES_PER_DAY)
+
+        self._init_secular_rates(mean_motion)
+
+    @staticmethod
+    def _single(values: list[float] | np.ndarray) -> np.ndarray:
+        'Round to single precision and return as double array'
+        return np.asarray(values, dtype=np.float32).astype(np.float64)
+
+    def _init_secular_rates(self, mean_motion: np.ndarray) -> None:
+        'Recover original mean motion, semi-major axis and compute the secular gravity rates'
+
+        self._cosio = np.cos(self._inclination)
+        self._sinio = np.sin(self._inclination)
+        theta2 = self._cosio * self._cosio
+        theta4 = theta2 * theta2
+        self._x3thm1 = 3.0 * theta2 - 1.0
+        self._x1mth2 = 1.0 - theta2
+        self._x7thm1 = 7.0 * theta2 - 1.0
+
+        betao2 = 1.0 - self._eccentricity * self._eccentricity
+        betao = np.sqrt(betao2)
+
+        a1 = np.power(self.XKE / mean_motion, 2.0/3.0)
+        del1 = 1.5 * self.CK2 * self._x3thm1 / (a1 * a1 * betao * betao2)
+        ao = a1 * (1.0 - del1 * (1.0/3.0 + del1 * (1.0 + 134.0/81.0 * del1)))
+        delo = 1.5 * self.CK2 * self._x3thm1 / (ao * ao * betao * betao2)
+        xnodp = mean_motion / (1.0 + delo)
+        self._aodp = ao / (1.0 - delo)
+
+        pinvsq = 1.0 / (self._aodp * self._aodp * betao2 * betao2)
+        temp1 = 3.0 * self.CK2 * pinvsq * xnodp
+        temp2 = temp1 * self.CK2 * pinvsq
+        temp3 = 1.25 * self.CK4 * pinvsq * pinvsq * xnodp
+
+        # Secular rates (radians/minute) of mean anomaly, argument of perigee and RAAN
+        self._xmdot = xnodp + 0.5 * temp1 * betao * self._x3thm1 + \
+            0.0625 * temp2 * betao * (13.0 - 78.0 * theta2 + 137.0 * theta4)
+        self._omgdot = -0.5 * temp1 * (1.0 - 5.0 * theta2) + \
+            0.0625 * temp2 * (7.0 - 114.0 * theta2 + 395.0 * theta4) + \
+            temp3 * (3.0 - 36.0 * theta2 + 49.0 * theta4)
+        self._xnodot = -temp1 * self._cosio + \
+            (0.5 * temp2 * (4.0 - 19.0 * theta2) +
+             2.0 * temp3 * (3.0 - 7.0 * theta2)) * self._cosio
+
+        # Long period periodics coefficients
+        self._xlcof = 0.125 * self.A3OVK2 * self._sinio * \
+            (3.0 + 5.0 * self._cosio) / (1.0 + self._cosio)
+        self._aycof = 0.25 * self.A3OVK2 * self._sinio
+
+    @property
+    def size(self) -> int:
+        'Number of satellites'
+        return len(self._inclination)
+
+    @staticmethod
+    def time_delta_s(time_delta: TimeDelta) -> float:
+        """Converts time delta into seconds rounded to nanosecond
+
+        Parameters
+        ----------
+        time_delta: TimeDelta
+            Time passed from the epoch
+
+        Returns
+        -------
+        float
+            Second(s)
+        """
+        return round(float(time_delta.to_value(u.second)), 9)
+
+    @classmethod
+    def time_deltas_s(cls, time_deltas: Iterable[TimeDelta | float]) -> np.ndarray:
+        """Converts a series of time deltas into seconds rounded to nanosecond
+
+        Parameters
+        ----------
+        time_deltas: Iterable[TimeDelta | float]
+            Time passed from the epoch, plain numbers are read as seconds (e.g., range(200))
+
+        Returns
+        -------
+        np.ndarray
+            (T,) array of second(s)
+        """
+        return np.array([
+            cls.time_delta_s(time_delta) if isinstance(time_delta, TimeDelta)
+            else round(float(time_delta), 9)
+            for time_delta in time_deltas
+        ], dtype=np.float64)
+
+    def eci_positions_m(self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)) -> np.ndarray:
+        """Computes the positions of all the satellites in the inertial frame (TEME) at given time
+
+        Parameters
+        ----------
+        time_delta: TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of (x, y, z) in meters
+        """
+        return self._eci_positions_m(
+            np.array([self.time_delta_s(time_delta)])
+        )[0]
+
+    def _eci_positions_m(self, times_s: np.ndarray) -> np.ndarray:
+        'Propagates all the satellites at T time steps (seconds from the epoch) into a (T, N, 3) array'
+
+        # (T, 1) minutes since epoch, broadcast against (N,) elements
+        tsince = times_s.reshape(-1, 1) / 60.0
+
+        # Update for secular gravity (no drag)
+        xmdf = self._mean_anomaly + self._xmdot * tsince
+        omega = self._arg_of_perigee + self._omgdot * tsince
+        xnode = self._raan + self._xnodot * tsince
+        a = self._aodp
+        e = self._eccentricity
+        xl = xmdf + omega + xnode
+        beta = np.sqrt(1.0 - e * e)
+
+        # Long period periodics
+        axn = e * np.cos(omega)
+        temp = 1.0 / (a * beta * beta)
+        xlt = xl + temp * self._xlcof * axn
+        ayn = e * np.sin(omega) + temp * self._aycof
+
+        # Solve Kepler's equation
+        capu = np.fmod(xlt - xnode, 2*math.pi)
+        epw = capu
+        for _ in range(10):
+            sinepw = np.sin(epw)
+            cosepw = np.cos(epw)
+            delta = (capu - ayn * cosepw + axn * sinepw - epw) / \
+                (1.0 - axn * cosepw - ayn * sinepw)
+            epw = epw + delta
+            if np.all(np.abs(delta) <= 1.0e-12):
+                break
+        sinepw = np.sin(epw)
+        cosepw = np.cos(epw)
+
+        # Short period preliminary quantities
+        ecose = axn * cosepw + ayn * sinepw
+        esine = axn * sinepw - ayn * cosepw
+        elsq = axn * axn + ayn * ayn
+        pl = a * (1.0 - elsq)
+        r = a * (1.0 - ecose)
+        betal = np.sqrt(1.0 - elsq)
+        temp3 = 1.0 / (1.0 + betal)
+        cosu = a / r * (cosepw - axn + ayn * esine * temp3)
+        sinu = a / r * (sinepw - ayn - axn * esine * temp3)
+        uu = np.arctan2(sinu, cosu)
+        sin2u = 2.0 * sinu * cosu
+        cos2u = 2.0 * cosu * cosu - 1.0
+        temp1 = self.CK2 / pl
+        temp2 = temp1 / pl
+
+        # Update for short periodics
+        rk = r * (1.0 - 1.5 * temp2 * betal * self._x3thm1) + \
+            0.5 * temp1 * self._x1mth2 * cos2u
+        uk = uu - 0.25 * temp2 * self._x7thm1 * sin2u
+        xnodek = xnode + 1.5 * temp2 * self._cosio * sin2u
+        xinck = self._inclination + 1.5 * temp2 * self._cosio * self._sinio * cos2u
+
+        # Orientation vectors
+        sinuk = np.sin(uk)
+        cosuk = np.cos(uk)
+        sinik = np.sin(xinck)
+        cosik = np.cos(xinck)
+        sinnok = np.sin(xnodek)
+        cosnok = np.cos(xnodek)
+
+        ux = -sinnok * cosik * sinuk + cosnok * cosuk
+        uy = cosnok * cosik * sinuk + sinnok * cosuk
+        uz = sinik * sinuk
+
+        return np.stack((rk * ux, rk * uy, rk * uz), axis=-1) * self.EARTH_RADIUS_M
+
+    def sidereal_angle_rad(self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)) -> float:
+        """Computes the Greenwich sidereal angle at given time
+
+        Parameters
+        ----------
+        time_delta: TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        float
+            Angle in radians
+        """
+        return float(self._sidereal_angles_rad(
+            np.array([self.time_delta_s(time_delta)])
+        )[0])
+
+    def _sidereal_angles_rad(self, times_s: np.ndarray) -> np.ndarray:
+        'Computes the Greenwich sidereal angles at T time steps (seconds from the epoch)'
+
+        crnt_day = self._epoch_day + times_s/86400.0
+        sid_day = np.floor(crnt_day)
+
+        T = (sid_day - 0.5)/36525
+        sid_reference = (6.6460656 + 2400.051262*T + 0.00002581*T*T)/24
+        sid_reference -= np.floor(sid_reference)
+
+        return 2*math.pi*((crnt_day - sid_day)*self.SIDEREAL_SOLAR + sid_reference)
+
+    def ecef_positions_m(self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)) -> np.ndarray:
+        """Computes the positions of all the satellites in ECEF at given time
+
+        Parameters
+        ----------
+        time_delta: TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of (x, y, z) in meters
+        """
+        return self.ecef_positions_batch_m(
+            np.array([self.time_delta_s(time_delta)])
+        )[0]
+
+    def ecef_positions_batch_m(self, times_s: np.ndarray) -> np.ndarray:
+        """Computes the positions of all the satellites in ECEF at multiple time steps in one pass
+
+        Parameters
+        ----------
+        times_s: np.ndarray
+            (T,) array of time passed from the epoch in seconds
+
+        Returns
+        -------
+        np.ndarray
+            (T, N, 3) array of (x, y, z) in meters
+        """
+
+        times_s = np.asarray(times_s, dtype=np.float64)
+        eci = self._eci_positions_m(times_s)
+        theta = self._sidereal_angles_rad(times_s).reshape(-1, 1)
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+
+        return np.stack((
+            cos_theta * eci[:, :, 0] + sin_theta * eci[:, :, 1],
+            -sin_theta * eci[:, :, 0] + cos_theta * eci[:, :, 1],
+            eci[:, :, 2]
+        ), axis=-1)
+
+    def steps_per_chunk(self, max_memory_bytes: int) -> int:
+        """Number of time steps that can be propagated in one pass within a memory budget
+
+        Parameters
+        ----------
+        max_memory_bytes: int
+            Upper bound of the working memory of one pass in bytes
+
+        Returns
+        -------
+        int
+            Time steps per pass (at least 1)
+        """
+        return max(
+            1, int(max_memory_bytes // (self.WORKSPACE_ARRAYS * 8 * max(1, self.size)))
+        )
+
+    @classmethod
+    def ecef_to_nadir(cls, positions_m: np.ndarray) -> np.ndarray:
+        """Converts ECEF positions to satellite shadow/nadir (latitude, longitude, elevation in meter)
+
+        Parameters
+        ----------
+        positions_m: np.ndarray
+            (N, 3) array of (x, y, z) in meters
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of (latitude, longitude, elevation in meter)
+        """
+
+        x, y, z = positions_m[:, 0], positions_m[:, 1], positions_m[:, 2]
+        r = np.sqrt(x*x + y*y + z*z)
+
+        latitude = np.arctan(z/np.sqrt(x*x + y*y))
+        longitude = np.arctan2(y, x)
+        elevation_m = r - cls.EARTH_RADIUS_M*np.sqrt(
+            1 - (2*cls.EARTH_FLATTENING - cls.EARTH_FLATTENING**2) *
+            np.sin(latitude)**2
+        )
+
+        return np.stack(
+            (np.degrees(latitude), np.degrees(longitude), elevation_m), axis=-1
+        )
+
+    def nadir(self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)) -> np.ndarray:
+        """Calculates satellite shadow/nadir of all the satellites at given time
+
+        Parameters
+        ----------
+        time_delta: TimeDelta, optional
+            Time passed from the epoch
+
+        Returns
+        -------
+        np.ndarray
+            (N, 3) array of (latitude, longitude, elevation in meter)
+        """
+        return self.ecef_to_nadir(self.ecef_positions_m(time_delta))
@@ -1,9 +1,12 @@
 import math
+from collections import OrderedDict
 
 import ephem
 from astropy import units as u
 from astropy.time import Time, TimeDelta
 
+from LEOCraft.satellite_topology.propagator import ShellPropagator
+
 
 class LEOSatellite:
     """
@@ -31,6 +34,9 @@ class LEOSatellite:
     ECCENTRICITY: float = 0.0000001
     ARG_OF_PERIGEE_DEGREE: float = 0.0
 
+    # Maximum number of time deltas of which the nadir is memoized (least recently used are evicted)
+    NADIR_CACHE_SIZE: int = 128
+
     def __init__(
         self,
         altitude_m: float,
@@ -102,25 +108,77 @@ class LEOSatellite:
         self.tle_line_2: str
         self.title_line: str
 
+        # Propagation cache
+        # Parsed ephem instance of the TLE (built on first use)
+        self._ephem_satellite: ephem.EarthSatellite | None = None
+        # Nadir memo with key: time delta in seconds
+        self._nadir_cache: OrderedDict[float, tuple[float, float, float]] = OrderedDict()
+        # Vectorized SGP4 propagator of the satellite (built on first nadir)
+        self._propagator: ShellPropagator | None = None
+
+    def __getstate__(self) -> dict:
+        'Drops the parsed ephem instance (not picklable) while sending the satellite to a worker process'
+        state = self.__dict__.copy()
+        state['_ephem_satellite'] = None
+        return state
+
     def get_satellite(self) -> ephem.EarthSatellite:
-        """Get ephem instance
+        """Get ephem instance, the TLE is parsed once and the instance is reused
 
         Returns
         -------
         ephem.EarthSatellite
             ephem build with TLE
         """
-        return ephem.readtle(self.title_line, self.tle_line_1, self.tle_line_2)
+        if self._ephem_satellite is None:
+            self._ephem_satellite = ephem.readtle(
+                self.title_line, self.tle_line_1, self.tle_line_2
+            )
+        return self._ephem_satellite
 
     def build(self) -> None:
         "Create TLE of the satellite and epoch"
 
         self._build_TLE()
+        self.clear_cache()
+
         epoch_year = self.tle_line_1[18:20]
         epoch_day = float(self.tle_line_1[20:32])
         self.epoch = Time("20" + epoch_year + "-01-01 00:00:00",
                           scale="tdb") + (epoch_day - 1) * u.day
 
+    @property
+    def propagator(self) -> ShellPropagator:
+        """Get the SGP4 propagator of the satellite, built once on first use
+
+        Returns
+        -------
+        ShellPropagator
+            Propagator built from the orbital elements of the satellite
+        """
+        if self._propagator is None:
+            self._propagator = ShellPropagator(
+                self.epoch, *zip(self.orbital_elements())
+            )
+        return self._propagator
+
+    def orbital_elements(self) -> tuple[float, float, float, float, float, float]:
+        """Get the orbital elements with the precision of the TLE
+
+        Returns
+        -------
+        tuple[float, float, float, float, float, float]
+            Inclination, RAAN, mean anomaly in degree, mean motion in rev/day, eccentricity, argument of perigee in degree
+        """
+        return (
+            round(self.inclination_degree, 4),
+            round(self.raan_degree, 4),
+            round(self.mean_anomaly_degree, 4),
+            round(self.MEAN_MOTION_REV_PER_DAY, 8),
+            round(self.ECCENTRICITY, 7),
+            round(self.ARG_OF_PERIGEE_DEGREE, 4)
+        )
+
     def nadir(
         self, time_delta: TimeDelta = TimeDelta(0.0 * u.nanosecond)
     ) -> tuple[float, float, float]:
@@ -137,12 +195,28 @@ class LEOSatellite:
             (latitude, longitude, elevation in meter)
         """
 
-        _satellite = self.get_satellite()
-        _satellite.compute(
-            str(self.epoch+time_delta),
-            epoch=str(self.epoch)
+        time_s = ShellPropagator.time_delta_s(time_delta)
+
+        if time_s in self._nadir_cache:
+            self._nadir_cache.move_to_end(time_s)
+            return self._nadir_cache[time_s]
+
+        latitude, longitude, elevation_m = self.propagator.nadir(time_delta)[0]
+        self._nadir_cache[time_s] = (
+            float(latitude), float(longitude), float(elevation_m)
         )
-        return math.degrees(_satellite.sublat), math.degrees(_satellite.sublong),  _satellite.elevation
+
+        # Evict the least recently used time delta
+        if len(self._nadir_cache) > self.NADIR_CACHE_SIZE:
+            self._nadir_cache.popitem(last=False)
+
+        return self._nadir_cache[time_s]
+
+    def clear_cache(self) -> None:
+        "Clears the parsed ephem instance, propagator and memoized nadirs (i.e., after the TLE is rebuilt)"
+        self._ephem_satellite = None
+        self._propagator = None
+        self._nadir_cache.clear()
 
     def _build_TLE(self) -> None:
         'Create TLE three line'
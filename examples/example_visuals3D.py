@@ -87,7 +87,6 @@ leo_con.generate_routes()
 # )
 
 # leo_con.routes = dict()
-# leo_con.link_load = dict()
 # leo_con.no_path_found = set()
 # leo_con.k_path_not_found = set()
 
@@ -69,7 +69,6 @@ compute_status, flow, k_path = k_shortest_paths(
 )
 
 leo_con.routes = dict()
-leo_con.link_load = dict()
 leo_con.no_path_found = set()
 leo_con.k_path_not_found = set()
 
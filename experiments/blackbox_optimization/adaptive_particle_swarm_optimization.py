@@ -213,7 +213,7 @@ def _cost_without_domain_knowledge(x: np.ndarray) -> float:
     _th = Throughput(_leo_con, TRAFFIC_METRICE)
     _th.v.verbose = False
     _th.build()
-    _th.compute()
+    warm_start_throughput.compute(_th)
 
     cost = -1 * _th.throughput_Gbps
     cache.add(key, cost)
@@ -265,7 +265,7 @@ def _cost_with_domain_knowledge(x: np.ndarray) -> float:
     _th = Throughput(_leo_con, TRAFFIC_METRICE)
     _th.v.verbose = False
     _th.build()
-    _th.compute()
+    warm_start_throughput.compute(_th)
 
     cost = -1 * _th.throughput_Gbps
     cache.add(key, cost)
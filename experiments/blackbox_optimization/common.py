@@ -4,6 +4,8 @@ It contains functions and classes that are used in multiple experiments.
 '''
 
 from LEOCraft.attenuation.fspl import FSPL
+from LEOCraft.performance.LP_solver import LPSolver
+from LEOCraft.performance.throughput_LP import ThroughputLP
 
 
 def get_possible_oxn_arrangements(total_sat: int, min_sat_per_orbit: int) -> list[tuple[int, int]]:
@@ -44,6 +46,25 @@ class PerformanceCache:
         return self._cache.get(key)
 
 
+class WarmStartThroughput:
+    'Computes the throughput of each design from the LP of the previous design (ThroughputLP.WARM_START_MODE)'
+
+    def __init__(self) -> None:
+        # Only the LP solver of the previous design, not its constellation
+        self._solver: LPSolver | None = None
+
+    def compute(self, th: ThroughputLP) -> None:
+        th.WARM_START_MODE = True
+        if self._solver is not None:
+            th.solver = self._solver
+        th.compute()
+        self._solver = th.solver
+
+
+# One per process (e.g., workers of the optimizers)
+warm_start_throughput = WarmStartThroughput()
+
+
 def get_loss_model() -> FSPL:
     'Path loass model'
 
@@ -0,0 +1,149 @@
+'''
+This script benchmarks the LP solver backends of the throughput (`LEOCraft.performance.LP_solver`)
+on the bundled traffic matrices over Starlink shell 1.
+
+For each traffic matrix, the same LP (same routes and link capacities) is solved by each backend,
+the throughput, accommodated flow and route class selection are compared with the first backend (Gurobi)
+and the solve time is logged.
+'''
+
+import time
+
+from LEOCraft.attenuation.fspl import FSPL
+from LEOCraft.constellations.LEO_aviation_constellation import \
+    LEOAviationConstellation
+from LEOCraft.constellations.LEO_constellation import LEOConstellation
+from LEOCraft.dataset import (FlightOnAir, GroundStationAtCities,
+                              InternetTrafficAcrossCities,
+                              InternetTrafficOnAir)
+from LEOCraft.performance.aviation.throughput import \
+    Throughput as AviationThroughput
+from LEOCraft.performance.basic.throughput import Throughput
+from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
+from LEOCraft.user_terminals.aircraft import Aircraft
+from LEOCraft.user_terminals.ground_station import GroundStation
+from LEOCraft.utilities import CSV_logger
+
+K = 5
+LP_SOLVERS = ['gurobi', 'highs', 'garg_konemann']
+
+# Traffic matrix: (ground stations, with flights)
+TRAFFIC_METRICS = {
+    'POP_GDP_100': (InternetTrafficAcrossCities.POP_GDP_100, GroundStationAtCities.TOP_100, False),
+    'ONLY_POP_100': (InternetTrafficAcrossCities.ONLY_POP_100, GroundStationAtCities.TOP_100, False),
+    'COUNTRY_CAPITALS_ONLY_POP': (
+        InternetTrafficAcrossCities.COUNTRY_CAPITALS_ONLY_POP, GroundStationAtCities.COUNTRY_CAPITALS, False
+    ),
+    'ONLY_POP_100_300Kbps': (InternetTrafficOnAir.ONLY_POP_100_300Kbps, GroundStationAtCities.TOP_100, True),
+    'ONLY_POP_100_5Mbps': (InternetTrafficOnAir.ONLY_POP_100_5Mbps, GroundStationAtCities.TOP_100, True),
+}
+
+
+def create_constellation(ground_stations: str, flights: bool) -> LEOConstellation | LEOAviationConstellation:
+    '''
+
+    Params
+    ------
+    ground_stations: str
+        Path of the ground stations CSV
+    flights: bool
+        Add the flight terminals
+
+    Returns
+    -------
+    LEOConstellation | LEOAviationConstellation
+        Routed constellation
+    '''
+
+    loss_model = FSPL(28.5*1000000000, 98.4, 0.5*1000000000, 13.6)
+    loss_model.set_Tx_antenna_gain(gain_dB=34.5)
+
+    if flights:
+        leo_con = LEOAviationConstellation('LEOCON')
+        leo_con.add_aircrafts(
+            Aircraft(
+                replaced_gs_csv=FlightOnAir.FLIGHT_REPLACED_TERMINALS,
+                flight_cluster_csv=FlightOnAir.FLIGHTS_CLUSTERS
+            )
+        )
+    else:
+        leo_con = LEOConstellation('LEOCON')
+    leo_con.k = K
+    leo_con.v.verbose = False
+    leo_con.add_ground_stations(GroundStation(ground_stations))
+    leo_con.add_shells(
+        PlusGridShell(
+            id=0,
+            orbits=72,
+            sat_per_orbit=22,
+            altitude_m=550000.0,
+            inclination_degree=53.0,
+            angle_of_elevation_degree=25.0,
+            phase_offset=50.0
+        )
+    )
+    leo_con.set_time()
+    leo_con.set_loss_model(loss_model)
+    leo_con.build()
+    leo_con.create_network_graph()
+    leo_con.generate_routes()
+    return leo_con
+
+
+def benchmark(name: str, tm_path: str, ground_stations: str, flights: bool) -> None:
+    '''
+
+    Params
+    ------
+    name: str
+        Name of the traffic matrix
+    tm_path: str
+        Path of the traffic matrix
+    ground_stations: str
+        Path of the ground stations CSV
+    flights: bool
+        Traffic matrix of the flight terminals
+    '''
+
+    leo_con = create_constellation(ground_stations, flights)
+
+    reference = None
+    for lp_solver in LP_SOLVERS:
+        th = AviationThroughput(leo_con, tm_path) if flights else Throughput(leo_con, tm_path)
+        th.v.verbose = False
+        th.LP_SOLVER = lp_solver
+        th.build()
+
+        start_time = time.perf_counter()
+        th.compute()
+        solve_s = time.perf_counter() - start_time
+
+        if reference is None:
+            reference = th
+        print(f'''|- {name} {lp_solver}: throughput {round(th.throughput_Gbps, 3)} Gbps ({
+            round(th.throughput_Gbps - reference.throughput_Gbps, 6)} to {LP_SOLVERS[0]}) in {round(solve_s, 3)}s''')
+
+        CSV_logger(
+            {
+                'traffic_metrics': name,
+                'lp_solver': lp_solver,
+                'k': K,
+                'flows': len(leo_con.route_store),
+                'throughput_Gbps': th.throughput_Gbps,
+                'throughput_difference_Gbps': th.throughput_Gbps - reference.throughput_Gbps,
+                'throughput_upper_bound_Gbps': th.throughput_upper_bound_Gbps,
+                'total_accommodated_flow': th.total_accommodated_flow,
+                'NS_selt': th.NS_selt,
+                'EW_selt': th.EW_selt,
+                'NESW_selt': th.NESW_selt,
+                'HG_selt': th.HG_selt,
+                'LG_selt': th.LG_selt,
+                'compute_s': solve_s
+            },
+            'LPSolverBenchmark.csv'
+        )
+
+
+if __name__ == '__main__':
+    for name, (tm_path, ground_stations, flights) in TRAFFIC_METRICS.items():
+        benchmark(name, tm_path, ground_stations, flights)
@@ -0,0 +1,128 @@
+'''
+This script benchmarks the A* spur searches (`LEOCraft.routing.a_star`) against Dijkstra on Starlink sized shells.
+
+For each shell, Delhi to New-York and random ground station to ground station flows are routed
+by A* (straight-line distance heuristic to the satellites of the destination) and by the same engine without heuristic (Dijkstra),
+the routes are checked to be identical and the nodes expanded and the mean time per flow are logged.
+'''
+
+import random
+import time
+
+from LEOCraft.constellations.LEO_constellation import LEOConstellation
+from LEOCraft.dataset import GroundStationAtCities
+from LEOCraft.routing.a_star import AStarKShortestPaths
+from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
+from LEOCraft.user_terminals.ground_station import GroundStation
+from LEOCraft.utilities import CSV_logger
+
+K = 20
+FLOWS = 50
+
+# Delhi to New-York
+SOURCE_GID = 1
+DESTINATION_GID = 9
+
+SHELLS = {
+    'Starlink_S1': dict(
+        orbits=72, sat_per_orbit=22, altitude_m=550000.0,
+        inclination_degree=53.0, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+    'Starlink_S2': dict(
+        orbits=72, sat_per_orbit=22, altitude_m=540000.0,
+        inclination_degree=53.2, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+    'Starlink_S3': dict(
+        orbits=36, sat_per_orbit=20, altitude_m=570000.0,
+        inclination_degree=70.0, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+}
+
+
+def benchmark(name: str, shell: dict) -> None:
+    '''
+
+    Params
+    ------
+    name: str
+        Name of the shell
+    shell: dict
+        Parameters of the +Grid shell
+    '''
+
+    leo_con = LEOConstellation('LEOCON')
+    leo_con.k = K
+    leo_con.v.verbose = False
+    leo_con.add_ground_stations(
+        GroundStation(GroundStationAtCities.TOP_100)
+    )
+    leo_con.add_shells(PlusGridShell(id=0, **shell))
+    leo_con.set_time()
+    leo_con.set_loss_model(None)
+    leo_con.build()
+    leo_con.create_network_graph()
+
+    engines = {
+        'a_star': leo_con.a_star_engine,
+        'dijkstra': AStarKShortestPaths(
+            leo_con.network_graph, leo_con.satellite_count,
+            leo_con.a_star_engine.satellite_positions_m, heuristic=False
+        )
+    }
+
+    # Delhi to New-York then random flows between the ground stations under coverage
+    random.seed(0)
+    gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+    flows = [(SOURCE_GID, DESTINATION_GID)] + [
+        tuple(random.sample(gids, 2)) for _ in range(FLOWS)
+    ]
+
+    time_s = {engine: 0 for engine in engines}
+    long_flow_nodes_expanded = dict()
+    mismatch = 0
+    for sgid, dgid in flows:
+        flow = (
+            leo_con.ground_stations.encode_name(sgid), list(leo_con.gsls[sgid]),
+            leo_con.ground_stations.encode_name(dgid), list(leo_con.gsls[dgid]),
+            K
+        )
+
+        routes = dict()
+        for engine_name, engine in engines.items():
+            start_time = time.perf_counter()
+            routes[engine_name] = engine.k_shortest_paths(*flow)
+            time_s[engine_name] += time.perf_counter() - start_time
+
+        if (sgid, dgid) == (SOURCE_GID, DESTINATION_GID):
+            long_flow_nodes_expanded = {
+                engine_name: engine.nodes_expanded for engine_name, engine in engines.items()
+            }
+
+        if routes['a_star'] != routes['dijkstra']:
+            mismatch += 1
+            print(f'|- Mismatch: {flow[0]} to {flow[2]}')
+
+    print(f'''|- {name}: Delhi to New-York nodes expanded A* {long_flow_nodes_expanded['a_star']}, Dijkstra {
+        long_flow_nodes_expanded['dijkstra']}; all flows A* {engines['a_star'].nodes_expanded}, Dijkstra {
+        engines['dijkstra'].nodes_expanded}''')
+
+    CSV_logger(
+        {
+            'shell': name,
+            'k': K,
+            'flows': len(flows),
+            'long_flow_a_star_nodes_expanded': long_flow_nodes_expanded['a_star'],
+            'long_flow_dijkstra_nodes_expanded': long_flow_nodes_expanded['dijkstra'],
+            'a_star_nodes_expanded': engines['a_star'].nodes_expanded,
+            'dijkstra_nodes_expanded': engines['dijkstra'].nodes_expanded,
+            'a_star_s_per_flow': time_s['a_star']/len(flows),
+            'dijkstra_s_per_flow': time_s['dijkstra']/len(flows),
+            'mismatch': mismatch
+        },
+        'AStarBenchmark.csv'
+    )
+
+
+if __name__ == '__main__':
+    for name, shell in SHELLS.items():
+        benchmark(name, shell)
@@ -0,0 +1,110 @@
+'''
+This script benchmarks the native Yen K shortest paths engine (`LEOCraft.routing.k_shortest_paths`)
+against the Networkx based `k_shortest_paths` on Starlink sized shells.
+
+For each shell the same ground station to ground station flows are routed by both the engines,
+the routes are checked to be identical (same paths in the same order) and the mean time per flow is logged.
+'''
+
+import random
+import time
+
+from LEOCraft.constellations.LEO_constellation import LEOConstellation
+from LEOCraft.dataset import GroundStationAtCities
+from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
+from LEOCraft.user_terminals.ground_station import GroundStation
+from LEOCraft.utilities import CSV_logger, k_shortest_paths
+
+K = 20
+FLOWS = 50
+
+SHELLS = {
+    'Starlink_S1': dict(
+        orbits=72, sat_per_orbit=22, altitude_m=550000.0,
+        inclination_degree=53.0, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+    'Starlink_S2': dict(
+        orbits=72, sat_per_orbit=22, altitude_m=540000.0,
+        inclination_degree=53.2, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+    'Starlink_S3': dict(
+        orbits=36, sat_per_orbit=20, altitude_m=570000.0,
+        inclination_degree=70.0, angle_of_elevation_degree=25.0, phase_offset=50.0
+    ),
+}
+
+
+def benchmark(name: str, shell: dict) -> None:
+    '''
+
+    Params
+    ------
+    name: str
+        Name of the shell
+    shell: dict
+        Parameters of the +Grid shell
+    '''
+
+    leo_con = LEOConstellation('LEOCON')
+    leo_con.k = K
+    leo_con.v.verbose = False
+    leo_con.add_ground_stations(
+        GroundStation(GroundStationAtCities.TOP_100)
+    )
+    leo_con.add_shells(PlusGridShell(id=0, **shell))
+    leo_con.set_time()
+    leo_con.set_loss_model(None)
+    leo_con.build()
+    leo_con.create_network_graph()
+
+    # Random flows between the ground stations under coverage
+    random.seed(0)
+    gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+    flows = [tuple(random.sample(gids, 2)) for _ in range(FLOWS)]
+
+    networkx_time_s = native_time_s = 0
+    mismatch = 0
+    for sgid, dgid in flows:
+        source = leo_con.ground_stations.encode_name(sgid)
+        destination = leo_con.ground_stations.encode_name(dgid)
+
+        leo_con.connect_ground_station(source, destination)
+        start_time = time.perf_counter()
+        networkx_routes = k_shortest_paths(
+            leo_con.sat_net_graph, source, destination, K
+        )
+        networkx_time_s += time.perf_counter() - start_time
+        leo_con.disconnect_ground_station(source, destination)
+
+        start_time = time.perf_counter()
+        native_routes = leo_con.routing_engine.k_shortest_paths(
+            source, list(leo_con.gsls[sgid]),
+            destination, list(leo_con.gsls[dgid]),
+            K
+        )
+        native_time_s += time.perf_counter() - start_time
+
+        if networkx_routes != native_routes:
+            mismatch += 1
+            print(f'|- Mismatch: {source} to {destination}')
+
+    print(f'''|- {name}: Networkx {round(networkx_time_s/FLOWS, 4)}s/flow, native {
+        round(native_time_s/FLOWS, 4)}s/flow, speedup {round(networkx_time_s/native_time_s, 2)}x''')
+
+    CSV_logger(
+        {
+            'shell': name,
+            'k': K,
+            'flows': FLOWS,
+            'networkx_s_per_flow': networkx_time_s/FLOWS,
+            'native_s_per_flow': native_time_s/FLOWS,
+            'speedup': networkx_time_s/native_time_s,
+            'mismatch': mismatch
+        },
+        'KShortestPathsBenchmark.csv'
+    )
+
+
+if __name__ == '__main__':
+    for name, shell in SHELLS.items():
+        benchmark(name, shell)
@@ -72,64 +72,68 @@ RTT_CSV = 'telesat_t1/ping_tokyo_to_sydney_rtt.csv'
 PATH_CHANGE_CSV = 'telesat_t1/change_tokyo_to_sydney_path.csv'
 
 
-__last_path = None
-for second in range(200):
-
-    # Build the constellation
-    leo_con = LEOConstellation('LEOCON')
-    leo_con.v.verbose = True
-    leo_con.add_ground_stations(
-        GroundStation(
-            GroundStationAtCities.TOP_100
-            # GroundStationAtCities.TOP_1000
-        )
+# Build the constellation
+leo_con = LEOConstellation('LEOCON')
+leo_con.v.verbose = True
+leo_con.add_ground_stations(
+    GroundStation(
+        GroundStationAtCities.TOP_100
+        # GroundStationAtCities.TOP_1000
     )
-
-    # # Kuiper
-    # leo_con.add_shells(
-    #     PlusGridShell(
-    #         id=0,
-    #         orbits=34,
-    #         sat_per_orbit=34,
-    #         altitude_m=630000.0,
-    #         inclination_degree=51.9,
-
-    #         angle_of_elevation_degree=35.0,
-    #         phase_offset=50.0
-    #     )
-    # )
-
-    # # Starlink
-    # leo_con.add_shells(
-    #     PlusGridShell(
-    #         id=0,
-    #         orbits=72,
-    #         sat_per_orbit=22,
-    #         altitude_m=550000.0,
-    #         inclination_degree=53.0,
-
-    #         angle_of_elevation_degree=25.0,
-    #         phase_offset=50.0
-    #     )
-    # )
-
-    # Telesat
-    leo_con.add_shells(
-        PlusGridShell(
-            id=0,
-            orbits=27,
-            sat_per_orbit=13,
-            altitude_m=1015000.0,
-            inclination_degree=98.98,
-
-            angle_of_elevation_degree=10,
-            phase_offset=50.0
-        )
+)
+
+# # Kuiper
+# leo_con.add_shells(
+#     PlusGridShell(
+#         id=0,
+#         orbits=34,
+#         sat_per_orbit=34,
+#         altitude_m=630000.0,
+#         inclination_degree=51.9,
+
+#         angle_of_elevation_degree=35.0,
+#         phase_offset=50.0
+#     )
+# )
+
+# # Starlink
+# leo_con.add_shells(
+#     PlusGridShell(
+#         id=0,
+#         orbits=72,
+#         sat_per_orbit=22,
+#         altitude_m=550000.0,
+#         inclination_degree=53.0,
+
+#         angle_of_elevation_degree=25.0,
+#         phase_offset=50.0
+#     )
+# )
+
+# Telesat
+leo_con.add_shells(
+    PlusGridShell(
+        id=0,
+        orbits=27,
+        sat_per_orbit=13,
+        altitude_m=1015000.0,
+        inclination_degree=98.98,
+
+        angle_of_elevation_degree=10,
+        phase_offset=50.0
     )
+)
+
+leo_con.set_time(second=0)  # Time passed after epoch
+leo_con.set_loss_model(None)
+leo_con.build()
+
+
+__last_path = None
+# Propagates the satellites for all the seconds in chunks and steps through them
+for second, _ in enumerate(leo_con.iter_time_steps(range(200))):
 
-    leo_con.set_time(second=second)  # Time passed after epoch
-    leo_con.set_loss_model(None)
-    leo_con.build()
+    leo_con.build_GSLs()
     leo_con.create_network_graph()
 
     # Generates all the routes
@@ -51,7 +51,6 @@ src = 'G-45'
 dst = 'G-83'
 
 leo_con.routes = dict()
-leo_con.link_load = dict()
 leo_con.no_path_found = set()
 leo_con.k_path_not_found = set()
 
@@ -47,7 +47,6 @@ src = 'G-0'
 dst = 'G-28'
 
 leo_con.routes = dict()
-leo_con.link_load = dict()
 leo_con.no_path_found = set()
 leo_con.k_path_not_found = set()
 
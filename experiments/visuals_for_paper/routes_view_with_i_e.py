@@ -64,7 +64,6 @@ flows['G-45_G-71'] = "rgb(255, 0, 0)"
 
 
 leo_con.routes = dict()
-leo_con.link_load = dict()
 leo_con.no_path_found = set()
 leo_con.k_path_not_found = set()
 
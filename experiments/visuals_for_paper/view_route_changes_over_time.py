@@ -114,7 +114,6 @@ for t in range(0, 1500, 1):
     )
 
     leo_con.routes = dict()
-    leo_con.link_load = dict()
     leo_con.no_path_found = set()
     leo_con.k_path_not_found = set()
 
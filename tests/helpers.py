@@ -0,0 +1,79 @@
+'''
+This module contains the shared helpers of the unit tests (not a test module).
+It provides the following:
+1. LEO constellation of a 20x20 +Grid shell (1000 km, 60 degree inclination) built with the given mode flags.
+'''
+
+from LEOCraft.attenuation.fspl import FSPL
+from LEOCraft.constellations.LEO_constellation import LEOConstellation
+from LEOCraft.dataset import GroundStationAtCities
+from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
+from LEOCraft.user_terminals.ground_station import GroundStation
+
+
+def create_constellation(
+    name: str,
+    k: int,
+    ground_stations: str = GroundStationAtCities.TOP_100,
+    angle_of_elevation_degree: float = 30.0,
+    loss_model: FSPL | None = None,
+    create_network_graph: bool = True,
+    generate_routes: bool = False,
+    PARALLEL_MODE: bool = False,
+    **modes: bool
+) -> LEOConstellation:
+    """Builds a LEO constellation of a 20x20 +Grid shell over the ground stations
+
+    Parameters
+    ----------
+    name: str
+        Name of the constellation
+    k: int
+        Number of shortest routes terminal to terminal
+    ground_stations: str, optional
+        Ground stations CSV file (default the top 100 cities)
+    angle_of_elevation_degree: float, optional
+        Min angle of elevation of the satellites
+    loss_model: FSPL | None, optional
+        Loss model of the GSLs (default none)
+    create_network_graph: bool, optional
+        Create the network graph after the build
+    generate_routes: bool, optional
+        Generate the routes over the network graph
+    PARALLEL_MODE: bool, optional
+        Parallel mode of the constellation
+    modes: bool
+        Mode flags of the constellation, e.g., `A_STAR_ROUTING_MODE=True`
+
+    Returns
+    -------
+    LEOConstellation
+        Built constellation
+    """
+
+    leo_con = LEOConstellation(name, PARALLEL_MODE=PARALLEL_MODE)
+    for mode, enabled in modes.items():
+        assert hasattr(leo_con, mode), f'Unknown mode {mode}'
+        setattr(leo_con, mode, enabled)
+    leo_con.k = k
+    leo_con.v.verbose = False
+    leo_con.add_ground_stations(GroundStation(ground_stations))
+    leo_con.add_shells(
+        PlusGridShell(
+            id=0,
+            orbits=20,
+            sat_per_orbit=20,
+            altitude_m=1000000.0,
+            inclination_degree=60.0,
+            angle_of_elevation_degree=angle_of_elevation_degree,
+            phase_offset=50.0
+        )
+    )
+    leo_con.set_time()
+    leo_con.set_loss_model(loss_model)
+    leo_con.build()
+    if create_network_graph or generate_routes:
+        leo_con.create_network_graph()
+    if generate_routes:
+        leo_con.generate_routes()
+    return leo_con
@@ -13,6 +13,8 @@ The tests cover the following aspects:
    - Tests the consistency of exported GSLs, routes, and path-related data with the internal state of the constellation.
 6. Consistency:
    - Ensures that the results are consistent when the constellation is built with and without parallel mode.
+7. Dense GSLs:
+   - Ensures that the GSLs and satellite coverage from the terminal x satellite range matrix match the per-terminal queries.
 '''
 
 
@@ -236,6 +238,17 @@ class TestLEOConstellation(unittest.TestCase):
         self.assertEqual(self._test_gsl_count(self.shell_1), 1362)
         self.assertEqual(self._test_gsl_count(self.shell_3), 3169)
 
+    def test_dense_gsls(self):
+        for leo_con in [self.shell_1, self.shell_3]:
+            gsls, sat_coverage = leo_con.gsls, leo_con.sat_coverage
+
+            leo_con.DENSE_GSL_MODE = True
+            leo_con.build_GSLs()
+            leo_con.DENSE_GSL_MODE = False
+
+            self.assertListEqual(gsls, leo_con.gsls)
+            self.assertDictEqual(sat_coverage, leo_con.sat_coverage)
+
     def _read_json(self, path: str) -> dict:
         with open(path) as json_file:
             return json.loads(json_file.read())
@@ -0,0 +1,66 @@
+'''
+This module contains unit tests for the `AStarKShortestPaths` class (Yen K shortest paths with A* spur searches).
+It tests the following:
+1. Routes are identical to the native Yen engine (`KShortestPaths`) with fewer nodes expanded than Dijkstra.
+2. Routes generated in A* routing mode are identical to the native routing mode,
+   the nodes expanded by the workers in parallel mode add up to the serial mode.
+'''
+
+import unittest
+
+from LEOCraft.routing.a_star import AStarKShortestPaths
+from tests.helpers import create_constellation
+
+
+class TestAStar(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.leo_con = create_constellation(
+            'AStarTest', k=5, NATIVE_ROUTING_MODE=True, A_STAR_ROUTING_MODE=True
+        )
+
+    def test_native_routes(self):
+        leo_con = self.leo_con
+        dijkstra_engine = AStarKShortestPaths(
+            leo_con.network_graph, leo_con.satellite_count, leo_con.a_star_engine.satellite_positions_m, heuristic=False
+        )
+        gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+        nodes_expanded = leo_con.a_star_engine.nodes_expanded
+
+        for sgid, dgid in zip(gids[:10], gids[-10:]):
+            flow = (
+                leo_con.ground_stations.encode_name(sgid), list(leo_con.gsls[sgid]),
+                leo_con.ground_stations.encode_name(dgid), list(leo_con.gsls[dgid]),
+                20
+            )
+            expected = leo_con.routing_engine.k_shortest_paths(*flow)
+            self.assertEqual(leo_con.a_star_engine.k_shortest_paths(*flow), expected)
+            self.assertEqual(dijkstra_engine.k_shortest_paths(*flow), expected)
+
+        self.assertLess(
+            leo_con.a_star_engine.nodes_expanded - nodes_expanded, dijkstra_engine.nodes_expanded
+        )
+
+    def test_a_star_routing_mode(self):
+        self.leo_con.generate_routes()
+        leo_con = create_constellation(
+            'AStarTest', k=5, NATIVE_ROUTING_MODE=True, A_STAR_ROUTING_MODE=False
+        )
+        leo_con.generate_routes()
+
+        self.assertDictEqual(self.leo_con.routes, leo_con.routes)
+        self.assertDictEqual(self.leo_con.link_load, leo_con.link_load)
+        self.assertSetEqual(self.leo_con.no_path_found, leo_con.no_path_found)
+        self.assertSetEqual(
+            self.leo_con.k_path_not_found, leo_con.k_path_not_found
+        )
+
+        leo_con = create_constellation(
+            'AStarTest', k=5, PARALLEL_MODE=True, NATIVE_ROUTING_MODE=True, A_STAR_ROUTING_MODE=True
+        )
+        leo_con.generate_routes()
+        self.assertDictEqual(self.leo_con.routes, leo_con.routes)
+        self.assertGreater(self.leo_con.nodes_expanded, 0)
+        self.assertEqual(self.leo_con.nodes_expanded, leo_con.nodes_expanded)
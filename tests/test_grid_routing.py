@@ -0,0 +1,65 @@
+'''
+This module contains unit tests for the `PlusGridRouting` class (closed-form routing of a +Grid shell).
+It tests the following:
+1. Routes are simple paths along the ISLs in the order of length and the shortest route is as long as the graph search.
+2. Routes generated in grid routing (validation) mode cover the same flows as the native routing mode,
+   with no grid routing mismatches.
+'''
+
+import unittest
+
+from tests.helpers import create_constellation
+
+
+class TestGridRouting(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.leo_con = create_constellation(
+            'GridRoutingTest', k=5,
+            NATIVE_ROUTING_MODE=True, GRID_ROUTING_MODE=True, GRID_ROUTING_VALIDATION_MODE=True
+        )
+
+    def test_grid_routes(self):
+        leo_con = self.leo_con
+        path_length_m = leo_con.network_graph.path_length_m
+        gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+
+        for sgid, dgid in zip(gids[:10], gids[-10:]):
+            flow = (
+                leo_con.ground_stations.encode_name(sgid), list(leo_con.gsls[sgid]),
+                leo_con.ground_stations.encode_name(dgid), list(leo_con.gsls[dgid]),
+                20
+            )
+            routes = leo_con.grid_routing_engine.k_shortest_paths(*flow)
+            status, _, k_path = routes
+            self.assertTrue(status)
+            self.assertEqual(len(k_path), 20)
+
+            # Simple paths along the links (lengths of missing links raise KeyError)
+            self.assertEqual(len(set(map(tuple, k_path))), len(k_path))
+            lengths_m = [path_length_m(path) for path in k_path]
+            for path in k_path:
+                self.assertEqual(len(set(path)), len(path))
+            for length_m, next_length_m in zip(lengths_m, lengths_m[1:]):
+                self.assertLessEqual(length_m, next_length_m + 1e-3)
+
+            grid_m, search_m, _ = leo_con.grid_routing_engine.validate(
+                routes, leo_con.routing_engine.k_shortest_paths(*flow)
+            )
+            self.assertAlmostEqual(grid_m, search_m, delta=1e-3)
+
+    def test_grid_routing_mode(self):
+        self.leo_con.generate_routes()
+        leo_con = create_constellation('GridRoutingTest', k=5, NATIVE_ROUTING_MODE=True)
+        leo_con.generate_routes()
+
+        self.assertSetEqual(set(self.leo_con.routes), set(leo_con.routes))
+        self.assertSetEqual(self.leo_con.no_path_found, leo_con.no_path_found)
+        self.assertSetEqual(self.leo_con.grid_routing_mismatches, set())
+        for flow, k_path in leo_con.routes.items():
+            self.assertGreaterEqual(
+                leo_con.network_graph.path_length_m(k_path[0]),
+                self.leo_con.network_graph.path_length_m(self.leo_con.routes[flow][0]) - 1e-3
+            )
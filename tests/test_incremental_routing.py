@@ -0,0 +1,63 @@
+'''
+This module contains unit tests for the incremental routing mode (`IncrementalRouting` class).
+It tests the following:
+1. Routes of the same time step are all reused.
+2. Routes over consecutive time steps have the same lengths as routing all the flows, with some flows reused.
+'''
+
+import unittest
+
+from tests.helpers import create_constellation
+
+
+class TestIncrementalRouting(unittest.TestCase):
+
+    def test_same_time_step(self):
+        leo_con = create_constellation(
+            'IncrementalRoutingTest', k=3, create_network_graph=False,
+            BATCH_ROUTING_MODE=True, INCREMENTAL_ROUTING_MODE=True
+        )
+        leo_con.create_network_graph()
+        leo_con.generate_routes()
+        self.assertEqual(leo_con.recomputed_flows, len(leo_con.routes) + len(leo_con.k_path_not_found))
+        routes = leo_con.routes
+
+        leo_con.generate_routes()
+        self.assertEqual(leo_con.recomputed_flows, len(leo_con.k_path_not_found))
+        self.assertDictEqual(leo_con.routes, routes)
+
+    def test_time_steps(self):
+        incremental = create_constellation(
+            'IncrementalRoutingTest', k=3, create_network_graph=False,
+            BATCH_ROUTING_MODE=True, INCREMENTAL_ROUTING_MODE=True
+        )
+        complete = create_constellation(
+            'IncrementalRoutingTest', k=3, create_network_graph=False, BATCH_ROUTING_MODE=True
+        )
+
+        recomputed_flows = list()
+        for _ in zip(incremental.iter_time_steps(range(3)), complete.iter_time_steps(range(3))):
+            for leo_con in (incremental, complete):
+                leo_con.build_GSLs()
+                leo_con.create_network_graph()
+                leo_con.generate_routes()
+            recomputed_flows.append(incremental.recomputed_flows)
+
+            self.assertSetEqual(set(incremental.routes), set(complete.routes))
+            self.assertSetEqual(incremental.no_path_found, complete.no_path_found)
+            self.assertSetEqual(
+                incremental.k_path_not_found, complete.k_path_not_found
+            )
+            for flow, k_path in complete.routes.items():
+                for path, expected in zip(incremental.routes[flow], k_path):
+                    self.assertAlmostEqual(
+                        incremental.network_graph.path_length_m(path),
+                        complete.network_graph.path_length_m(expected),
+                        delta=1e-3
+                    )
+
+        self.assertEqual(
+            recomputed_flows[0], len(complete.routes) + len(complete.k_path_not_found)
+        )
+        self.assertLess(recomputed_flows[1], recomputed_flows[0])
+        self.assertLess(recomputed_flows[2], recomputed_flows[0])
@@ -0,0 +1,95 @@
+'''
+This module contains unit tests for the `KShortestPaths` class (native Yen K shortest paths engine).
+It tests the following:
+1. Routes are identical (same paths in the same order) to the Networkx based `k_shortest_paths`.
+2. Fewer than K routes when the graph has fewer simple paths, and no route when the terminals are disconnected.
+3. Routes generated in native routing mode are identical to the Networkx routing mode.
+4. Routes generated in batch routing mode (all the destinations of a source together) are identical to the native routing mode.
+'''
+
+import unittest
+
+from LEOCraft.routing.k_shortest_paths import KShortestPaths
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.utilities import k_shortest_paths
+from tests.helpers import create_constellation
+
+
+class TestKShortestPaths(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.leo_con = create_constellation('KShortestPathsTest', k=5, NATIVE_ROUTING_MODE=True)
+
+    def test_networkx_routes(self):
+        leo_con = self.leo_con
+        gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+
+        for sgid, dgid in zip(gids[:10], gids[-10:]):
+            source = leo_con.ground_stations.encode_name(sgid)
+            destination = leo_con.ground_stations.encode_name(dgid)
+
+            leo_con.connect_ground_station(source, destination)
+            expected = k_shortest_paths(
+                leo_con.sat_net_graph, source, destination, 20
+            )
+            leo_con.disconnect_ground_station(source, destination)
+
+            self.assertEqual(
+                leo_con.routing_engine.k_shortest_paths(
+                    source, list(leo_con.gsls[sgid]),
+                    destination, list(leo_con.gsls[dgid]),
+                    20
+                ),
+                expected
+            )
+
+    def test_small_graphs(self):
+        # Ring of 4 satellites and an isolated satellite
+        network_graph = NetworkGraph()
+        network_graph.add_nodes(['S0-0', 'S0-1', 'S0-2', 'S0-3', 'S0-4'])
+        network_graph.add_edges([0, 1, 2, 3], [1, 2, 3, 0], [1.0, 2.0, 3.0, 4.0], [50.0]*4)
+        network_graph.build()
+        engine = KShortestPaths(network_graph, 5)
+
+        status, flow, k_path = engine.k_shortest_paths(
+            'G-0', [('S0-0', 1.0)], 'G-1', [('S0-2', 1.0)], 5
+        )
+        self.assertTrue(status)
+        self.assertEqual(flow, 'G-0_G-1')
+        self.assertListEqual(
+            k_path,
+            [['G-0', 'S0-0', 'S0-1', 'S0-2', 'G-1'],
+             ['G-0', 'S0-0', 'S0-3', 'S0-2', 'G-1']]
+        )
+
+        status, flow, k_path = engine.k_shortest_paths(
+            'G-0', [('S0-0', 1.0)], 'G-1', [('S0-4', 1.0)], 5
+        )
+        self.assertFalse(status)
+        self.assertListEqual(k_path, [])
+
+    def test_native_routing_mode(self):
+        self.leo_con.generate_routes()
+        leo_con = create_constellation('KShortestPathsTest', k=5)
+        leo_con.generate_routes()
+
+        self.assertDictEqual(self.leo_con.routes, leo_con.routes)
+        self.assertDictEqual(self.leo_con.link_load, leo_con.link_load)
+        self.assertSetEqual(self.leo_con.no_path_found, leo_con.no_path_found)
+        self.assertSetEqual(
+            self.leo_con.k_path_not_found, leo_con.k_path_not_found
+        )
+
+    def test_batch_routing_mode(self):
+        self.leo_con.generate_routes()
+        leo_con = create_constellation('KShortestPathsTest', k=5, BATCH_ROUTING_MODE=True)
+        leo_con.generate_routes()
+
+        self.assertDictEqual(self.leo_con.routes, leo_con.routes)
+        self.assertDictEqual(self.leo_con.link_load, leo_con.link_load)
+        self.assertSetEqual(self.leo_con.no_path_found, leo_con.no_path_found)
+        self.assertSetEqual(
+            self.leo_con.k_path_not_found, leo_con.k_path_not_found
+        )
@@ -0,0 +1,73 @@
+'''
+This module contains unit tests for the `LinkFlowMatrix` class (sparse incidence matrix of the links and routes).
+It tests the following:
+1. Routes through each link are the same as the ones found hop by hop along the routes.
+2. Flow counts and demand-weighted loads of the links are the sums over those routes.
+'''
+
+import unittest
+
+import numpy as np
+
+from tests.helpers import create_constellation
+
+
+def _link_load(routes: dict[str, list[list[str]]]) -> dict[tuple[str, str], set[tuple[str, int]]]:
+    'Routes through each link with a key (hop, hop) found hop by hop'
+    link_load = dict()
+    for flow, k_path in routes.items():
+        for k_index, path in enumerate(k_path):
+            links = [(path[0], path[1]), (path[-1], path[-2])] + [
+                tuple(sorted((path[hop], path[hop+1]))) for hop in range(1, len(path)-2)
+            ]
+            for link in links:
+                link_load.setdefault(link, set()).add((flow, k_index))
+    return link_load
+
+
+class TestLinkFlowMatrix(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+
+        self.leo_con = create_constellation(
+            'LinkFlowsTest', k=5, generate_routes=True, BATCH_ROUTING_MODE=True
+        )
+
+    def test_link_routes(self):
+        link_flows = self.leo_con.link_flows
+        self.assertEqual(
+            link_flows.matrix.shape,
+            (self.leo_con.network_graph.number_of_edges, len(self.leo_con.routes)*self.leo_con.k)
+        )
+        self.assertDictEqual(
+            self.leo_con.link_load, _link_load(self.leo_con.routes)
+        )
+
+    def test_link_loads(self):
+        link_flows = self.leo_con.link_flows
+        link_load = _link_load(self.leo_con.routes)
+        network_graph = self.leo_con.network_graph
+        demands = {
+            flow: float(flow_index % 7) for flow_index, flow in enumerate(self.leo_con.routes)
+        }
+
+        flow_counts = link_flows.flow_counts()
+        demand_load = link_flows.demand_load(demands)
+        self.assertEqual(len(link_flows.links), len(link_load))
+        self.assertEqual(int(flow_counts.sum()), sum(len(routes) for routes in link_load.values()))
+        for link, routes in link_load.items():
+            edge_id = network_graph.edge_id(
+                network_graph.node_id(link[0]), network_graph.node_id(link[1])
+            )
+            self.assertEqual(flow_counts[edge_id], len(routes))
+            self.assertAlmostEqual(
+                demand_load[edge_id], sum(demands[flow] for flow, _ in routes)
+            )
+
+        route_weights = np.arange(len(link_flows.flows)*self.leo_con.k, dtype=np.float64)
+        self.assertTrue(np.allclose(
+            link_flows.load(route_weights),
+            link_flows.matrix.toarray() @ route_weights
+        ))
@@ -0,0 +1,121 @@
+'''
+This module contains unit tests for the `NetworkGraph` class (array-backed network graph).
+It tests the following:
+1. Mapping between node names and contiguous node IDs.
+2. CSR arrays of neighbors, weights and capacities, including replaced duplicate edges and edge ID lookups.
+3. Link length, capacity and path length lookups against the network graph built by a constellation.
+4. Conversion into scipy sparse matrix and networkx graph of the satellite nodes.
+'''
+
+import unittest
+
+import numpy as np
+
+from LEOCraft.routing.network_graph import NetworkGraph
+from tests.helpers import create_constellation
+
+
+class TestNetworkGraph(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+
+        self.graph = NetworkGraph()
+        self.graph.add_nodes(['S0-0', 'S0-1', 'S0-2', 'S0-3'])
+        self.graph.add_nodes(['G-0'])
+        self.graph.add_edges([0, 1, 2, 3], [1, 2, 3, 0], [10.0, 20.0, 30.0, 40.0], [50.0]*4)
+        self.graph.add_edges([4, 4, 1], [0, 2, 0], [5.0, 7.0, 15.0], [2.0, 3.0, 50.0])
+        self.graph.build()
+
+        self.leo_con = create_constellation(
+            'NetworkGraphTest', k=20, BATCH_ROUTING_MODE=True
+        )
+
+    def test_node_mapping(self):
+        self.assertEqual(self.graph.number_of_nodes, 5)
+        for node_id, name in enumerate(['S0-0', 'S0-1', 'S0-2', 'S0-3', 'G-0']):
+            self.assertEqual(self.graph.node_id(name), node_id)
+            self.assertEqual(self.graph.node_name(node_id), name)
+
+        network_graph = self.leo_con.network_graph
+        self.assertEqual(self.leo_con.satellite_count, 400)
+        self.assertEqual(network_graph.node_id('S0-399'), 399)
+        self.assertEqual(network_graph.node_id('G-0'), 400)
+
+    def test_CSR(self):
+        # Duplicate edge (1, 0) replaces (0, 1)
+        self.assertEqual(self.graph.number_of_edges, 6)
+        self.assertEqual(self.graph.link_length('S0-0', 'S0-1'), 15.0)
+
+        neighbors, weights = self.graph.neighbors(0)
+        self.assertListEqual(neighbors.tolist(), [1, 3, 4])
+        self.assertListEqual(weights.tolist(), [15.0, 40.0, 5.0])
+
+        self.assertEqual(self.graph.link_capacity('G-0', 'S0-2'), 3.0)
+        self.assertEqual(self.graph.link_capacity('S0-2', 'G-0'), 3.0)
+        with self.assertRaises(KeyError):
+            self.graph.link_length('S0-0', 'S0-2')
+
+        self.assertEqual(
+            self.graph.path_length_m(['G-0', 'S0-0', 'S0-1', 'S0-2']), 5.0+15.0+20.0
+        )
+
+        # Vectorized edge ID lookup
+        nodes_a, nodes_b = np.array([0, 2, 4, 3]), np.array([1, 1, 2, 0])
+        self.assertListEqual(
+            self.graph.edge_ids_between(nodes_a, nodes_b).tolist(),
+            [self.graph.edge_id(a, b) for a, b in zip(nodes_a, nodes_b)]
+        )
+        with self.assertRaises(KeyError):
+            self.graph.edge_ids_between(np.array([0]), np.array([2]))
+
+    def test_constellation_links(self):
+        network_graph = self.leo_con.network_graph
+        shell = self.leo_con.shells[0]
+
+        for sid_a, sid_b in list(shell.isls)[:50]:
+            self.assertEqual(
+                self.leo_con.link_length(
+                    shell.encode_sat_name(sid_a), shell.encode_sat_name(sid_b)
+                ),
+                shell.distance_between_sat_m(sid_a, sid_b)[0]
+            )
+            self.assertEqual(
+                self.leo_con.link_capacity(
+                    shell.encode_sat_name(sid_a), shell.encode_sat_name(sid_b)
+                ),
+                self.leo_con.ISL_CAPACITY
+            )
+
+        for gid, gsls in enumerate(self.leo_con.gsls):
+            gs_name = self.leo_con.ground_stations.encode_name(gid)
+            for sat_name, distance_m in gsls:
+                self.assertEqual(
+                    network_graph.link_length(gs_name, sat_name), distance_m
+                )
+                self.assertEqual(
+                    network_graph.link_capacity(gs_name, sat_name),
+                    round(
+                        self.leo_con.GSL_CAPACITY /
+                        len(self.leo_con.sat_coverage[sat_name])
+                    )
+                )
+
+    def test_conversion(self):
+        matrix = self.graph.to_csr_matrix(4)
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertEqual(matrix.nnz, 8)
+        self.assertTrue(np.array_equal(matrix.toarray(), matrix.toarray().T))
+
+        sat_net_graph = self.leo_con.sat_net_graph
+        self.assertEqual(
+            sat_net_graph.number_of_nodes(), self.leo_con.satellite_count
+        )
+        self.assertEqual(
+            sat_net_graph.number_of_edges(), len(self.leo_con.shells[0].isls)
+        )
+        for node_a, node_b, weight in list(sat_net_graph.edges(data='weight'))[:50]:
+            self.assertEqual(
+                weight, self.leo_con.link_length(node_a, node_b)
+            )
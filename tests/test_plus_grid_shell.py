@@ -6,6 +6,9 @@ It tests the following functionalities:
 3. Exporting inter-satellite link (ISL) data to files and verifying the ISL count.
 4. Calculating distances between satellites and verifying their correctness.
 5. Determining satellites in range of a terminal and comparing results for different shell configurations.
+6. Querying satellites in range of multiple terminals at once through the spatial index against brute force.
+7. Batch propagation of satellite positions over multiple time steps (with chunking) against single step propagation.
+8. Spatial index is rebuilt over the loaded satellite positions of the same time step.
 '''
 
 
@@ -13,6 +16,10 @@ import os
 import shutil
 import unittest
 
+import numpy as np
+from astropy import units as u
+from astropy.time import TimeDelta
+
 from LEOCraft.satellite_topology.plus_grid_shell import PlusGridShell
 from LEOCraft.user_terminals.terminal import TerminalCoordinates
 
@@ -153,3 +160,91 @@ class TestPlusGridShell(unittest.TestCase):
             sum(sats_range_m_b)/len(sats_range_m_b)
         )
         self.assertGreater(len(visible_sats_b), len(visible_sats_s))
+
+    def test_get_satellites_in_range_of_terminals(self):
+        terminals = [
+            TerminalCoordinates(
+                name=f'test-{tid}',
+                latitude_degree=str(latitude_degree),
+                longitude_degree=str(longitude_degree),
+                elevation_m=elevation_m,
+                cartesian_x=0.0,
+                cartesian_y=0.0,
+                cartesian_z=0.0
+            )
+            for tid, (latitude_degree, longitude_degree, elevation_m) in enumerate(
+                [(0.0, 0.0, 0), (28.6, 77.2, 216), (-33.9, 151.2, 10000), (80.0, -40.0, 0)]
+            )
+        ]
+
+        for shell in [self.small_shell, self.big_shell]:
+            positions_m = shell.satellite_positions_m()
+            in_range = shell.get_satellites_in_range_of_terminals(terminals)
+
+            for tid, terminal in enumerate(terminals):
+                # Brute force over all the satellites
+                distance_m = np.linalg.norm(
+                    positions_m - shell.terminal_position_m(terminal), axis=1
+                )
+                visible_sids = np.flatnonzero(
+                    distance_m <= shell.max_GSL_lengths_m(terminal.elevation_m)
+                )
+
+                self.assertEqual(
+                    in_range[tid][0],
+                    [shell.encode_sat_name(sid) for sid in visible_sids]
+                )
+                self.assertEqual(in_range[tid][1], distance_m[visible_sids].tolist())
+                self.assertEqual(
+                    shell.get_satellites_in_range(terminal, tid),
+                    (tid, *in_range[tid])
+                )
+
+    def test_satellite_positions_batch_m(self):
+        time_deltas = [TimeDelta(second * u.second) for second in range(0, 100, 10)]
+
+        positions_m = self.big_shell.satellite_positions_batch_m(time_deltas)
+        self.assertEqual(
+            positions_m.shape, (len(time_deltas), len(self.big_shell.satellites), 3)
+        )
+
+        # Chunked propagation within a tiny memory budget gives the same positions
+        chunked_positions_m = self.big_shell.satellite_positions_batch_m(
+            range(0, 100, 10), max_memory_bytes=1
+        )
+        self.assertTrue(np.array_equal(positions_m, chunked_positions_m))
+
+        for step, time_delta in enumerate(time_deltas):
+            self.assertTrue(np.allclose(
+                positions_m[step],
+                self.big_shell.satellite_positions_m(time_delta),
+                rtol=0, atol=1e-3
+            ))
+
+    def test_iter_satellite_positions_m(self):
+        for time_delta, positions_m in self.small_shell.iter_satellite_positions_m(range(3)):
+            # Each step is loaded as the current positions of the shell
+            self.assertIs(
+                self.small_shell.satellite_positions_m(time_delta), positions_m
+            )
+
+    def test_spatial_index(self):
+        shell = PlusGridShell(
+            id=0,
+            orbits=10,
+            sat_per_orbit=10,
+            altitude_m=2000000.0,
+            inclination_degree=90.0,
+            angle_of_elevation_degree=30.0,
+            phase_offset=50.0
+        )
+        shell.build_satellites()
+
+        positions_m = shell.satellite_positions_m()
+        self.assertIs(shell.spatial_index(), shell.spatial_index())
+        np.testing.assert_array_equal(shell.spatial_index().data, positions_m)
+
+        # Loaded positions of the same time step replace the index
+        loaded_positions_m = positions_m[::-1].copy()
+        shell.load_satellite_positions(TimeDelta(0.0 * u.nanosecond), loaded_positions_m)
+        np.testing.assert_array_equal(shell.spatial_index().data, loaded_positions_m)
@@ -0,0 +1,102 @@
+'''
+This module contains unit tests for the `RouteStore` class (compact store of the routes as node IDs).
+It tests the following:
+1. Routes decoded from the store are the same as the routes added, in the same order.
+2. Chunks of routes merged from pickled stores (worker processes) are the same as adding the routes one by one.
+3. Routes of the parallel mode are the same as the routes of the serial mode.
+4. Adding routes while a view of the buffers is alive raises BufferError and leaves the store unchanged.
+'''
+
+import pickle
+import unittest
+
+import numpy as np
+
+from LEOCraft.routing.route_store import RouteStore
+from tests.helpers import create_constellation
+
+
+class TestRouteStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.leo_con = create_constellation(
+            'RouteStoreTest', k=3, generate_routes=True, BATCH_ROUTING_MODE=True
+        )
+        self.routes = self.leo_con.route_store.to_dict()
+
+    def test_decode(self):
+        route_store = RouteStore(self.leo_con.network_graph)
+        for flow, k_path in self.routes.items():
+            route_store.add(flow, k_path)
+
+        self.assertEqual(len(route_store), len(self.routes))
+        self.assertListEqual(list(route_store), list(self.routes))
+        self.assertEqual(route_store.nodes.dtype, np.int32)
+        self.assertDictEqual(route_store.to_dict(), self.routes)
+        for flow, k_path in self.routes.items():
+            self.assertIn(flow, route_store)
+            self.assertListEqual(route_store.k_path(flow), k_path)
+        self.assertNotIn('G-X_G-Y', route_store)
+
+    def test_extend(self):
+        flows = list(self.routes)
+        route_store = RouteStore(self.leo_con.network_graph)
+        for start in range(0, len(flows), 7):
+            chunk = RouteStore(self.leo_con.network_graph)
+            for flow in flows[start:start+7]:
+                chunk.add(flow, self.routes[flow])
+            chunk = pickle.loads(pickle.dumps(chunk))
+            self.assertIsNone(chunk.network_graph)
+            route_store.extend(chunk)
+
+        self.assertDictEqual(route_store.to_dict(), self.routes)
+        np.testing.assert_array_equal(
+            route_store.nodes, self.leo_con.route_store.nodes
+        )
+        np.testing.assert_array_equal(
+            route_store.path_offsets, self.leo_con.route_store.path_offsets
+        )
+        np.testing.assert_array_equal(
+            route_store.flow_offsets, self.leo_con.route_store.flow_offsets
+        )
+
+    def test_add_with_live_view(self):
+        flows = list(self.routes)
+        route_store = RouteStore(self.leo_con.network_graph)
+        route_store.add(flows[0], self.routes[flows[0]])
+        chunk = RouteStore(self.leo_con.network_graph)
+        chunk.add(flows[2], self.routes[flows[2]])
+
+        paths = route_store.node_paths(flows[0])
+        route_store.add(flows[1], self.routes[flows[1]])
+
+        path_offsets = route_store.path_offsets
+        with self.assertRaises(BufferError):
+            route_store.add(flows[2], self.routes[flows[2]])
+        with self.assertRaises(BufferError):
+            route_store.extend(chunk)
+        self.assertListEqual(list(route_store), flows[:2])
+        self.assertEqual(len(route_store.nodes), path_offsets[-1])
+        self.assertEqual(len(route_store.flow_offsets), 3)
+        del path_offsets
+
+        route_store.extend(chunk)
+        self.assertDictEqual(
+            route_store.to_dict(), {flow: self.routes[flow] for flow in flows[:3]}
+        )
+        self.assertListEqual(
+            [path.tolist() for path in paths],
+            [path.tolist() for path in route_store.node_paths(flows[0])]
+        )
+
+    def test_parallel_mode(self):
+        leo_con = create_constellation(
+            'RouteStoreTest', k=3, generate_routes=True, PARALLEL_MODE=True, BATCH_ROUTING_MODE=True
+        )
+        self.assertDictEqual(leo_con.routes, self.routes)
+        self.assertSetEqual(leo_con.no_path_found, self.leo_con.no_path_found)
+        self.assertSetEqual(
+            leo_con.k_path_not_found, self.leo_con.k_path_not_found
+        )
@@ -6,8 +6,10 @@ This module tests the functionality of the LEOSatellite class, including:
 - Maximum Inter-Satellite Link (ISL) and Ground-Satellite Link (GSL) lengths.
 - TLE (Two-Line Element) generation for satellites.
 - Nadir position calculations and their consistency over time intervals.
+- Propagation cache (parsed TLE reuse, bounded nadir memo, pickling for worker processes).
 '''
 
+import pickle
 import unittest
 
 from LEOCraft.constellations.constellation import Constellation
@@ -333,3 +335,32 @@ class TestSatellite(unittest.TestCase):
             )
         )
         self.assertAlmostEqual(lat_1, lat_2, delta=1)
+
+    def test_propagation_cache(self):
+        leo_con = LEOSatellite(
+            altitude_m=self.altitude_m,
+            inclination_degree=self.inclination_degree,
+            angle_of_elevation_degree=self.angle_of_elevation_degree,
+            satellite_catalog_number=self.satellite_catalog_number,
+            raan_degree=self.raan_degree,
+            mean_anomaly_degree=self.mean_anomaly_degree,
+            satellite_name=self.satellite_name
+        )
+        leo_con.build()
+
+        # TLE is parsed once
+        self.assertIs(leo_con.get_satellite(), leo_con.get_satellite())
+
+        # Nadir memo is bounded
+        for second in range(leo_con.NADIR_CACHE_SIZE + 10):
+            leo_con.nadir(Constellation.calculate_time_delta(second=second))
+        self.assertEqual(len(leo_con._nadir_cache), leo_con.NADIR_CACHE_SIZE)
+        self.assertNotIn(0.0, leo_con._nadir_cache)
+
+        # Picklable for the process pools
+        _leo_con = pickle.loads(pickle.dumps(leo_con))
+        self.assertEqual(
+            _leo_con.nadir(Constellation.calculate_time_delta(second=20)),
+            leo_con.nadir(Constellation.calculate_time_delta(second=20))
+        )
+        self.assertEqual(_leo_con.get_TLE(), leo_con.get_TLE())
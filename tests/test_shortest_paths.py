@@ -0,0 +1,90 @@
+'''
+This module contains unit tests for the `ShortestPaths` class (K=1 routing from a multi-source Dijkstra).
+It tests the following:
+1. Route lengths are the same as the Networkx based `k_shortest_paths` with K=1.
+2. No route when the terminals are disconnected.
+3. Routes generated in shortest path routing mode have the same lengths as the native routing mode.
+'''
+
+import unittest
+
+from LEOCraft.routing.network_graph import NetworkGraph
+from LEOCraft.routing.shortest_paths import ShortestPaths
+from LEOCraft.utilities import k_shortest_paths
+from tests.helpers import create_constellation
+
+
+class TestShortestPaths(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.leo_con = create_constellation(
+            'ShortestPathsTest', k=1, NATIVE_ROUTING_MODE=True, SHORTEST_PATH_ROUTING_MODE=True
+        )
+
+    def test_networkx_routes(self):
+        leo_con = self.leo_con
+        gids = [gid for gid in range(len(leo_con.gsls)) if leo_con.gsls[gid]]
+        source = leo_con.ground_stations.encode_name(gids[0])
+
+        routes = leo_con.shortest_path_engine.shortest_paths_from_source(
+            source, list(leo_con.gsls[gids[0]]),
+            [
+                (leo_con.ground_stations.encode_name(dgid), list(leo_con.gsls[dgid]))
+                for dgid in gids[1:]
+            ]
+        )
+        for dgid, (status, flow, k_path) in zip(gids[1:], routes):
+            destination = leo_con.ground_stations.encode_name(dgid)
+
+            leo_con.connect_ground_station(source, destination)
+            _, expected_flow, expected = k_shortest_paths(
+                leo_con.sat_net_graph, source, destination, 1
+            )
+            leo_con.disconnect_ground_station(source, destination)
+
+            self.assertTrue(status)
+            self.assertEqual(flow, expected_flow)
+            self.assertEqual(len(k_path), 1)
+            self.assertAlmostEqual(
+                leo_con.network_graph.path_length_m(k_path[0]),
+                leo_con.network_graph.path_length_m(expected[0]),
+                delta=1e-3
+            )
+
+    def test_small_graphs(self):
+        # Ring of 4 satellites and an isolated satellite with terminals
+        network_graph = NetworkGraph()
+        network_graph.add_nodes(['S0-0', 'S0-1', 'S0-2', 'S0-3', 'S0-4', 'G-0', 'G-1', 'G-2'])
+        network_graph.add_edges([0, 1, 2, 3], [1, 2, 3, 0], [1.0, 2.0, 3.0, 4.0], [50.0]*4)
+        network_graph.add_edges([5, 6, 7], [0, 2, 4], [1.0, 1.0, 1.0], [20.0]*3)
+        network_graph.build()
+        engine = ShortestPaths(network_graph, 5)
+
+        routes = engine.shortest_paths_from_source(
+            'G-0', [('S0-0', 1.0)],
+            [('G-1', [('S0-2', 1.0)]), ('G-2', [('S0-4', 1.0)])]
+        )
+        self.assertListEqual(
+            routes,
+            [(True, 'G-0_G-1', [['G-0', 'S0-0', 'S0-1', 'S0-2', 'G-1']]),
+             (False, 'G-0_G-2', [])]
+        )
+
+    def test_shortest_path_routing_mode(self):
+        self.leo_con.generate_routes()
+        leo_con = create_constellation('ShortestPathsTest', k=1, NATIVE_ROUTING_MODE=True)
+        leo_con.generate_routes()
+
+        self.assertSetEqual(set(self.leo_con.routes), set(leo_con.routes))
+        for flow, k_path in leo_con.routes.items():
+            self.assertAlmostEqual(
+                self.leo_con.network_graph.path_length_m(self.leo_con.routes[flow][0]),
+                leo_con.network_graph.path_length_m(k_path[0]),
+                delta=1e-3
+            )
+        self.assertSetEqual(self.leo_con.no_path_found, leo_con.no_path_found)
+        self.assertSetEqual(
+            self.leo_con.k_path_not_found, leo_con.k_path_not_found
+        )
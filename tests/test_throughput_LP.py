@@ -0,0 +1,397 @@
+'''
+This module contains unit tests for the `ThroughputLP` class (LP of the throughput in sparse matrix form).
+It tests the following:
+1. Constraint rows are the route selection of each flow and the demand-scaled routes through each link.
+2. Throughput of the LP is the same as the LP formed link by link.
+3. Throughput of the HiGHS solver is the same as Gurobi, with feasible path selection.
+4. Throughput of the LP updated from the LP of a neighbouring design (warm start) is the same as solving from scratch.
+5. Throughput of the approximate solver (Garg-Könemann) is feasible and within 1 - epsilon of the optimum.
+6. Presolve drops the link rows that can not saturate and duplicate link rows (keeping the tightest capacity),
+   same throughput as without it.
+7. Path selection of the LP solution is a sparse (flow x K) matrix, its dict view is decoded on access.
+8. Column generation from the shortest routes ends with no improving route, same throughput with Gurobi and HiGHS,
+   at least the throughput of the K routes and within the link capacities, the exported path selection
+   resolves against the exported generated routes.
+9. Independent blocks of the LP (after the presolve) are found and solved in a process pool, same solution as
+   solving the LP at once.
+10. An empty LP (no flow has a route) has zero throughput with every solver backend.
+11. Columns in no constraint row take their variable bound with every solver backend.
+'''
+
+import json
+import os
+import shutil
+import unittest
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+from scipy.sparse import block_diag, csr_matrix, vstack
+
+from LEOCraft.attenuation.fspl import FSPL
+from LEOCraft.dataset import GroundStationAtCities, InternetTrafficAcrossCities
+from LEOCraft.performance.basic.throughput import Throughput
+from LEOCraft.performance.LP_solver import (DecomposedLPSolver,
+                                             GargKonemannLPSolver,
+                                             GurobiLPSolver, HiGHSLPSolver,
+                                             LP_blocks)
+from LEOCraft.routing.link_flows import LinkFlowMatrix
+from tests.helpers import create_constellation
+
+
+def _link_by_link_throughput(th: Throughput) -> float:
+    'Throughput of the LP formed with one constraint per link'
+    leo_con = th.leo_con
+    link_flows = leo_con.link_flows
+
+    model = gp.Model('LinkByLink')
+    model.setParam('OutputFlag', False)
+    flow_via_route = model.addVars(
+        leo_con.route_store.flows, leo_con.k, lb=0, ub=1
+    )
+    model.setObjective(gp.quicksum(
+        flow_via_route.sum(flow, '*') * th.demand_metrics[flow] for flow in leo_con.route_store.flows
+    ), GRB.MAXIMIZE)
+    model.addConstrs(
+        flow_via_route.sum(flow, '*') <= 1 for flow in leo_con.route_store.flows
+    )
+    for edge_id in link_flows.links.tolist():
+        model.addConstr(gp.quicksum(
+            flow_via_route[flow, index] * th.demand_metrics[flow] for flow, index in link_flows.link_routes(edge_id)
+        ) <= float(leo_con.network_graph.edge_capacities[edge_id]))
+    model.optimize()
+    return model.objVal
+
+
+def _loss_model() -> FSPL:
+    loss_model = FSPL(28.5*1000000000, 98.4, 0.5*1000000000, 13.6)
+    loss_model.set_Tx_antenna_gain(gain_dB=34.5)
+    return loss_model
+
+
+class TestThroughputLP(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        unittest.TestLoader.sortTestMethodsUsing = None
+        self.test_directory = f'{os.getcwd()}/TestThroughputLP'
+        os.makedirs(self.test_directory, exist_ok=True)
+
+        # First 20 cities, small enough LP for any solver licence
+        ground_stations = f'{self.test_directory}/ground_stations.csv'
+        with open(GroundStationAtCities.TOP_100) as csv_file:
+            lines = csv_file.readlines()[:21]
+        with open(ground_stations, 'w') as csv_file:
+            csv_file.writelines(lines)
+
+        self.ground_stations = ground_stations
+        self.leo_con = create_constellation(
+            'ThroughputLPTest', k=2, ground_stations=ground_stations, loss_model=_loss_model(),
+            generate_routes=True, BATCH_ROUTING_MODE=True
+        )
+
+        self.th = Throughput(
+            self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+        )
+        self.th.v.verbose = False
+        self.th.build()
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.test_directory)
+
+    def test_formulation(self):
+        objective, constraints, bounds = self.th._build_linear_program()
+        flows = self.leo_con.route_store.flows
+        link_flows = self.leo_con.link_flows
+        k = self.leo_con.k
+
+        self.assertEqual(constraints.shape, (len(flows) + len(link_flows.links), len(flows) * k))
+        for flow_index, flow in enumerate(flows):
+            np.testing.assert_array_equal(
+                objective[flow_index*k:(flow_index+1)*k], self.th.demand_metrics[flow]
+            )
+            row = constraints.getrow(flow_index)
+            self.assertListEqual(sorted(row.indices.tolist()), list(range(flow_index*k, (flow_index+1)*k)))
+            self.assertEqual(bounds[flow_index], 1)
+
+        for row_index, edge_id in enumerate(link_flows.links.tolist(), start=len(flows)):
+            row = constraints.getrow(row_index)
+            self.assertDictEqual(
+                dict(zip(row.indices.tolist(), row.data.tolist())),
+                {
+                    flows.index(flow) * k + index: self.th.demand_metrics[flow]
+                    for flow, index in link_flows.link_routes(edge_id)
+                }
+            )
+            self.assertEqual(
+                bounds[row_index], self.leo_con.network_graph.edge_capacities[edge_id]
+            )
+
+    def test_throughput(self):
+        self.th.compute()
+        self.assertAlmostEqual(
+            self.th.throughput_Gbps, _link_by_link_throughput(self.th), places=6
+        )
+        for flow, selection in self.th.path_selection.items():
+            self.assertLessEqual(sum(selection.values()), 1 + 1e-9)
+            self.assertTrue(set(selection).issubset(range(self.leo_con.k)))
+
+    def test_highs(self):
+        th = Throughput(
+            self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+        )
+        th.v.verbose = False
+        th.LP_SOLVER = 'highs'
+        th.build()
+        th.compute()
+        self.assertAlmostEqual(
+            th.throughput_Gbps, _link_by_link_throughput(th), places=6
+        )
+
+        objective, constraints, bounds = th._build_linear_program()
+        self.assertTrue(np.all(constraints @ th.solver.x <= bounds + 1e-6))
+        self.assertAlmostEqual(
+            float(objective @ th.solver.x), th.throughput_Gbps, places=6
+        )
+        self.assertAlmostEqual(
+            sum(th.demand_metrics[flow] * sum(selection.values()) for flow, selection in th.path_selection.items()),
+            th.throughput_Gbps,
+            places=6
+        )
+
+    def test_warm_start(self):
+        throughput = None
+        for angle_of_elevation_degree in (30.0, 30.5, 29.0):
+            leo_con = create_constellation(
+                'ThroughputLPTest', k=2, ground_stations=self.ground_stations,
+                angle_of_elevation_degree=angle_of_elevation_degree, loss_model=_loss_model(),
+                generate_routes=True, BATCH_ROUTING_MODE=True
+            )
+            th = Throughput(leo_con, InternetTrafficAcrossCities.POP_GDP_100)
+            th.v.verbose = False
+            th.WARM_START_MODE = True
+            th.build()
+            if throughput is not None:
+                solver = throughput.solver
+                th.warm_start_from(throughput)
+                self.assertIsNone(throughput.solver)
+            th.compute()
+
+            cold = Throughput(leo_con, InternetTrafficAcrossCities.POP_GDP_100)
+            cold.v.verbose = False
+            cold.build()
+            cold.compute()
+
+            self.assertAlmostEqual(th.throughput_Gbps, cold.throughput_Gbps, places=6)
+            if throughput is not None:
+                self.assertIs(th.solver, solver)
+                self.assertGreater(th.solver.update_stats['added_variables'], 0)
+            throughput = th
+
+    def test_garg_konemann(self):
+        optimum = _link_by_link_throughput(self.th)
+        for epsilon in (0.3, 0.1):
+            th = Throughput(
+                self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+            )
+            th.v.verbose = False
+            th.LP_SOLVER = 'garg_konemann'
+            th.APPROXIMATION_EPSILON = epsilon
+            th.build()
+            th.compute()
+
+            objective, constraints, bounds = th._build_linear_program()
+            self.assertTrue(np.all(constraints @ th.solver.x <= bounds + 1e-6))
+            self.assertLessEqual(th.throughput_Gbps, optimum + 1e-6)
+            self.assertGreaterEqual(th.throughput_upper_bound_Gbps, optimum - 1e-6)
+            self.assertGreaterEqual(
+                th.throughput_Gbps, (1 - epsilon) * th.throughput_upper_bound_Gbps
+            )
+
+    def test_presolve(self):
+        objective, constraints, bounds = self.th._build_linear_program()
+        flow_count = len(self.leo_con.route_store.flows)
+
+        # Tighter duplicate of the most loaded link
+        link = flow_count + int(np.argmax(constraints[flow_count:] @ np.ones(constraints.shape[1]) / bounds[flow_count:]))
+        constraints = vstack([constraints, constraints.getrow(link)], format='csr')
+        bounds = np.append(bounds, bounds[link] / 2)
+
+        rows, presolved_bounds = self.th._presolve_linear_program(
+            objective, constraints, bounds
+        )
+        stats = self.th.presolve_stats
+
+        np.testing.assert_array_equal(rows[:flow_count], np.arange(flow_count))
+        self.assertEqual(len(rows), constraints.shape[0] - stats['eliminated_rows'])
+        self.assertEqual(stats['eliminated_rows'], stats['slack_rows'] + stats['duplicate_rows'])
+        self.assertGreater(stats['slack_rows'], 0)
+        self.assertGreaterEqual(stats['duplicate_rows'], 1)
+        self.assertIn(link, rows.tolist())
+        self.assertEqual(presolved_bounds[rows.tolist().index(link)], bounds[-1])
+
+        # Kept link rows are distinct, each at most as loose as any eliminated duplicate
+        link_rows = {}
+        for row, bound in zip(rows[flow_count:].tolist(), presolved_bounds[flow_count:].tolist()):
+            key = tuple(sorted(constraints.getrow(row).indices.tolist()))
+            self.assertNotIn(key, link_rows)
+            link_rows[key] = bound
+        for row in range(flow_count, constraints.shape[0]):
+            key = tuple(sorted(constraints.getrow(row).indices.tolist()))
+            if key in link_rows:
+                self.assertLessEqual(link_rows[key], bounds[row])
+            else:
+                self.assertLessEqual(
+                    sum(self.th.demand_metrics[self.leo_con.route_store.flows[column // self.leo_con.k]]
+                        for column in {column - column % self.leo_con.k for column in key}),
+                    bounds[row] + 1e-9
+                )
+
+        th = Throughput(
+            self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+        )
+        th.v.verbose = False
+        th.PRESOLVE_MODE = True
+        th.build()
+        th.compute()
+        self.th.compute()
+        self.assertGreater(th.presolve_stats['eliminated_rows'], 0)
+        self.assertAlmostEqual(th.throughput_Gbps, self.th.throughput_Gbps, places=6)
+        self.assertTrue(np.all(constraints[:-1] @ th.solver.x <= bounds[:-1] + 1e-6))
+
+    def test_path_selection(self):
+        self.th.compute()
+        self.assertIsNone(self.th._path_selection)
+
+        flows = self.leo_con.route_store.flows
+        k = self.leo_con.k
+        selection = self.th.path_selection_matrix
+        self.assertEqual(selection.shape, (len(flows), k))
+        np.testing.assert_array_equal(selection.toarray().ravel(), self.th.solver.x)
+
+        path_selection = self.th.path_selection
+        self.assertIs(self.th.path_selection, path_selection)
+        flow_via_route = self.th.solver.x
+        self.assertDictEqual(path_selection, {
+            flows[flow_index]: {
+                index: float(flow_via_route[flow_index*k + index])
+                for index in range(k) if flow_via_route[flow_index*k + index] != 0
+            }
+            for flow_index in set((np.flatnonzero(flow_via_route) // k).tolist())
+        })
+        self.assertAlmostEqual(
+            self.th.total_accommodated_flow,
+            sum(sum(fractions.values()) for fractions in path_selection.values()) / len(self.th.demand_metrics) * 100
+        )
+
+    def test_column_generation(self):
+        self.th.compute()
+        throughput = None
+        for lp_solver in ('gurobi', 'highs'):
+            th = Throughput(
+                self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+            )
+            th.v.verbose = False
+            th.LP_SOLVER = lp_solver
+            th.COLUMN_GENERATION_MODE = True
+            th.build()
+            th.compute()
+
+            link_flows = LinkFlowMatrix(
+                self.leo_con.network_graph, self.leo_con.satellite_count, th.generated_routes, None
+            )
+            self.assertListEqual(th._price_routes(link_flows), [])
+            self.assertLess(th.column_generation_stats['iterations'], th.COLUMN_GENERATION_MAX_ITERATIONS)
+            self.assertGreaterEqual(th.throughput_Gbps, self.th.throughput_Gbps - 1e-6)
+            if throughput is not None:
+                self.assertAlmostEqual(th.throughput_Gbps, throughput, places=6)
+            throughput = th.throughput_Gbps
+
+            # Selected routes out of the generated routes of each flow
+            for selection_percentage in (th.NS_selt, th.EW_selt, th.NESW_selt, th.HG_selt, th.LG_selt):
+                self.assertGreaterEqual(selection_percentage, 0)
+                self.assertLessEqual(selection_percentage, 100)
+
+            # Generated routes start with the shortest route of each flow
+            for flow in self.leo_con.route_store.flows:
+                np.testing.assert_array_equal(
+                    th.generated_routes.node_paths(flow)[0], self.leo_con.route_store.node_paths(flow)[0]
+                )
+
+            loads = link_flows.load(th.solver.x * np.repeat(
+                [th.demand_metrics[flow] for flow in link_flows.flows], np.diff(link_flows.column_offsets)
+            ))
+            self.assertTrue(np.all(loads <= self.leo_con.network_graph.edge_capacities + 1e-6))
+            self.assertAlmostEqual(
+                sum(th.demand_metrics[flow] * sum(selection.values()) for flow, selection in th.path_selection.items()),
+                th.throughput_Gbps,
+                places=6
+            )
+
+            with open(th.export_path_selection(self.test_directory)) as json_file:
+                path_selection = json.load(json_file)
+            with open(f'{os.path.dirname(json_file.name)}/generated_routes.json') as json_file:
+                generated_routes = json.load(json_file)
+            for flow, selection in path_selection.items():
+                for index in selection:
+                    self.assertListEqual(
+                        generated_routes[flow][int(index)], th.generated_routes.k_path(flow)[int(index)]
+                    )
+
+    def test_decomposition(self):
+        objective, constraints, bounds = self.th._build_linear_program()
+        solver = GurobiLPSolver()
+        solver.solve(objective, constraints, bounds)
+        blocks = LP_blocks(constraints)
+
+        # Two copies of the LP side by side are independent
+        decomposed = DecomposedLPSolver(GurobiLPSolver, max_workers=2)
+        decomposed.solve(
+            np.concatenate((objective, objective)),
+            block_diag((constraints, constraints), format='csr'),
+            np.concatenate((bounds, bounds))
+        )
+        self.assertEqual(len(decomposed.block_sizes), 2 * len(blocks))
+        self.assertListEqual(
+            decomposed.block_sizes[:2], [(len(blocks[0][0]), len(blocks[0][1]))] * 2
+        )
+        self.assertAlmostEqual(decomposed.objective_value, 2 * solver.objective_value, places=6)
+        for x in np.split(decomposed.x, 2):
+            self.assertAlmostEqual(float(objective @ x), solver.objective_value, places=6)
+            self.assertTrue(np.all(constraints @ x <= bounds + 1e-6))
+
+        for lp_solver in ('gurobi', 'highs'):
+            th = Throughput(
+                self.leo_con, InternetTrafficAcrossCities.POP_GDP_100
+            )
+            th.v.verbose = False
+            th.LP_SOLVER = lp_solver
+            # Links that can not saturate join the blocks of the 20 cities, dropped by the presolve
+            th.PRESOLVE_MODE = True
+            th.DECOMPOSITION_MODE = True
+            th.DECOMPOSITION_MAX_WORKERS = 2
+            th.build()
+            th.compute()
+            self.assertAlmostEqual(th.throughput_Gbps, solver.objective_value, places=6)
+            self.assertGreater(len(th.LP_block_sizes), 1)
+            self.assertEqual(
+                sum(columns for _, columns in th.LP_block_sizes), len(objective)
+            )
+
+    def test_empty_LP(self):
+        for solver in (GurobiLPSolver(), HiGHSLPSolver(), GargKonemannLPSolver()):
+            solver.solve(np.zeros(0), csr_matrix((3, 0)), np.ones(3))
+            self.assertEqual(len(solver.x), 0)
+            self.assertEqual(solver.objective_value, 0)
+            self.assertEqual(solver.objective_bound, 0)
+
+    def test_unconstrained_columns(self):
+        objective = np.array([1.0, 2.0, 3.0])
+        constraints = csr_matrix(np.array([[1.0, 1.0, 0.0], [0.0, 2.0, 0.0]]))
+        for solver in (GurobiLPSolver(), HiGHSLPSolver(), GargKonemannLPSolver()):
+            solver.solve(objective, constraints, np.ones(2))
+            self.assertEqual(solver.x[2], 1)
+            self.assertTrue(np.all(constraints @ solver.x <= 1 + 1e-9))
+            self.assertGreaterEqual(solver.objective_bound, 4.5 - 1e-9)
+            self.assertGreaterEqual(solver.objective_value, (1 - 0.1) * 4.5)